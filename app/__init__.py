@@ -9,11 +9,23 @@ from . import db
 from .utils.date_helper import add_template_helpers
 from .utils.jinja_filters import register_jinja_filters
 from .utils import profile_utils
+from .utils import query_utils
+from .utils import metrics_utils
+from .utils import upload_utils
+from .utils import thumbnail_utils
+from .utils import share_utils
+from .utils import backup_utils
+from .utils import scheduler_utils
+from .utils import maintenance_utils
+from .utils import event_utils
+from .utils import search_utils
+from .utils import asset_utils
 from pathlib import Path
 
 
-def create_app():
-    app = Flask(__name__)
+def create_app(instance_path=None, config=None):
+    """Build the app; instance_path and config let tests and benchmarks use their own data."""
+    app = Flask(__name__, instance_path=instance_path)
     
     def month_name(month):
         months = {
@@ -40,47 +52,90 @@ def create_app():
 
     # Database configuration
     app.config['DATABASE'] = os.path.join(app.instance_path, 'jobmanager.db')
+    # Idle connections kept open per worker process
+    app.config.setdefault('DB_POOL_SIZE', 4)
+    # Start the scheduler thread and resume staged uploads here; gunicorn.conf.py
+    # turns this off so they start in the workers after the preloaded app forks
+    app.config.setdefault('START_BACKGROUND', os.environ.get('JOBMANAGER_START_BACKGROUND', '1') == '1')
+    if config:
+        app.config.update(config)
     
-    # Initialize the database if it doesn't exist
-    db_path = app.config['DATABASE']
-    db_exists = os.path.exists(db_path)
+    # One process at a time creates the database, migrates it and writes
+    # the default profile
+    with db.init_lock(app.instance_path):
+        # Initialize the database if it doesn't exist
+        db_path = app.config['DATABASE']
+        db_exists = os.path.exists(db_path)
     
-    if not db_exists:
-        app.logger.info("Database does not exist, initializing...")
+        if not db_exists:
+            app.logger.info("Database does not exist, initializing...")
         
-        # Import the database initializer
-        # The initializer is outside the app package, so we need to handle imports carefully
-        try:
-            # Try to import directly if the script is in the Python path
-            sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            from db_init import ensure_database_exists
-        except ImportError:
-            # If that fails, try to import using a relative path
-            current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            script_path = os.path.join(current_dir, "db_init.py")
+            # Import the database initializer
+            # The initializer is outside the app package, so we need to handle imports carefully
+            try:
+                # Try to import directly if the script is in the Python path
+                sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+                from db_init import ensure_database_exists
+            except ImportError:
+                # If that fails, try to import using a relative path
+                current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+                script_path = os.path.join(current_dir, "db_init.py")
             
-            if os.path.exists(script_path):
-                # Create a module spec and import the script
-                import importlib.util
-                spec = importlib.util.spec_from_file_location("db_init", script_path)
-                db_init = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(db_init)
-                ensure_database_exists = db_init.ensure_database_exists
-            else:
-                app.logger.error(f"Could not import db_init.py, file not found at {script_path}")
-                ensure_database_exists = None
+                if os.path.exists(script_path):
+                    # Create a module spec and import the script
+                    import importlib.util
+                    spec = importlib.util.spec_from_file_location("db_init", script_path)
+                    db_init = importlib.util.module_from_spec(spec)
+                    spec.loader.exec_module(db_init)
+                    ensure_database_exists = db_init.ensure_database_exists
+                else:
+                    app.logger.error(f"Could not import db_init.py, file not found at {script_path}")
+                    ensure_database_exists = None
         
-        if ensure_database_exists:
-            # Initialize the database with demo data
-            is_new = ensure_database_exists(db_path, with_demo_data=True)
-            if is_new:
-                app.logger.info("Database initialized successfully")
-    
+            if ensure_database_exists:
+                # Initialize the database with demo data
+                is_new = ensure_database_exists(db_path, with_demo_data=True)
+                if is_new:
+                    app.logger.info("Database initialized successfully")
+
+        # Bring older databases up to the current schema
+        if os.path.exists(db_path):
+            db.migrate_db(db_path)
+
+        # Initialize user profile
+        profile_utils.init_app(app)
+
     # Register database commands
     app.teardown_appcontext(db.close_db)
-    
-    # Initialize user profile
-    profile_utils.init_app(app)
+
+    # Optional SQL statement profiling
+    query_utils.init_app(app)
+
+    # Request latency, template and DB timing
+    metrics_utils.init_app(app)
+
+    # Background image processing for uploads
+    upload_utils.init_app(app)
+    thumbnail_utils.init_app(app)
+
+    # Share links stored in the database
+    share_utils.init_app(app)
+
+    # Online database backups on a background thread
+    backup_utils.init_app(app)
+
+    # Daily backups, pruning and cleanup, once across all worker processes
+    maintenance_utils.init_app(app)
+    scheduler_utils.init_app(app)
+
+    # Live timer updates for /timer/events
+    event_utils.init_app(app)
+
+    # Full-text search for /search
+    search_utils.init_app(app)
+
+    # Fingerprinted, precompressed CSS/JS for static_url() in templates
+    asset_utils.init_app(app)
     
     # Register routes
     from . import routes
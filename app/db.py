@@ -1,31 +1,154 @@
 # app/db.py
+import os
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from functools import wraps
 from flask import g, current_app
 import logging
 from datetime import datetime, timezone
 
+try:
+    import fcntl
+except ImportError:
+    # No cross-process lock (Windows); start one process at a time there
+    fcntl = None
+
 logger = logging.getLogger('jobmanager')
 
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'schema.sql')
+
+# Current Unix time in seconds, evaluated inside SQLite
+NOW_EPOCH = "CAST(strftime('%s', 'now') AS INTEGER)"
+
+# Duration of a time entry in hours; open entries run until now
+ENTRY_HOURS = f"(COALESCE(end_epoch, {NOW_EPOCH}) - start_epoch) / 3600.0"
+
+# Accumulated hours for a job: closed seconds from job_hours_rollup plus the
+# running timer. Queries using it join job_hours_rollup and the open
+# time_entry row as te_active.
+JOB_HOURS = (f"(COALESCE(job_hours_rollup.closed_seconds, 0) "
+             f"+ COALESCE({NOW_EPOCH} - te_active.start_epoch, 0)) / 3600.0")
+
+# Applied to every new pooled connection. WAL lets readers run while a
+# timer write is in progress; the rest trades durability of the last few
+# transactions on power loss for far fewer fsyncs on the Pi's SD card.
+CONNECTION_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -16000,      # KiB, i.e. 16 MB page cache per connection
+    'mmap_size': 67108864,     # 64 MB
+    'temp_store': 'MEMORY',
+    'busy_timeout': 5000,      # ms
+}
+
+class ConnectionPool:
+    """Reuse tuned SQLite connections across requests.
+
+    Connections are handed out to one request at a time and returned on
+    teardown, so the page cache survives between requests. The pool is tied
+    to the process that created it: after a fork (gunicorn workers) the
+    child discards inherited connections and opens its own.
+    """
+
+    def __init__(self, database, max_idle=4):
+        self.database = database
+        self.max_idle = max_idle
+        self._idle = []
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._stats = {'created': 0, 'reused': 0, 'released': 0, 'discarded': 0, 'in_use': 0}
+
+    def _check_fork(self):
+        # Must be called with the lock held
+        if self._pid != os.getpid():
+            self._idle = []
+            self._pid = os.getpid()
+            self._stats = dict.fromkeys(self._stats, 0)
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.database,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            timeout=CONNECTION_PRAGMAS['busy_timeout'] / 1000,
+            check_same_thread=False
+        )
+        conn.row_factory = sqlite3.Row
+        for pragma, value in CONNECTION_PRAGMAS.items():
+            conn.execute(f'PRAGMA {pragma} = {value}')
+        return init_db_time_functions(conn)
+
+    def acquire(self):
+        """Take an idle connection or open a new one."""
+        with self._lock:
+            self._check_fork()
+            conn = self._idle.pop() if self._idle else None
+            self._stats['reused' if conn else 'created'] += 1
+            self._stats['in_use'] += 1
+        return conn or self._connect()
+
+    def release(self, conn):
+        """Return a connection to the pool, rolling back anything left open."""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            usable = True
+        except sqlite3.ProgrammingError:
+            # The request closed the connection itself
+            usable = False
+
+        with self._lock:
+            self._check_fork()
+            self._stats['in_use'] = max(0, self._stats['in_use'] - 1)
+            if usable and len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                self._stats['released'] += 1
+                return
+            self._stats['discarded'] += 1
+        if usable:
+            conn.close()
+
+    def close_all(self):
+        """Close every idle connection."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    def stats(self):
+        """Return pool counters for diagnostics."""
+        with self._lock:
+            self._check_fork()
+            return dict(self._stats, idle=len(self._idle), max_idle=self.max_idle,
+                        pid=self._pid, database=self.database)
+
+def get_pool(app=None):
+    """Get the connection pool for the app, creating it on first use."""
+    app = app or current_app
+    pool = app.extensions.get('db_pool')
+    if pool is None or pool.database != app.config['DATABASE']:
+        pool = ConnectionPool(app.config['DATABASE'], app.config.get('DB_POOL_SIZE', 4))
+        app.extensions['db_pool'] = pool
+    return pool
+
 def get_db():
     """Get a database connection, reusing it if already exists in current context."""
     if 'db' not in g:
-        g.db = sqlite3.connect(
-            current_app.config['DATABASE'],
-            detect_types=sqlite3.PARSE_DECLTYPES
-        )
-        g.db.row_factory = sqlite3.Row
-        
-        # Initialize custom time functions
-        g.db = init_db_time_functions(g.db)
-        
+        g.db = get_pool().acquire()
+
+        # Record statement timings for request metrics and SQL profiling
+        profiler = current_app.extensions.get('query_profiler')
+        if profiler is not None:
+            g.db = profiler.wrap(g.db)
     return g.db
 
 def close_db(e=None):
-    """Close the database connection at the end of the request."""
+    """Return the request's database connection to the pool."""
     db = g.pop('db', None)
     if db is not None:
-        db.close()
+        # Unwrap profiled connections before handing them back
+        get_pool().release(getattr(db, 'raw_connection', db))
 
 def with_db(f):
     """Decorator to handle database connections for route functions."""
@@ -41,6 +164,187 @@ def init_db():
     with current_app.open_resource('schema.sql') as f:
         db.executescript(f.read().decode('utf8'))
 
+# Columns added after the first release. CREATE TABLE IF NOT EXISTS does not
+# touch existing tables, so migrate_db adds these to older databases by hand.
+ADDED_COLUMNS = [
+    ('time_entry', 'start_epoch', 'INTEGER'),
+    ('time_entry', 'end_epoch', 'INTEGER'),
+    ('time_entry', 'iso_week', 'TEXT'),
+    ('job', 'list_sort_key',
+     "TEXT GENERATED ALWAYS AS (CASE status WHEN 'Active' THEN '3' WHEN 'Pending' THEN '2' "
+     "WHEN 'Completed' THEN '1' ELSE '0' END || COALESCE(last_active, '')) VIRTUAL"),
+]
+
+def _backfill_time_entry_epochs(conn):
+    """Convert existing ISO start/end times into the integer epoch columns."""
+    cursor = conn.execute('''
+        UPDATE time_entry
+        SET start_epoch = CAST(strftime('%s', start_time) AS INTEGER),
+            end_epoch = CAST(strftime('%s', end_time) AS INTEGER)
+        WHERE start_epoch IS NULL
+           OR (end_time IS NOT NULL AND end_epoch IS NULL)
+    ''')
+    logger.info(f"Backfilled epoch columns for {cursor.rowcount} time entries")
+
+def _rebuild_job_hours_rollup(conn):
+    """Recompute the per-job closed seconds from scratch."""
+    conn.execute('DELETE FROM job_hours_rollup')
+    conn.execute('''
+        INSERT INTO job_hours_rollup (job_id, closed_seconds)
+        SELECT job_id, SUM(end_epoch - start_epoch)
+        FROM time_entry
+        WHERE start_epoch IS NOT NULL AND end_epoch IS NOT NULL
+        GROUP BY job_id
+    ''')
+
+def _analyze(conn):
+    """Gather index statistics so the query planner picks the new indexes."""
+    conn.execute('ANALYZE')
+
+def iso_week_sql(column):
+    """SQL expression giving the ISO week key ('2025-W11') of a timestamp column."""
+    thursday = f"{column}, '-3 days', 'weekday 4'"
+    return f"strftime('%Y', {thursday}) || '-W' || printf('%02d', (strftime('%j', {thursday}) - 1) / 7 + 1)"
+
+def _backfill_time_entry_weeks(conn):
+    """Fill the iso_week column for entries created before it existed."""
+    cursor = conn.execute(f'''
+        UPDATE time_entry
+        SET iso_week = {iso_week_sql('start_time')}
+        WHERE iso_week IS NULL
+    ''')
+    logger.info(f"Backfilled ISO weeks for {cursor.rowcount} time entries")
+    conn.execute('ANALYZE time_entry')
+
+# Rows of each source table as (rowid, title, body, job_id) for search_index;
+# the rowid encoding matches the triggers in schema.sql
+SEARCH_SOURCES = [
+    "SELECT id * 8 + 1, description, '', id FROM job",
+    """SELECT id * 8 + 2, name,
+              COALESCE(street, '') || ' ' || COALESCE(postal_code, '') || ' ' ||
+              COALESCE(city, '') || ' ' || COALESCE(country, '') || ' ' || COALESCE(notes, ''),
+              NULL
+       FROM customer""",
+    "SELECT id * 8 + 3, '', note, job_id FROM job_note",
+    "SELECT id * 8 + 4, material, '', job_id FROM job_material",
+    """SELECT id * 8 + 5, COALESCE(description, ''), COALESCE(tags, ''), job_id
+       FROM job_image
+       WHERE description IS NOT NULL OR tags IS NOT NULL""",
+]
+
+def _rebuild_search_index(conn):
+    """Index existing rows; the schema triggers keep search_index current after that."""
+    conn.execute('DELETE FROM search_index')
+    for source in SEARCH_SOURCES:
+        conn.execute(f'INSERT INTO search_index (rowid, title, body, job_id) {source}')
+    conn.execute("INSERT INTO search_index (search_index) VALUES ('optimize')")
+
+# Data migrations keyed by the schema version (PRAGMA user_version) they
+# bring the database to. They run after schema.sql has been replayed.
+MIGRATIONS = [
+    (1, _backfill_time_entry_epochs),
+    (2, _rebuild_job_hours_rollup),
+    (3, _analyze),
+    (4, _backfill_time_entry_weeks),
+    (5, _analyze),
+    (6, _rebuild_search_index),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+@contextmanager
+def init_lock(instance_path):
+    """Hold an exclusive lock on instance/init.lock while setting up files.
+
+    Worker processes started side by side (gunicorn without preload) would
+    otherwise all create the demo database or run the same migration.
+    """
+    if fcntl is None:
+        yield
+        return
+    with open(os.path.join(instance_path, 'init.lock'), 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def migrate_db(db_path):
+    """Bring an existing database up to the current schema version."""
+    conn = sqlite3.connect(db_path)
+    try:
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return False
+
+        logger.info(f"Migrating database from version {version} to {SCHEMA_VERSION}")
+
+        for table, column, column_type in ADDED_COLUMNS:
+            # table_xinfo also lists generated columns; missing tables are
+            # created complete by the schema replay below
+            existing = [row[1] for row in conn.execute(f'PRAGMA table_xinfo({table})')]
+            if existing and column not in existing:
+                conn.execute(f'ALTER TABLE {table} ADD COLUMN {column} {column_type}')
+                logger.info(f"Added column {table}.{column}")
+
+        # Replay the schema to create any new tables, triggers and indexes
+        with open(SCHEMA_PATH, 'r') as f:
+            conn.executescript(f.read())
+
+        for target_version, migration in MIGRATIONS:
+            if target_version > version:
+                migration(conn)
+
+        conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        conn.commit()
+        return True
+    except sqlite3.Error as e:
+        conn.rollback()
+        logger.error(f"Database migration failed: {str(e)}")
+        raise
+    finally:
+        conn.close()
+
+# Pages copied per backup step (4 KiB pages, so 4 MB) and the pause between
+# steps that lets request threads use the disk and the GIL
+BACKUP_PAGES_PER_STEP = 1024
+BACKUP_STEP_PAUSE = 0.01
+
+def online_backup(source_path, dest_path, pages=BACKUP_PAGES_PER_STEP, pause=BACKUP_STEP_PAUSE,
+                  progress=None):
+    """Copy a live database with the SQLite backup API.
+
+    The copy is written to dest_path + '.tmp' and renamed when complete.
+    The source connection holds a read transaction for the whole copy, so
+    the backup is one consistent snapshot and writers on other connections
+    (WAL mode) neither block nor force it to restart. progress, if given,
+    is called as progress(remaining_pages, total_pages) after each step.
+    """
+    tmp_path = dest_path + '.tmp'
+    source = sqlite3.connect(source_path, isolation_level=None, timeout=CONNECTION_PRAGMAS['busy_timeout'] / 1000)
+    target = sqlite3.connect(tmp_path)
+    try:
+        source.execute('BEGIN')
+        source.execute('SELECT COUNT(*) FROM sqlite_master').fetchone()
+
+        def step(status, remaining, total):
+            if progress:
+                progress(remaining, total)
+            if remaining and pause:
+                time.sleep(pause)
+
+        source.backup(target, pages=pages, progress=step)
+        source.execute('COMMIT')
+    except Exception:
+        target.close()
+        os.remove(tmp_path)
+        raise
+    finally:
+        source.close()
+    target.close()
+    os.replace(tmp_path, dest_path)
+    return dest_path
+
 def backup_db():
     """Create a backup of the database."""
     try:
@@ -48,12 +352,7 @@ def backup_db():
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         backup_path = f"{db_path}.backup_{timestamp}"
         
-        # Close any existing connection
-        close_db()
-        
-        with open(db_path, 'rb') as source:
-            with open(backup_path, 'wb') as target:
-                target.write(source.read())
+        online_backup(db_path, backup_path)
                 
         logger.info(f"Database backed up to {backup_path}")
         return True, backup_path
@@ -72,19 +371,15 @@ def get_job_with_customer(db, job_id):
 
 def get_job_with_hours(db, job_id):
     """Get job details including accumulated hours."""
-    return db.execute('''
-        WITH job_hours AS (
-            SELECT job_id,
-                SUM(time_diff_hours(start_time, COALESCE(end_time, current_iso_time()))) as hours
-            FROM time_entry
-            GROUP BY job_id
-        )
+    return db.execute(f'''
         SELECT job.*, 
                customer.name as customer_name,
-               COALESCE(job_hours.hours, 0) as accumulated_hours
+               {JOB_HOURS} as accumulated_hours
         FROM job 
         JOIN customer ON job.customer_id = customer.id 
-        LEFT JOIN job_hours ON job_hours.job_id = job.id
+        LEFT JOIN job_hours_rollup ON job_hours_rollup.job_id = job.id
+        LEFT JOIN time_entry te_active ON te_active.job_id = job.id
+            AND te_active.end_time IS NULL
         WHERE job.id = ?
     ''', [job_id]).fetchone()
 
@@ -98,13 +393,13 @@ def get_active_timer(db):
     ''').fetchone()
 
 def calculate_job_total_hours(db, job_id):
-    """Calculate total hours for a job using custom time functions."""
-    result = db.execute('''
+    """Calculate total hours for a job from the integer epoch columns."""
+    result = db.execute(f'''
         SELECT 
-            SUM(time_diff_hours(start_time, COALESCE(end_time, current_iso_time()))) as total_hours
+            SUM({ENTRY_HOURS}) as total_hours
         FROM time_entry
         WHERE job_id = ? AND 
-              time_diff_hours(start_time, COALESCE(end_time, current_iso_time())) > 0.03
+              {ENTRY_HOURS} > 0.03
     ''', [job_id]).fetchone()
     
     total_hours = result['total_hours'] if result['total_hours'] else 0
@@ -120,17 +415,32 @@ def get_job_materials(db, job_id):
     ''', [job_id]).fetchall()
 
 def get_job_time_entries(db, job_id):
-    """Get all time entries for a specific job using custom time functions."""
-    return db.execute('''
+    """Get all time entries for a specific job with their duration in hours."""
+    return db.execute(f'''
         SELECT 
             time_entry.*,
-            time_diff_hours(start_time, COALESCE(end_time, current_iso_time())) as hours
+            {ENTRY_HOURS} as hours
         FROM time_entry 
         WHERE job_id = ? 
         ORDER BY start_time DESC
     ''', [job_id]).fetchall()
 
 
+# Per-thread count of Python SQL function calls, read by the query profiler
+_udf_calls = threading.local()
+
+def udf_call_count():
+    """Number of Python SQL function calls made on this thread so far."""
+    return getattr(_udf_calls, 'count', 0)
+
+def _counted(func):
+    """Wrap a SQL function so its calls show up in the query profiler."""
+    @wraps(func)
+    def wrapper(*args):
+        _udf_calls.count = getattr(_udf_calls, 'count', 0) + 1
+        return func(*args)
+    return wrapper
+
 def init_db_time_functions(db):
     """Initialize SQLite with custom functions for time handling."""
     from datetime import datetime, timezone
@@ -140,44 +450,5 @@ def init_db_time_functions(db):
         """Return current time in ISO format with UTC timezone."""
         return datetime.now(timezone.utc).isoformat()
     
-    def time_diff_hours(start_time, end_time=None):
-        """Calculate time difference in hours between two timestamps."""
-        try:
-            # Parse timestamps, handling different possible formats
-            try:
-                start_dt = datetime.fromisoformat(start_time)
-            except ValueError:
-                # Handle timestamps with 'Z' suffix
-                if 'Z' in start_time:
-                    start_dt = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
-                else:
-                    # Assume naive timestamps are in UTC
-                    start_dt = datetime.fromisoformat(start_time).replace(tzinfo=timezone.utc)
-            
-            if end_time:
-                try:
-                    end_dt = datetime.fromisoformat(end_time)
-                except ValueError:
-                    if 'Z' in end_time:
-                        end_dt = datetime.fromisoformat(end_time.replace('Z', '+00:00'))
-                    else:
-                        end_dt = datetime.fromisoformat(end_time).replace(tzinfo=timezone.utc)
-            else:
-                end_dt = datetime.now(timezone.utc)
-            
-            # Normalize timezone info - always use UTC for consistent calculations
-            if start_dt.tzinfo is None:
-                start_dt = start_dt.replace(tzinfo=timezone.utc)
-            if end_dt.tzinfo is None:
-                end_dt = end_dt.replace(tzinfo=timezone.utc)
-            
-            # Direct time difference calculation - no timezone adjustments
-            diff_seconds = (end_dt - start_dt).total_seconds()
-            return diff_seconds / 3600
-        except Exception as e:
-            logger.error(f"Error calculating time difference: {str(e)}")
-            return 0
-    
-    db.create_function("current_iso_time", 0, get_current_iso_time)
-    db.create_function("time_diff_hours", 2, time_diff_hours)
-    return db
\ No newline at end of file
+    db.create_function("current_iso_time", 0, _counted(get_current_iso_time))
+    return db
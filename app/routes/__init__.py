@@ -6,6 +6,8 @@ from .timer_routes import bp as timer_bp
 from .image_routes import bp as image_bp
 from .system_routes import bp as system_bp
 from .report_routes import bp as report_bp
+from .search_routes import bp as search_bp
+from .asset_routes import bp as asset_bp
 
 def init_app(app):
     app.register_blueprint(customer_bp, url_prefix='/')
@@ -13,4 +15,6 @@ def init_app(app):
     app.register_blueprint(timer_bp, url_prefix='/timer')
     app.register_blueprint(image_bp, url_prefix='/image')
     app.register_blueprint(system_bp, url_prefix='/system')
-    app.register_blueprint(report_bp, url_prefix='/report')
\ No newline at end of file
+    app.register_blueprint(report_bp, url_prefix='/report')
+    app.register_blueprint(search_bp, url_prefix='/search')
+    app.register_blueprint(asset_bp, url_prefix='/assets')
\ No newline at end of file
@@ -0,0 +1,24 @@
+# app/routes/asset_routes.py
+import mimetypes
+from flask import Blueprint, request, send_from_directory, abort
+from ..utils.asset_utils import asset_manifest, ASSET_MAX_AGE
+
+bp = Blueprint('assets', __name__)
+
+@bp.route('/<path:filename>')
+def asset(filename):
+    """Fingerprinted static file, precompressed when the client accepts it"""
+    picked = asset_manifest.pick(filename, request.accept_encodings)
+    if picked is None:
+        abort(404)
+    path, encoding = picked
+
+    response = send_from_directory(asset_manifest.build_dir, path,
+                                   mimetype=mimetypes.guess_type(filename)[0],
+                                   max_age=ASSET_MAX_AGE)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
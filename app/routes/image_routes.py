@@ -1,14 +1,16 @@
 # app/routes/image_routes.py
-from flask import Blueprint, request, jsonify, send_file, abort, current_app, url_for, redirect
+from flask import Blueprint, Response, request, jsonify, send_file, abort, current_app, url_for, redirect, render_template
+from werkzeug.datastructures import ContentRange
 from werkzeug.utils import secure_filename
 import os
 from datetime import datetime, timedelta
-import uuid
 import json
-import zipfile
-import io
 from ..db import with_db
 from ..utils.image_utils import ImageManager
+from ..utils.upload_utils import upload_processor
+from ..utils.thumbnail_utils import thumbnail_cache
+from ..utils.zip_utils import StreamingZip
+from ..utils.share_utils import share_links
 import logging
 import mimetypes
 
@@ -17,9 +19,11 @@ logger = logging.getLogger('jobmanager')
 
 ALLOWED_EXTENSIONS = {'jpg', 'jpeg', 'png', 'gif', 'pdf'}
 UPLOAD_FOLDER = 'instance/uploads'
-
-# Store temporary share links
-SHARE_LINKS = {}
+PROCESSING_PLACEHOLDER = 'image-processing.svg'
+PDF_PLACEHOLDER = 'pdf-thumbnail.svg'
+DEFAULT_THUMBNAIL_SIZE = 300
+# Stored files are never rewritten under the same name, so browsers may keep them
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
@@ -27,66 +31,112 @@ def allowed_file(filename):
 def is_pdf(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() == 'pdf'
 
+def send_stored_file(path, mimetype=None, as_attachment=False):
+    """Send an uploaded file or image variant with long-lived caching.
+
+    The strong ETag comes from the file's mtime and size; send_file
+    answers If-None-Match/If-Modified-Since with 304 and Range requests
+    with 206. Cache-Control is immutable since stored names never change.
+    """
+    stat = os.stat(path)
+    response = send_file(
+        path,
+        mimetype=mimetype,
+        as_attachment=as_attachment,
+        etag=f'{stat.st_mtime_ns:x}-{stat.st_size:x}',
+        last_modified=stat.st_mtime,
+        max_age=current_app.config.get('IMAGE_CACHE_MAX_AGE', IMMUTABLE_MAX_AGE),
+        conditional=True
+    )
+    response.cache_control.immutable = True
+    return response
+
 # app/routes/image_routes.py
 @bp.route('/upload/direct/<int:job_id>', methods=['POST'])
 @with_db
 def upload_direct(db, job_id):
-    """Handle direct file uploads from web/mobile"""
+    """Handle direct file uploads from web/mobile.
+
+    Images are staged and acknowledged right away; the upload processor
+    writes the resized image and thumbnail in the background.
+    """
     if 'file' not in request.files:
         return jsonify({'error': 'No file part'}), 400
         
-    file = request.files['file']
-    if not file or file.filename == '':
+    files = [file for file in request.files.getlist('file') if file and file.filename]
+    if not files:
         return jsonify({'error': 'No selected file'}), 400
     
-    if not allowed_file(file.filename):
+    if not all(allowed_file(file.filename) for file in files):
         return jsonify({'error': 'Invalid file type'}), 400
 
     try:
-        # Generate a secure filename with a unique timestamp
-        original_filename = secure_filename(file.filename)
-        file_ext = original_filename.rsplit('.', 1)[1].lower() if '.' in original_filename else ''
-        
-        # Add microseconds to timestamp for uniqueness
-        timestamp = datetime.now().strftime('%y%m%d%H%M%S%f')[:16]
+        image_mgr = ImageManager(os.path.join(current_app.instance_path, 'images'))
+        job_identifier = image_mgr.get_job_identifier(db, job_id)
+        uploaded = []
         
-        # Handle PDFs and images differently
-        if file_ext == 'pdf':
-            # For PDFs, we just store the file directly
-            # Create job directory if it doesn't exist
-            job_path = os.path.join(current_app.instance_path, 'images', f'job_{job_id}')
-            os.makedirs(job_path, exist_ok=True)
+        for index, file in enumerate(files):
+            # Generate a secure filename with a unique timestamp
+            original_filename = secure_filename(file.filename)
+            file_ext = original_filename.rsplit('.', 1)[1].lower() if '.' in original_filename else ''
             
-            # Generate filename with unique timestamp
-            filename = f'doc_{timestamp}.pdf'
+            # Add microseconds to timestamp for uniqueness
+            timestamp = datetime.now().strftime('%y%m%d%H%M%S%f')[:16]
+            if index:
+                timestamp = f'{timestamp}-{index}'
             
-            # Save the file
-            file_path = os.path.join(job_path, filename)
-            file.save(file_path)
-        else:
-            # For images, use the image manager
-            image_mgr = ImageManager(os.path.join(current_app.instance_path, 'images'))
-            filename = image_mgr.process_image(job_id, file, db, timestamp)
+            # Handle PDFs and images differently
+            if file_ext == 'pdf':
+                # For PDFs, we just store the file directly
+                # Create job directory if it doesn't exist
+                job_path = os.path.join(current_app.instance_path, 'images', f'job_{job_id}')
+                os.makedirs(job_path, exist_ok=True)
+                
+                # Generate filename with unique timestamp
+                filename = f'doc_{timestamp}.pdf'
+                
+                # Save the file
+                file.save(os.path.join(job_path, filename))
+                status = 'ready'
+            else:
+                # For images, stage the original for the worker pool
+                filename = f'{job_identifier}-{timestamp}.{file_ext}'
+                upload_processor.stage(job_id, file, filename)
+                status = 'processing'
             
-            # Verify filename is not None
-            if not filename:
-                raise ValueError("Failed to process image: filename is None")
-        
-        # Store in database
-        db.execute(
-            'INSERT INTO job_image (job_id, filename, description, timestamp) VALUES (?, ?, ?, ?)',
-            (job_id, filename, request.form.get('description', ''), datetime.now().isoformat())
-        )
+            # Store in database
+            db.execute(
+                'INSERT INTO job_image (job_id, filename, description, timestamp) VALUES (?, ?, ?, ?)',
+                (job_id, filename, request.form.get('description', ''), datetime.now().isoformat())
+            )
+            uploaded.append({
+                'filename': filename,
+                'status': status,
+                'status_url': url_for('image.image_status', job_id=job_id, filename=filename)
+            })
         db.commit()
         
+        # Queue processing once the records exist
+        for upload in uploaded:
+            if upload['status'] == 'processing':
+                upload_processor.submit(job_id, upload['filename'])
+        
         # Redirect back to job details if it's a form submission (not AJAX)
         if request.form.get('_redirect') == 'true':
             return redirect(url_for('job.job_details', id=job_id))
             
-        return jsonify({'success': True, 'filename': filename})
+        return jsonify({'success': True, 'filename': uploaded[0]['filename'], 'files': uploaded})
     except Exception as e:
         logger.error(f"Upload failed: {str(e)}", exc_info=True)
         return jsonify({'error': str(e)}), 500
+
+@bp.route('/status/<int:job_id>/<path:filename>')
+def image_status(job_id, filename):
+    """Report whether an uploaded image has been processed"""
+    # Stored names are flat; anything else could probe outside the job directory
+    if filename != os.path.basename(filename):
+        abort(404)
+    return jsonify({'filename': filename, 'status': upload_processor.status(job_id, filename)})
     
 @bp.route('/upload/watch/<int:job_id>', methods=['POST'])
 @with_db
@@ -147,13 +197,13 @@ def setup_watch_folder(job_id):
 @bp.route('/serve_file/<int:job_id>/<path:filename>')
 def serve_file(job_id, filename):
     """Serve any file (image or PDF)"""
+    if filename != os.path.basename(filename):
+        abort(404)
+    
     try:
         job_path = os.path.join(current_app.instance_path, 'images', f'job_{job_id}')
         file_path = os.path.join(job_path, filename)
         
-        if not os.path.exists(file_path):
-            abort(404)
-        
         # Determine the content type
         content_type = None
         if filename.lower().endswith('.pdf'):
@@ -161,7 +211,7 @@ def serve_file(job_id, filename):
         else:
             content_type = mimetypes.guess_type(filename)[0]
         
-        return send_file(
+        return send_stored_file(
             file_path,
             mimetype=content_type,
             as_attachment=request.args.get('download', '').lower() == 'true'
@@ -174,9 +224,15 @@ def serve_file(job_id, filename):
     
 @bp.route('/serve_image/<int:job_id>/<path:filename>')
 def serve_image(job_id, filename):
-    """Serve an image file"""
+    """Serve an image, or a cached variant with ?size=<px> (?thumbnail=true is the default size)"""
+    # Stored names are flat; anything else could reach outside the job directory
+    if filename != os.path.basename(filename):
+        abort(404)
+    
     try:
-        thumbnail = request.args.get('thumbnail', 'false').lower() == 'true'
+        size = request.args.get('size', type=int)
+        if size is None and request.args.get('thumbnail', 'false').lower() == 'true':
+            size = DEFAULT_THUMBNAIL_SIZE
         image_mgr = ImageManager(os.path.join(current_app.instance_path, 'images'))
         
         # Determine file extension and content type
@@ -185,13 +241,35 @@ def serve_image(job_id, filename):
             'jpg': 'image/jpeg',
             'jpeg': 'image/jpeg',
             'png': 'image/png',
-            'gif': 'image/gif'
+            'gif': 'image/gif',
+            'pdf': 'application/pdf'
         }.get(ext, 'image/jpeg')
         
-        return send_file(
-            image_mgr.get_image_path(job_id, filename, thumbnail),
-            mimetype=content_type
-        )
+        image_path = image_mgr.get_image_path(job_id, filename)
+        if not os.path.exists(image_path) and upload_processor.status(job_id, filename) == 'processing':
+            # Still in the worker pool; show a placeholder that isn't cached
+            response = send_file(
+                os.path.join(current_app.static_folder, PROCESSING_PLACEHOLDER),
+                mimetype='image/svg+xml'
+            )
+            response.headers['Cache-Control'] = 'no-store'
+            return response
+        
+        if size:
+            if ext == 'pdf':
+                return send_file(os.path.join(current_app.static_folder, PDF_PLACEHOLDER),
+                                 mimetype='image/svg+xml')
+            try:
+                image_path = thumbnail_cache.get(job_id, filename, image_path, thumbnail_cache.pick_size(size))
+            except FileNotFoundError:
+                raise
+            except OSError as e:
+                # Corrupt or truncated upload (UnidentifiedImageError is an
+                # OSError); send it as stored rather than fail the page
+                logger.warning(f"No thumbnail for {filename} of job {job_id}, sending the original: {e}")
+        
+        return send_stored_file(image_path, mimetype=content_type,
+                                as_attachment=request.args.get('download', '').lower() == 'true')
     except FileNotFoundError:
         abort(404)
 
@@ -247,6 +325,10 @@ def delete_image(db, job_id, image_id):
             logger.error(f"Error deleting image files: {str(e)}")
             # Continue to delete database record even if file deletion fails
         
+        # Drop the staged copy if it hasn't been processed yet, and any variants
+        upload_processor.discard(job_id, filename)
+        thumbnail_cache.discard(job_id, filename)
+        
         # Delete database record
         db.execute('DELETE FROM job_image WHERE id = ?', (image_id,))
         db.commit()
@@ -291,16 +373,10 @@ def create_share_link(db, job_id):
             return jsonify({'error': 'No images found'}), 404
             
         # Create share token
-        share_token = str(uuid.uuid4())
-        expiry = datetime.now() + timedelta(hours=expiry_hours)
-        
-        SHARE_LINKS[share_token] = {
-            'job_id': job_id,
-            'images': [{'id': img['id'], 'filename': img['filename']} for img in images],
-            'expires': expiry.isoformat(),
-            'customer_name': job['customer_name'] if 'customer_name' in job else None,
-            'job_description': job['description']
-        }
+        share_token, expires_epoch = share_links.create(
+            db, job_id, [img['id'] for img in images], expiry_hours
+        )
+        expiry = datetime.fromtimestamp(expires_epoch)
         
         # Generate share URL
         share_url = url_for('image.shared_images', token=share_token, _external=True)
@@ -315,16 +391,13 @@ def create_share_link(db, job_id):
         return jsonify({'error': str(e)}), 500
 
 @bp.route('/shared/<token>')
-def shared_images(token):
+@with_db
+def shared_images(db, token):
     """Display shared images"""
-    if token not in SHARE_LINKS:
+    share_data = share_links.get(db, token)
+    if share_data is None:
         abort(404)
-        
-    share_data = SHARE_LINKS[token]
-    
-    # Check if expired
-    if datetime.now() > datetime.fromisoformat(share_data['expires']):
-        del SHARE_LINKS[token]
+    if share_data['expired']:
         abort(410)  # Gone
         
     return render_template(
@@ -334,42 +407,56 @@ def shared_images(token):
     )
 
 @bp.route('/download/<token>')
-def download_images(token):
+@with_db
+def download_images(db, token):
     """Download all shared files as ZIP"""
-    if token not in SHARE_LINKS:
+    share_data = share_links.get(db, token)
+    if share_data is None:
         abort(404)
-        
-    share_data = SHARE_LINKS[token]
-    
-    # Check if expired
-    if datetime.now() > datetime.fromisoformat(share_data['expires']):
-        del SHARE_LINKS[token]
+    if share_data['expired']:
         abort(410)  # Gone
     
     try:
-        # Create in-memory ZIP file
-        memory_file = io.BytesIO()
         job_id = share_data['job_id']
         job_path = os.path.join(current_app.instance_path, 'images', f'job_{job_id}')
-        
-        with zipfile.ZipFile(memory_file, 'w', zipfile.ZIP_DEFLATED) as zf:
-            for img in share_data['images']:
-                # For all file types, use the direct file path
-                file_path = os.path.join(job_path, img['filename'])
-                if os.path.exists(file_path):
-                    zf.write(file_path, img['filename'])
-        
-        # Reset file pointer and send file
-        memory_file.seek(0)
-        job_identifier = f"job_{job_id}"
-        filename = f"{job_identifier}_files_{datetime.now().strftime('%Y%m%d')}.zip"
-        
-        return send_file(
-            memory_file,
-            mimetype='application/zip',
-            as_attachment=True,
-            download_name=filename
-        )
+        files = [(img['filename'], os.path.join(job_path, img['filename']))
+                 for img in share_data['images']]
+        archive = StreamingZip([(name, path) for name, path in files if os.path.exists(path)])
     except Exception as e:
         logger.error(f"Download ZIP failed: {str(e)}", exc_info=True)
-        abort(500)
\ No newline at end of file
+        abort(500)
+    
+    job_identifier = f"job_{job_id}"
+    filename = f"{job_identifier}_files_{datetime.now().strftime('%Y%m%d')}.zip"
+    
+    # Resume: a single Range is honoured unless If-Range names a different
+    # archive, by ETag or by its Last-Modified date (to the second). Multiple
+    # ranges can't be streamed, so those get the whole archive.
+    if_range = request.if_range
+    if if_range.etag is not None:
+        range_valid = if_range.etag == archive.etag
+    elif if_range.date is not None:
+        range_valid = int(if_range.date.timestamp()) == int(archive.last_modified)
+    else:
+        range_valid = True
+
+    start, stop, status = 0, archive.size, 200
+    if request.range and len(request.range.ranges) == 1 and range_valid:
+        byte_range = request.range.range_for_length(archive.size)
+        if byte_range is None:
+            response = Response(status=416)
+            response.headers['Content-Range'] = f'bytes */{archive.size}'
+            return response
+        start, stop = byte_range
+        status = 206
+    
+    response = Response(archive.iter_bytes(start, stop), status=status, mimetype='application/zip',
+                        direct_passthrough=True)
+    response.content_length = stop - start
+    response.set_etag(archive.etag)
+    response.last_modified = archive.last_modified
+    response.accept_ranges = 'bytes'
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    if status == 206:
+        response.content_range = ContentRange('bytes', start, stop, archive.size)
+    return response
\ No newline at end of file
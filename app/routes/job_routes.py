@@ -1,13 +1,14 @@
 # app/routes/job_routes.py
-import shutil
 from datetime import datetime, timezone, timedelta
 import os
-import zipfile
 from flask import Blueprint, render_template, request, redirect, url_for, jsonify, current_app
-from ..db import with_db
+from ..db import with_db, ENTRY_HOURS, JOB_HOURS
 from ..utils.job_utils import JobManager
 from ..utils.material_utils import MaterialManager
 from ..utils.time_utils import get_current_time, format_time
+from ..utils.upload_utils import upload_processor
+from ..utils.pagination_utils import get_page_size, encode_cursor, decode_cursor
+from ..utils.backup_utils import backup_manager
 
 import logging
 import qrcode
@@ -17,158 +18,112 @@ from urllib.parse import urljoin
 
 bp = Blueprint('job', __name__)
 
+# Non-pinned jobs shown per job list page
+JOB_LIST_PAGE_SIZE = 50
+JOB_LIST_MAX_PAGE_SIZE = 500
+
+@bp.route('/backup/status')
+def backup_status():
+    """Progress of the latest backup"""
+    return jsonify(backup_manager.status())
+
 @bp.route('/backup/<type>')
-@with_db
-def create_backup(db, type):
-    try:
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M')
-        
-        # Get and log absolute paths
-        root_path = os.path.abspath(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-        current_app.logger.info(f"Root path: {root_path}")
-        current_app.logger.info(f"Current working directory: {os.getcwd()}")
-        current_app.logger.info(f"Instance path: {current_app.instance_path}")
-        
-        # Create backups directory in root path
-        backup_dir = os.path.join(root_path, 'backups')
-        if not os.path.exists(backup_dir):
-            os.makedirs(backup_dir)
-            current_app.logger.info(f"Created backup directory: {backup_dir}")
-                
-        if type == 'db':
-            # Database backup
-            db_path = current_app.config['DATABASE']
-            backup_name = f'db_backup_{timestamp}.db'
-            backup_path = os.path.join(backup_dir, backup_name)
-            
-            current_app.logger.info(f"DB Path: {db_path}")
-            current_app.logger.info(f"Backup Path: {backup_path}")
-            
-            # Close the current database connection
-            db.close()
-            
-            # Copy the database file
-            shutil.copy2(db_path, backup_path)
-            
-            current_app.logger.info(f"Database backup created at: {backup_path}")
-            current_app.logger.info(f"Backup file exists: {os.path.exists(backup_path)}")
-            
-            return jsonify({
-                'success': True,
-                'message': f'Database backup created: {backup_name}'
-            })
-            
-        elif type == 'full':
-            backup_name = f'jobmanager_backup_{timestamp}.zip'
-            backup_path = os.path.join(backup_dir, backup_name)
-            
-            current_app.logger.info(f"Creating full backup at: {backup_path}")
-            
-            include_dirs = ['app', 'instance']
-            include_files = ['run.py', 'init_db.py', 'gitback.sh']
-            exclude_patterns = [
-                '__pycache__',
-                '*.pyc',
-                '*.pyo',
-                '*.pyd',
-                '.git',
-                '.env',
-                'venv',
-                'env',
-                '*.db',
-                'backups',
-                'backup.py',
-                '*.zip',
-                '.txt',
-                '*.md',
-                'images'
-            ]
-
-            with zipfile.ZipFile(backup_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                # Add individual files from root
-                for file in include_files:
-                    file_path = os.path.join(root_path, file)
-                    if os.path.exists(file_path):
-                        current_app.logger.info(f"Adding file: {file_path}")
-                        zipf.write(file_path, file)
-
-                # Add directories
-                for dir_name in include_dirs:
-                    dir_path = os.path.join(root_path, dir_name)
-                    if os.path.exists(dir_path):
-                        for root, dirs, files in os.walk(dir_path):
-                            # Remove excluded directories
-                            dirs[:] = [d for d in dirs if d not in exclude_patterns]
-                            
-                            for file in files:
-                                if not any(file.endswith(pat.strip('*')) for pat in exclude_patterns):
-                                    file_path = os.path.join(root, file)
-                                    arc_path = os.path.relpath(file_path, root_path)
-                                    current_app.logger.info(f"Adding to zip: {arc_path}")
-                                    zipf.write(file_path, arc_path)
-
-            current_app.logger.info(f"Full backup created at: {backup_path}")
-            current_app.logger.info(f"Backup file exists: {os.path.exists(backup_path)}")
-            
-            return jsonify({
-                'success': True,
-                'message': f'Full system backup created: {backup_name}'
-            })
-            
+def create_backup(type):
+    """Start a database ('db') or full snapshot ('full') backup in the background"""
+    if type not in ('db', 'full'):
         return jsonify({
             'success': False,
             'message': 'Invalid backup type specified'
         })
-        
+    
+    try:
+        started, status = backup_manager.start(type)
     except Exception as e:
         current_app.logger.error(f"Backup failed: {str(e)}", exc_info=True)
         return jsonify({
             'success': False,
             'message': f'Backup failed: {str(e)}'
-        })    
+        })
+    
+    if not started:
+        return jsonify({
+            'success': False,
+            'message': 'Another backup is still running',
+            'status': status
+        }), 409
+    
+    label = 'Database backup' if type == 'db' else 'Full system snapshot'
+    return jsonify({
+        'success': True,
+        'message': f"{label} started: {status['name']}",
+        'status_url': url_for('job.backup_status')
+    }), 202
 
 
 @bp.route('/')
 @with_db
 def job_list(db):
-    """Display all jobs with proper time calculations."""
-    jobs = db.execute('''
-    WITH job_hours AS (
-        SELECT 
-            job_id,
-            SUM(time_diff_hours(start_time, COALESCE(end_time, current_iso_time()))) as hours
-        FROM time_entry
-        GROUP BY job_id
-    )
+    """Display jobs, newest first, one keyset page at a time.
+
+    Jobs with a running timer and Active jobs are pinned to the first page;
+    the remaining jobs page by (list_sort_key, id) via the ?after= cursor.
+    """
+    per_page = get_page_size(JOB_LIST_PAGE_SIZE, JOB_LIST_MAX_PAGE_SIZE)
+    after = decode_cursor(request.args.get('after'), 2)
+
+    select = f'''
     SELECT 
         job.*,
         customer.name as customer_name,
         te_active.id as active_timer_id,
         te_active.start_time as timer_start,
-        COALESCE(job_hours.hours, 0) as accumulated_hours
+        {JOB_HOURS} as accumulated_hours
     FROM job 
     JOIN customer ON job.customer_id = customer.id 
     LEFT JOIN time_entry te_active ON job.id = te_active.job_id 
         AND te_active.end_time IS NULL
-    LEFT JOIN job_hours ON job_hours.job_id = job.id
-    ORDER BY 
-        te_active.id IS NOT NULL DESC,
-        CASE job.status
-            WHEN 'Active' THEN 1
-            WHEN 'Pending' THEN 2
-            WHEN 'Completed' THEN 3
-        END,
-        job.last_active DESC NULLS LAST,
-        job.creation_date DESC
-    ''').fetchall()
-    
-    # We can log information for debugging
-    logger = current_app.logger
-    for job in jobs:
-        if job['active_timer_id']:
-            logger.info(f"Job {job['id']} has active timer. Hours: {job['accumulated_hours']}")
-    
-    return render_template('job_list.html', jobs=jobs)
+    LEFT JOIN job_hours_rollup ON job_hours_rollup.job_id = job.id
+    '''
+
+    pinned = []
+    if after is None:
+        pinned = db.execute(select + '''
+        WHERE te_active.id IS NOT NULL OR job.status = 'Active'
+        ORDER BY 
+            te_active.id IS NOT NULL DESC,
+            job.last_active DESC NULLS LAST,
+            job.creation_date DESC
+        ''').fetchall()
+
+        # We can log information for debugging
+        logger = current_app.logger
+        for job in pinned:
+            if job['active_timer_id']:
+                logger.info(f"Job {job['id']} has active timer. Hours: {job['accumulated_hours']}")
+
+    params = []
+    seek = ''
+    if after is not None:
+        seek = 'AND (job.list_sort_key, job.id) < (?, ?)'
+        params = after
+    rows = db.execute(select + f'''
+    WHERE te_active.id IS NULL AND job.status IS NOT 'Active'
+        {seek}
+    ORDER BY job.list_sort_key DESC, job.id DESC
+    LIMIT ?
+    ''', params + [per_page + 1]).fetchall()
+
+    # The extra row only tells us whether another page exists
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        next_cursor = encode_cursor(rows[-1]['list_sort_key'], rows[-1]['id'])
+
+    return render_template('job_list.html',
+                          jobs=pinned + rows,
+                          next_cursor=next_cursor,
+                          is_first_page=after is None,
+                          per_page=per_page)
 
 @bp.route('/add/<int:customer_id>', methods=['GET', 'POST'])
 @with_db
@@ -295,30 +250,25 @@ def job_details(db, id):
         
         return redirect(url_for('job.job_details', id=id))
     
-    # Use consistent time_diff_hours function for calculations
-    job = db.execute('''
-    WITH job_hours AS (
-        SELECT job_id,
-            SUM(time_diff_hours(start_time, COALESCE(end_time, current_iso_time()))) as hours
-        FROM time_entry
-        GROUP BY job_id
-    )
+    # Closed hours come from the rollup; only the running timer is added here
+    job = db.execute(f'''
     SELECT job.*, 
            customer.name as customer_name,
-           COALESCE(job_hours.hours, 0) as accumulated_hours
+           {JOB_HOURS} as accumulated_hours
     FROM job 
     JOIN customer ON job.customer_id = customer.id 
-    LEFT JOIN job_hours ON job_hours.job_id = job.id
+    LEFT JOIN job_hours_rollup ON job_hours_rollup.job_id = job.id
+    LEFT JOIN time_entry te_active ON te_active.job_id = job.id
+        AND te_active.end_time IS NULL
     WHERE job.id = ?
 ''', [id]).fetchone()
 
-    # Also use time_diff_hours for time entries
-    time_entries = db.execute('''
+    time_entries = db.execute(f'''
         SELECT *,
-            time_diff_hours(start_time, COALESCE(end_time, current_iso_time())) as hours
+            {ENTRY_HOURS} as hours
         FROM time_entry
         WHERE job_id = ? AND 
-            time_diff_hours(start_time, COALESCE(end_time, current_iso_time())) > 0
+            {ENTRY_HOURS} > 0
         ORDER BY start_time DESC
     ''', [id]).fetchall()
         
@@ -354,7 +304,8 @@ def job_details(db, id):
                          combined_notes=combined_notes,
                          total_hours=total_hours,
                          total_amount=total_amount,
-                         images=images)
+                         images=images,
+                         pending_images=upload_processor.pending(id))
 
 @bp.route('/<int:job_id>/edit_time_entry/<int:entry_id>', methods=['POST'])
 @with_db
@@ -533,13 +484,13 @@ def invoice(db, id):
         WHERE job.id = ?
     ''', [id]).fetchone()
     
-    # Use consistent time_diff_hours function for calculations
-    time_entries = db.execute('''
+    # Durations come from the integer epoch columns
+    time_entries = db.execute(f'''
         SELECT *,
-        time_diff_hours(start_time, COALESCE(end_time, current_iso_time())) as hours
+        {ENTRY_HOURS} as hours
         FROM time_entry
         WHERE job_id = ? AND 
-              time_diff_hours(start_time, COALESCE(end_time, current_iso_time())) > 0
+              {ENTRY_HOURS} > 0
         ORDER BY start_time
     ''', [id]).fetchall()
     
@@ -590,25 +541,19 @@ def get_template(db, template_id):
 @with_db
 def quick_timer(db):
     """Mobile-friendly timer interface with consistent time handling."""
-    jobs = db.execute('''
-        WITH job_hours AS (
-            SELECT 
-                job_id,
-                SUM(time_diff_hours(start_time, COALESCE(end_time, current_iso_time()))) as hours
-            FROM time_entry
-            GROUP BY job_id
-        )
+    jobs = db.execute(f'''
         SELECT 
             job.*,
             customer.name as customer_name,
             te_active.id as active_timer_id,
             te_active.start_time as timer_start,
-            COALESCE(job_hours.hours, 0) as accumulated_hours
+            te_active.start_epoch as timer_start_epoch,
+            {JOB_HOURS} as accumulated_hours
         FROM job 
         JOIN customer ON job.customer_id = customer.id 
         LEFT JOIN time_entry te_active ON job.id = te_active.job_id 
             AND te_active.end_time IS NULL
-        LEFT JOIN job_hours ON job_hours.job_id = job.id
+        LEFT JOIN job_hours_rollup ON job_hours_rollup.job_id = job.id
         WHERE job.status = 'Active'
         ORDER BY 
             te_active.id IS NOT NULL DESC,
@@ -639,8 +584,10 @@ def generate_qr():
     finally:
         s.close()
     
-    # Create the full URL with IP and port
-    quick_timer_url = f'http://{local_ip}:8080/job/quick_timer'
+    # Create the full URL with IP and the port this server listens on
+    # (8080 under gunicorn.conf.py, 5000 for run.py)
+    port = request.environ.get('SERVER_PORT', '8080')
+    quick_timer_url = f'http://{local_ip}:{port}/job/quick_timer'
     
     # Create QR code
     qr = qrcode.QRCode(
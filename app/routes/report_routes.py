@@ -1,14 +1,21 @@
 # app/routes/report_routes.py
 from flask import Blueprint, render_template, request, redirect, url_for
-from ..db import with_db
+from ..db import with_db, ENTRY_HOURS
 from datetime import datetime, timedelta, date
 import sqlite3
+import re
 import logging
-from ..utils.time_utils import iso_to_datetime, get_time_difference_seconds
+from ..utils.pagination_utils import get_page_size
+from ..utils.time_utils import iso_to_datetime, get_time_difference_seconds, parse_timestamp
 
 bp = Blueprint('report', __name__)
 logger = logging.getLogger('jobmanager')
 
+# Weeks per page in the all-weeks view
+WEEKS_PAGE_SIZE = 12
+WEEKS_MAX_PAGE_SIZE = 104
+WEEK_PATTERN = re.compile(r'^\d{4}-W\d{2}$')
+
 @bp.route('/weekly_summary')
 @with_db
 def weekly_summary(db):
@@ -31,47 +38,15 @@ def weekly_summary(db):
 
         # Get all available weeks for the dropdown
         try:
-            # Use a simpler query that's less likely to fail
-            logger.info("Fetching available weeks")
-            db.execute("SELECT 1").fetchone()  # Test database connection
-            
-            available_weeks = []
-            weeks_query = '''
-                SELECT DISTINCT
-                    date(start_time) as entry_date
+            # iso_week is kept by trigger and indexed, so this reads the index only
+            weeks = db.execute('''
+                SELECT DISTINCT iso_week
                 FROM time_entry
-                ORDER BY entry_date DESC
-            '''
-            
-            # Process each date and convert to ISO week format
-            dates = db.execute(weeks_query).fetchall()
-            logger.info(f"Found {len(dates)} distinct dates with time entries")
-            
-            week_set = set()  # Use a set to avoid duplicates
-            for date_row in dates:
-                try:
-                    # Ensure consistent date parsing
-                    entry_date_str = date_row['entry_date']
-                    if entry_date_str:
-                        if isinstance(entry_date_str, str):
-                            if 'T' in entry_date_str:  # ISO format
-                                entry_date = datetime.fromisoformat(entry_date_str).date()
-                            else:  # SQLite date format
-                                entry_date = datetime.strptime(entry_date_str, '%Y-%m-%d').date()
-                        else:
-                            # If it's already a date object
-                            entry_date = entry_date_str
-                            
-                        year, week, _ = entry_date.isocalendar()
-                        week_str = f"{year}-W{week:02d}"
-                        week_set.add(week_str)
-                except (ValueError, TypeError) as e:
-                    logger.warning(f"Error processing date {date_row['entry_date']}: {str(e)}")
-                    continue
-            
-            # Convert set to sorted list
-            available_weeks = [{'week_str': week} for week in sorted(week_set, reverse=True)]
-            logger.info(f"Processed {len(available_weeks)} unique weeks")
+                WHERE iso_week IS NOT NULL
+                ORDER BY iso_week DESC
+            ''').fetchall()
+            available_weeks = [{'week_str': row['iso_week']} for row in weeks]
+            logger.info(f"Found {len(available_weeks)} weeks with time entries")
             
         except Exception as e:
             logger.error(f"Error fetching available weeks: {str(e)}", exc_info=True)
@@ -104,104 +79,79 @@ def weekly_summary(db):
         # Get all weeks data if show_all is true
         if show_all:
             try:
-                # Get summary data for all weeks
-                weekly_data = db.execute('''
-                    WITH time_summary AS (
-                        SELECT 
-                            job_id,
-                            date(start_time) as entry_date,
-                            SUM(
-                                CASE 
-                                    WHEN end_time IS NULL THEN
-                                        (julianday(datetime('now', 'localtime')) - julianday(start_time)) * 24
-                                    ELSE
-                                        (julianday(end_time) - julianday(start_time)) * 24
-                                END
-                            ) AS day_hours
-                        FROM time_entry
-                        GROUP BY job_id, entry_date
-                    )
+                # Keyset page of weeks, newest first; the extra row flags a next page
+                per_page = get_page_size(WEEKS_PAGE_SIZE, WEEKS_MAX_PAGE_SIZE)
+                after_week = request.args.get('after')
+                if after_week and not WEEK_PATTERN.match(after_week):
+                    after_week = None
+                
+                seek = 'AND iso_week < ?' if after_week else ''
+                page_weeks = [row['iso_week'] for row in db.execute(f'''
+                    SELECT DISTINCT iso_week
+                    FROM time_entry
+                    WHERE iso_week IS NOT NULL {seek}
+                    ORDER BY iso_week DESC
+                    LIMIT ?
+                ''', ([after_week] if after_week else []) + [per_page + 1]).fetchall()]
+                
+                next_week = None
+                if len(page_weeks) > per_page:
+                    page_weeks = page_weeks[:per_page]
+                    next_week = page_weeks[-1]
+                
+                # Per-job totals for the page's weeks, with the week totals alongside
+                weekly_data = [] if not page_weeks else db.execute(f'''
                     SELECT 
-                        ts.job_id,
-                        ts.entry_date,
+                        time_entry.iso_week,
+                        time_entry.job_id,
                         job.description AS job_description,
                         customer.name AS customer_name,
-                        job.base_rate,
-                        ts.day_hours AS total_hours
-                    FROM time_summary ts
-                    JOIN job ON ts.job_id = job.id
+                        SUM({ENTRY_HOURS}) AS hours,
+                        SUM({ENTRY_HOURS}) * COALESCE(job.base_rate, 0) AS amount,
+                        SUM(SUM({ENTRY_HOURS})) OVER week AS week_hours,
+                        SUM(SUM({ENTRY_HOURS}) * COALESCE(job.base_rate, 0)) OVER week AS week_amount
+                    FROM time_entry
+                    JOIN job ON time_entry.job_id = job.id
                     JOIN customer ON job.customer_id = customer.id
-                    ORDER BY ts.entry_date DESC, job.id
-                ''').fetchall()
+                    WHERE time_entry.iso_week BETWEEN ? AND ?
+                    GROUP BY time_entry.iso_week, time_entry.job_id
+                    WINDOW week AS (PARTITION BY time_entry.iso_week)
+                    ORDER BY time_entry.iso_week DESC, time_entry.job_id
+                ''', (page_weeks[-1], page_weeks[0])).fetchall()
                 
-                # Group by week
+                # Rows arrive grouped and sorted, most recent week first
                 weeks_summary = {}
-                
                 for entry in weekly_data:
-                    try:
-                        # Convert date to ISO week
-                        entry_date_str = entry['entry_date']
-                        if isinstance(entry_date_str, str):
-                            if 'T' in entry_date_str:  # ISO format
-                                entry_date = datetime.fromisoformat(entry_date_str).date()
-                            else:  # SQLite date format
-                                entry_date = datetime.strptime(entry_date_str, '%Y-%m-%d').date()
-                        else:
-                            # If it's already a date object
-                            entry_date = entry_date_str
-                            
-                        year, week, _ = entry_date.isocalendar()
-                        
-                        # Use zero-padded week number for consistent sorting
-                        week_str = f"{year}-W{week:02d}"
-                        
-                        if week_str not in weeks_summary:
-                            weeks_summary[week_str] = {
-                                'week_start': entry['entry_date'],
-                                'job_totals': {},
-                                'total_hours': 0,
-                                'total_amount': 0
-                            }
-                        
-                        # Create job key
-                        job_key = f"{entry['job_id']}-{entry['job_description']}-{entry['customer_name']}"
-                        
-                        # Ensure total_hours is not None
-                        total_hours = entry['total_hours'] if entry['total_hours'] is not None else 0
-                        
-                        # Calculate amount only if base_rate is not None
-                        amount = total_hours * (entry['base_rate'] or 0)
-                        
-                        # Add or update job data
-                        if job_key not in weeks_summary[week_str]['job_totals']:
-                            weeks_summary[week_str]['job_totals'][job_key] = {
-                                'job_id': entry['job_id'],
-                                'description': entry['job_description'],
-                                'customer': entry['customer_name'],
-                                'hours': total_hours,
-                                'amount': amount
-                            }
-                        else:
-                            # Add to existing totals
-                            weeks_summary[week_str]['job_totals'][job_key]['hours'] += total_hours
-                            weeks_summary[week_str]['job_totals'][job_key]['amount'] += amount
-                        
-                        # Update week totals
-                        weeks_summary[week_str]['total_hours'] += total_hours
-                        weeks_summary[week_str]['total_amount'] += amount
-                    except Exception as e:
-                        logger.error(f"Error processing entry for week summary: {str(e)}")
-                        continue
+                    week_str = entry['iso_week']
+                    if week_str not in weeks_summary:
+                        year, week = week_str.split('-W')
+                        weeks_summary[week_str] = {
+                            'week_start': date.fromisocalendar(int(year), int(week), 1).isoformat(),
+                            'job_totals': {},
+                            'total_hours': entry['week_hours'] or 0,
+                            'total_amount': entry['week_amount'] or 0
+                        }
+                    
+                    job_key = f"{entry['job_id']}-{entry['job_description']}-{entry['customer_name']}"
+                    weeks_summary[week_str]['job_totals'][job_key] = {
+                        'job_id': entry['job_id'],
+                        'description': entry['job_description'],
+                        'customer': entry['customer_name'],
+                        'hours': entry['hours'] or 0,
+                        'amount': entry['amount'] or 0
+                    }
                 
-                # Sort weeks by most recent first
-                sorted_weeks = sorted(weeks_summary.items(), key=lambda x: x[0], reverse=True)
+                sorted_weeks = list(weeks_summary.items())
                 logger.info(f"Generated summary for {len(sorted_weeks)} weeks")
                 
                 return render_template('weekly_summary.html',
                                     selected_week=selected_week,
                                     available_weeks=available_weeks,
                                     show_all=show_all,
-                                    all_weeks=sorted_weeks)
+                                    all_weeks=sorted_weeks,
+                                    next_week=next_week,
+                                    is_first_page=after_week is None,
+                                    per_page=per_page)
             except Exception as e:
                 logger.error(f"Error generating all weeks data: {str(e)}", exc_info=True)
                 return render_template('weekly_summary.html',
@@ -220,6 +170,8 @@ def weekly_summary(db):
                 # Calculate start and end dates of the selected week
                 start_date = date.fromisocalendar(year, week_num, 1)  # Monday
                 end_date = date.fromisocalendar(year, week_num, 7)    # Sunday
+                # Match the zero-padded iso_week column
+                selected_week = f"{year}-W{week_num:02d}"
             else:
                 # Default to current week if format is invalid
                 today = date.today()
@@ -232,30 +184,21 @@ def weekly_summary(db):
             # Handle invalid week format
             return redirect(url_for('report.weekly_summary'))
         
-        # Format for SQLite date comparison
-        start_date_str = start_date.strftime('%Y-%m-%d')
-        end_date_str = end_date.strftime('%Y-%m-%d')
-        
         # Get all time entries for the selected week
         try:
-            time_entries = db.execute('''
+            time_entries = db.execute(f'''
                 SELECT 
                     time_entry.*,
                     job.description AS job_description,
                     job.base_rate,
                     customer.name AS customer_name,
-                    CASE 
-                        WHEN end_time IS NULL THEN
-                            (julianday(datetime('now', 'localtime')) - julianday(start_time)) * 24
-                        ELSE
-                            (julianday(end_time) - julianday(start_time)) * 24
-                    END AS hours
+                    {ENTRY_HOURS} AS hours
                 FROM time_entry
                 JOIN job ON time_entry.job_id = job.id
                 JOIN customer ON job.customer_id = customer.id
-                WHERE date(start_time) >= ? AND date(start_time) <= ?
+                WHERE time_entry.iso_week = ?
                 ORDER BY start_time
-            ''', (start_date_str, end_date_str)).fetchall()
+            ''', (selected_week,)).fetchall()
             
             logger.info(f"Found {len(time_entries)} time entries for week {selected_week}")
         except Exception as e:
@@ -276,10 +219,7 @@ def weekly_summary(db):
                     
                 # Get entry date safely
                 if isinstance(entry['start_time'], str):
-                    if 'T' in entry['start_time']:  # ISO format
-                        entry_date = datetime.fromisoformat(entry['start_time']).date()
-                    else:  # SQLite date format
-                        entry_date = datetime.strptime(entry['start_time'], '%Y-%m-%d').date()
+                    entry_date = parse_timestamp(entry['start_time']).date()
                 else:
                     # If it's already a date object
                     entry_date = entry['start_time']
@@ -0,0 +1,29 @@
+# app/routes/search_routes.py
+from flask import Blueprint, render_template, request, jsonify, url_for, current_app
+from ..db import with_db
+from ..utils.pagination_utils import get_page_size
+from ..utils.search_utils import search_index, SEARCH_MAX_RESULTS
+
+bp = Blueprint('search', __name__)
+
+def result_url(result):
+    """Page to open for a search result."""
+    if result['kind'] == 'customer':
+        return url_for('customer.edit_customer', id=result['id'])
+    return url_for('job.job_details', id=result['job_id'])
+
+@bp.route('')
+@with_db
+def search(db):
+    """Full-text search; prefix=true also matches the last word as a prefix (type-ahead)"""
+    query = request.args.get('q', '').strip()
+    prefix = request.args.get('prefix', 'false').lower() == 'true'
+    limit = get_page_size(current_app.config['SEARCH_RESULTS'], SEARCH_MAX_RESULTS)
+
+    results = search_index.search(db, query, prefix=prefix, limit=limit)
+    for result in results:
+        result['url'] = result_url(result)
+
+    if request.args.get('format') == 'json':
+        return jsonify({'query': query, 'results': results})
+    return render_template('search.html', query=query, results=results)
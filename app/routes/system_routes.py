@@ -1,10 +1,13 @@
 # app/routes/system_routes.py
-from flask import Blueprint, render_template, request, jsonify, current_app
+from flask import Blueprint, render_template, request, jsonify, current_app, Response
 from datetime import datetime, timezone, timedelta
 import os
 import logging
-from ..db import with_db
+from ..db import with_db, get_pool
 from ..utils.profile_utils import profile_manager
+from ..utils.query_utils import query_profiler
+from ..utils.metrics_utils import request_metrics
+from ..utils.scheduler_utils import scheduler
 
 bp = Blueprint('system', __name__)
 logger = logging.getLogger('jobmanager')
@@ -18,7 +21,8 @@ def settings(db):
     
     return render_template('system_settings.html', 
                           current_time=now,
-                          instance_path=current_app.instance_path)
+                          instance_path=current_app.instance_path,
+                          scheduled_tasks=scheduler.status())
 
 @bp.route('/set_time_offset', methods=['POST'])
 def set_time_offset():
@@ -126,4 +130,30 @@ def timer_diagnostics(db):
     Start time: {active_timer['start_time']}<br>
     Hours (UTC): {active_timer['hours_utc']}<br>
     Hours (local): {active_timer['hours_local']}<br>
-    """
\ No newline at end of file
+    """
+
+@bp.route('/metrics')
+def metrics():
+    """Show request and SQL statistics as JSON or Prometheus text"""
+    wants_prometheus = (
+        request.args.get('format') == 'prometheus'
+        or 'application/json' not in request.headers.get('Accept', '')
+        and 'text/plain' in request.headers.get('Accept', '')
+    )
+    if wants_prometheus:
+        return Response(request_metrics.prometheus(), mimetype='text/plain; version=0.0.4')
+
+    return jsonify({
+        'requests': request_metrics.snapshot(),
+        'sql': query_profiler.snapshot()
+    })
+
+@bp.route('/db_pool')
+def db_pool_stats():
+    """Show database connection pool statistics"""
+    return jsonify(get_pool().stats())
+
+@bp.route('/scheduler')
+def scheduler_status():
+    """Show scheduled maintenance tasks with their last and next runs"""
+    return jsonify(scheduler.status())
@@ -1,8 +1,11 @@
 # app/routes/timer_routes.py
-from flask import Blueprint, jsonify, redirect, url_for, request
+from flask import Blueprint, Response, jsonify, redirect, url_for, request, current_app
 from ..db import with_db  # Changed from ..utils.db_utils
 from ..utils.timer_utils import TimerManager
+from ..utils.event_utils import timer_events, format_event
 from datetime import datetime
+import queue
+import time
 
 bp = Blueprint('timer', __name__)
 
@@ -50,4 +53,46 @@ def update_job_total(db, id):
     return jsonify({
         'success': True,
         'total_hours': total
-    })
\ No newline at end of file
+    })
+
+@bp.route('/state')
+@with_db
+def timer_state(db):
+    """The running timer as JSON, revalidated by ETag so polling is cheap"""
+    response = jsonify(TimerManager(db).get_state())
+    # The body only changes when a timer starts, stops or is edited
+    response.add_etag()
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+@bp.route('/events')
+def events():
+    """Stream timer start, stop and total updates as Server-Sent Events"""
+    heartbeat = current_app.config['TIMER_EVENTS_HEARTBEAT']
+    # Streams end after a while so threads are freed; EventSource reconnects
+    deadline = time.monotonic() + current_app.config['TIMER_EVENTS_MAX_AGE']
+    subscriber = timer_events.subscribe()
+
+    def stream():
+        try:
+            yield 'retry: 3000\n\n'
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    name, data = subscriber.get(timeout=min(heartbeat, remaining))
+                except queue.Empty:
+                    if not timer_events.is_subscribed(subscriber):
+                        break
+                    yield ': keep-alive\n\n'
+                    continue
+                yield format_event(name, data)
+        finally:
+            timer_events.unsubscribe(subscriber)
+
+    return Response(stream(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        # Stop nginx from buffering the stream
+        'X-Accel-Buffering': 'no'
+    })
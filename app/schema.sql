@@ -24,6 +24,11 @@ CREATE TABLE IF NOT EXISTS job (
     estimated_hours REAL,
     total_hours REAL DEFAULT 0,
     last_active TEXT,
+    -- Job list order (status rank, then most recently active) for keyset paging
+    list_sort_key TEXT GENERATED ALWAYS AS (
+        CASE status WHEN 'Active' THEN '3' WHEN 'Pending' THEN '2' WHEN 'Completed' THEN '1' ELSE '0' END
+        || COALESCE(last_active, '')
+    ) VIRTUAL,
     FOREIGN KEY (customer_id) REFERENCES customer (id)
 );
 
@@ -39,9 +44,52 @@ CREATE TABLE IF NOT EXISTS time_entry (
     adjustment_reason TEXT,
     location TEXT,
     break_duration INTEGER DEFAULT 0,
+    start_epoch INTEGER,  -- start_time as Unix seconds (UTC), kept by trigger
+    end_epoch INTEGER,    -- end_time as Unix seconds (UTC), kept by trigger
+    iso_week TEXT,        -- ISO week of start_time (UTC), e.g. 2025-W11, kept by trigger
     FOREIGN KEY (job_id) REFERENCES job (id)
 );
 
+-- Keep the epoch columns in step with the ISO timestamps so durations are
+-- plain integer arithmetic. SQLite reads 'Z', '+HH:MM' and naive (UTC) values.
+CREATE TRIGGER IF NOT EXISTS time_entry_epoch_insert
+AFTER INSERT ON time_entry
+BEGIN
+    UPDATE time_entry
+    SET start_epoch = CAST(strftime('%s', NEW.start_time) AS INTEGER),
+        end_epoch = CAST(strftime('%s', NEW.end_time) AS INTEGER)
+    WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS time_entry_epoch_update
+AFTER UPDATE OF start_time, end_time ON time_entry
+BEGIN
+    UPDATE time_entry
+    SET start_epoch = CAST(strftime('%s', NEW.start_time) AS INTEGER),
+        end_epoch = CAST(strftime('%s', NEW.end_time) AS INTEGER)
+    WHERE id = NEW.id;
+END;
+
+-- ISO week key for report grouping. SQLite has no %G/%V before 3.46, so the
+-- week is taken from the Thursday of the entry's Monday-Sunday week.
+CREATE TRIGGER IF NOT EXISTS time_entry_week_insert
+AFTER INSERT ON time_entry
+BEGIN
+    UPDATE time_entry
+    SET iso_week = strftime('%Y', NEW.start_time, '-3 days', 'weekday 4') || '-W' ||
+        printf('%02d', (strftime('%j', NEW.start_time, '-3 days', 'weekday 4') - 1) / 7 + 1)
+    WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS time_entry_week_update
+AFTER UPDATE OF start_time ON time_entry
+BEGIN
+    UPDATE time_entry
+    SET iso_week = strftime('%Y', NEW.start_time, '-3 days', 'weekday 4') || '-W' ||
+        printf('%02d', (strftime('%j', NEW.start_time, '-3 days', 'weekday 4') - 1) / 7 + 1)
+    WHERE id = NEW.id;
+END;
+
 CREATE TABLE IF NOT EXISTS job_note (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     job_id INTEGER NOT NULL,
@@ -89,3 +137,196 @@ CREATE TABLE IF NOT EXISTS job_image (
     FOREIGN KEY (job_id) REFERENCES job (id)
 );
 
+
+-- Temporary links to a job's files. image_ids is a JSON list of job_image
+-- ids; expired rows are swept periodically using the expiry index.
+CREATE TABLE IF NOT EXISTS share_link (
+    token TEXT PRIMARY KEY,
+    job_id INTEGER NOT NULL,
+    image_ids TEXT NOT NULL,
+    created_epoch INTEGER NOT NULL,
+    expires_epoch INTEGER NOT NULL,
+    FOREIGN KEY (job_id) REFERENCES job (id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_share_link_expires ON share_link (expires_epoch);
+
+-- Seconds of closed (stopped) time per job. Kept current by the triggers
+-- below so job lists only add the single running timer at read time.
+CREATE TABLE IF NOT EXISTS job_hours_rollup (
+    job_id INTEGER PRIMARY KEY,
+    closed_seconds INTEGER NOT NULL DEFAULT 0,
+    FOREIGN KEY (job_id) REFERENCES job (id)
+);
+
+CREATE TRIGGER IF NOT EXISTS time_entry_rollup_insert
+AFTER INSERT ON time_entry
+WHEN NEW.start_epoch IS NOT NULL AND NEW.end_epoch IS NOT NULL
+BEGIN
+    INSERT INTO job_hours_rollup (job_id, closed_seconds)
+    VALUES (NEW.job_id, NEW.end_epoch - NEW.start_epoch)
+    ON CONFLICT (job_id) DO UPDATE
+    SET closed_seconds = closed_seconds + excluded.closed_seconds;
+END;
+
+CREATE TRIGGER IF NOT EXISTS time_entry_rollup_update
+AFTER UPDATE OF job_id, start_epoch, end_epoch ON time_entry
+BEGIN
+    UPDATE job_hours_rollup
+    SET closed_seconds = closed_seconds - (OLD.end_epoch - OLD.start_epoch)
+    WHERE job_id = OLD.job_id
+      AND OLD.start_epoch IS NOT NULL AND OLD.end_epoch IS NOT NULL;
+
+    INSERT INTO job_hours_rollup (job_id, closed_seconds)
+    SELECT NEW.job_id, NEW.end_epoch - NEW.start_epoch
+    WHERE NEW.start_epoch IS NOT NULL AND NEW.end_epoch IS NOT NULL
+    ON CONFLICT (job_id) DO UPDATE
+    SET closed_seconds = closed_seconds + excluded.closed_seconds;
+END;
+
+CREATE TRIGGER IF NOT EXISTS time_entry_rollup_delete
+AFTER DELETE ON time_entry
+WHEN OLD.start_epoch IS NOT NULL AND OLD.end_epoch IS NOT NULL
+BEGIN
+    UPDATE job_hours_rollup
+    SET closed_seconds = closed_seconds - (OLD.end_epoch - OLD.start_epoch)
+    WHERE job_id = OLD.job_id;
+END;
+
+-- Secondary indexes (schema version 3)
+CREATE INDEX IF NOT EXISTS idx_time_entry_job_start ON time_entry (job_id, start_time);
+CREATE INDEX IF NOT EXISTS idx_time_entry_open ON time_entry (job_id) WHERE end_time IS NULL;
+CREATE INDEX IF NOT EXISTS idx_job_material_job_timestamp ON job_material (job_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_job_note_job_timestamp ON job_note (job_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_job_image_job_timestamp ON job_image (job_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_job_status_last_active ON job (status, last_active);
+
+-- Weekly report grouping (schema version 4)
+CREATE INDEX IF NOT EXISTS idx_time_entry_week_job ON time_entry (iso_week, job_id, start_epoch, end_epoch);
+
+-- Job list pagination (schema version 5)
+CREATE INDEX IF NOT EXISTS idx_job_list_sort ON job (list_sort_key, id);
+
+-- Full-text index over jobs, customers, notes, materials and image
+-- descriptions (schema version 6). The rowid is source_id * 8 + kind
+-- (1 job, 2 customer, 3 note, 4 material, 5 image), so the triggers below
+-- update single rows by rowid. Prefix indexes serve type-ahead lookups.
+CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+    title,
+    body,
+    job_id UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS job_search_insert
+AFTER INSERT ON job
+BEGIN
+    INSERT INTO search_index (rowid, title, body, job_id)
+    VALUES (NEW.id * 8 + 1, NEW.description, '', NEW.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS job_search_update
+AFTER UPDATE OF description ON job
+BEGIN
+    DELETE FROM search_index WHERE rowid = OLD.id * 8 + 1;
+    INSERT INTO search_index (rowid, title, body, job_id)
+    VALUES (NEW.id * 8 + 1, NEW.description, '', NEW.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS job_search_delete
+AFTER DELETE ON job
+BEGIN
+    DELETE FROM search_index WHERE rowid = OLD.id * 8 + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS customer_search_insert
+AFTER INSERT ON customer
+BEGIN
+    INSERT INTO search_index (rowid, title, body, job_id)
+    VALUES (NEW.id * 8 + 2, NEW.name,
+            COALESCE(NEW.street, '') || ' ' || COALESCE(NEW.postal_code, '') || ' ' ||
+            COALESCE(NEW.city, '') || ' ' || COALESCE(NEW.country, '') || ' ' || COALESCE(NEW.notes, ''), NULL);
+END;
+
+CREATE TRIGGER IF NOT EXISTS customer_search_update
+AFTER UPDATE OF name, street, postal_code, city, country, notes ON customer
+BEGIN
+    DELETE FROM search_index WHERE rowid = OLD.id * 8 + 2;
+    INSERT INTO search_index (rowid, title, body, job_id)
+    VALUES (NEW.id * 8 + 2, NEW.name,
+            COALESCE(NEW.street, '') || ' ' || COALESCE(NEW.postal_code, '') || ' ' ||
+            COALESCE(NEW.city, '') || ' ' || COALESCE(NEW.country, '') || ' ' || COALESCE(NEW.notes, ''), NULL);
+END;
+
+CREATE TRIGGER IF NOT EXISTS customer_search_delete
+AFTER DELETE ON customer
+BEGIN
+    DELETE FROM search_index WHERE rowid = OLD.id * 8 + 2;
+END;
+
+CREATE TRIGGER IF NOT EXISTS job_note_search_insert
+AFTER INSERT ON job_note
+BEGIN
+    INSERT INTO search_index (rowid, title, body, job_id)
+    VALUES (NEW.id * 8 + 3, '', NEW.note, NEW.job_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS job_note_search_update
+AFTER UPDATE OF note, job_id ON job_note
+BEGIN
+    DELETE FROM search_index WHERE rowid = OLD.id * 8 + 3;
+    INSERT INTO search_index (rowid, title, body, job_id)
+    VALUES (NEW.id * 8 + 3, '', NEW.note, NEW.job_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS job_note_search_delete
+AFTER DELETE ON job_note
+BEGIN
+    DELETE FROM search_index WHERE rowid = OLD.id * 8 + 3;
+END;
+
+CREATE TRIGGER IF NOT EXISTS job_material_search_insert
+AFTER INSERT ON job_material
+BEGIN
+    INSERT INTO search_index (rowid, title, body, job_id)
+    VALUES (NEW.id * 8 + 4, NEW.material, '', NEW.job_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS job_material_search_update
+AFTER UPDATE OF material, job_id ON job_material
+BEGIN
+    DELETE FROM search_index WHERE rowid = OLD.id * 8 + 4;
+    INSERT INTO search_index (rowid, title, body, job_id)
+    VALUES (NEW.id * 8 + 4, NEW.material, '', NEW.job_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS job_material_search_delete
+AFTER DELETE ON job_material
+BEGIN
+    DELETE FROM search_index WHERE rowid = OLD.id * 8 + 4;
+END;
+
+-- Images are only indexed once they have a description or tags
+CREATE TRIGGER IF NOT EXISTS job_image_search_insert
+AFTER INSERT ON job_image
+WHEN NEW.description IS NOT NULL OR NEW.tags IS NOT NULL
+BEGIN
+    INSERT INTO search_index (rowid, title, body, job_id)
+    VALUES (NEW.id * 8 + 5, COALESCE(NEW.description, ''), COALESCE(NEW.tags, ''), NEW.job_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS job_image_search_update
+AFTER UPDATE OF description, tags, job_id ON job_image
+BEGIN
+    DELETE FROM search_index WHERE rowid = OLD.id * 8 + 5;
+    INSERT INTO search_index (rowid, title, body, job_id)
+    SELECT NEW.id * 8 + 5, COALESCE(NEW.description, ''), COALESCE(NEW.tags, ''), NEW.job_id
+    WHERE NEW.description IS NOT NULL OR NEW.tags IS NOT NULL;
+END;
+
+CREATE TRIGGER IF NOT EXISTS job_image_search_delete
+AFTER DELETE ON job_image
+BEGIN
+    DELETE FROM search_index WHERE rowid = OLD.id * 8 + 5;
+END;
@@ -32,7 +32,9 @@ document.addEventListener('DOMContentLoaded', function() {
         
         // When a file is selected, update the display
         input.addEventListener('change', function() {
-            if (input.files.length > 0) {
+            if (input.files.length > 1) {
+                fileNameDisplay.textContent = input.files.length + ' files selected';
+            } else if (input.files.length > 0) {
                 fileNameDisplay.textContent = input.files[0].name;
             } else {
                 fileNameDisplay.textContent = 'No file selected';
@@ -0,0 +1,28 @@
+// app/static/js/timer_events.js
+
+// Follow /timer/events and hand each change to the page. Elements carrying
+// data-job-id are passed to options.setActive(element, timer-or-null) and
+// options.setTotal(element, hours). Returns null when the browser has no
+// EventSource, in which case pages fall back to reloading.
+function watchTimerEvents(options) {
+    if (!window.EventSource) {
+        return null;
+    }
+
+    const source = new EventSource(options.url || '/timer/events');
+    const elementsFor = jobId => document.querySelectorAll(`[data-job-id="${jobId}"]`);
+    const on = (name, handler) => source.addEventListener(name, event => handler(JSON.parse(event.data)));
+
+    // Sent on every (re)connect, so missed events are caught up
+    on('state', data => {
+        document.querySelectorAll('[data-job-id]').forEach(element => {
+            const active = data.active && String(data.active.job_id) === element.dataset.jobId;
+            options.setActive(element, active ? data.active : null);
+        });
+    });
+    on('start', data => elementsFor(data.job_id).forEach(element => options.setActive(element, data)));
+    on('stop', data => elementsFor(data.job_id).forEach(element => options.setActive(element, null)));
+    on('total', data => elementsFor(data.job_id).forEach(element => options.setTotal(element, data.total_hours)));
+
+    return source;
+}
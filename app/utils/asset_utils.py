@@ -0,0 +1,157 @@
+# app/utils/asset_utils.py
+import os
+import gzip
+import json
+import hashlib
+import logging
+from flask import url_for
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+except ImportError:
+    # Only gzip variants then
+    brotli = None
+
+logger = logging.getLogger('jobmanager')
+
+# Static files that get fingerprinted and precompressed
+ASSET_EXTENSIONS = ('.css', '.js', '.svg')
+
+# A year; hashed names change whenever the content does
+ASSET_MAX_AGE = 365 * 24 * 3600
+
+MANIFEST_NAME = 'manifest.json'
+
+# Compressed siblings, in order of preference
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+def fingerprint(name, data):
+    """css/styles.css -> css/styles.<hash>.css"""
+    root, ext = os.path.splitext(name)
+    return f'{root}.{hashlib.sha256(data).hexdigest()[:12]}{ext}'
+
+def compress(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=11)
+    # mtime=0 keeps the output identical between builds
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+class AssetManifest:
+    """Fingerprinted, precompressed copies of the CSS/JS/SVG in app/static.
+
+    build() copies each asset to ASSET_BUILD_DIR under a content-hashed
+    name with .br and .gz siblings, so phones can cache it forever and
+    only download a new name when the file changes. Outputs are content
+    addressed: unchanged files are not compressed again on restart, and
+    names from earlier builds keep working for pages still open.
+    """
+
+    def __init__(self, app=None, static_folder=None, build_dir=None):
+        self.static_folder = static_folder
+        self.build_dir = build_dir
+        self.manifest = {}
+
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Build (or load a prebuilt) manifest and add static_url to templates."""
+        app.config.setdefault('ASSET_BUILD', True)
+        app.config.setdefault('ASSET_BUILD_DIR', os.path.join(app.instance_path, 'asset_build'))
+
+        self.static_folder = app.static_folder
+        self.build_dir = app.config['ASSET_BUILD_DIR']
+        if app.config['ASSET_BUILD']:
+            self.build()
+        else:
+            self.load()
+        app.extensions['assets'] = self
+        app.jinja_env.globals['static_url'] = self.url_for
+
+    def build(self):
+        """Write hashed and compressed copies of changed assets; returns the manifest."""
+        manifest = {}
+        written = 0
+        for root, dirs, files in os.walk(self.static_folder):
+            dirs.sort()
+            for filename in sorted(files):
+                if not filename.endswith(ASSET_EXTENSIONS):
+                    continue
+                path = os.path.join(root, filename)
+                name = os.path.relpath(path, self.static_folder).replace(os.sep, '/')
+                with open(path, 'rb') as f:
+                    data = f.read()
+                hashed = fingerprint(name, data)
+                manifest[name] = hashed
+                written += self._write_variants(hashed, data)
+
+        os.makedirs(self.build_dir, exist_ok=True)
+        self._write(MANIFEST_NAME, json.dumps(manifest, indent=2, sort_keys=True).encode())
+        self.manifest = manifest
+        if written:
+            logger.info(f"Built {written} asset files in {self.build_dir}")
+        return manifest
+
+    def _write_variants(self, hashed, data):
+        variants = [('', data)]
+        for encoding, suffix in ENCODINGS:
+            if encoding == 'br' and brotli is None:
+                continue
+            if not os.path.exists(os.path.join(self.build_dir, hashed + suffix)):
+                compressed = compress(data, encoding)
+                # Tiny files can grow; those are always sent as they are
+                if len(compressed) < len(data):
+                    variants.append((suffix, compressed))
+        written = 0
+        for suffix, content in variants:
+            if not os.path.exists(os.path.join(self.build_dir, hashed + suffix)):
+                self._write(hashed + suffix, content)
+                written += 1
+        return written
+
+    def _write(self, name, content):
+        # Write and rename, so a worker never serves half a file
+        path = os.path.join(self.build_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    def load(self):
+        """Use a manifest written earlier by build() or the command line."""
+        try:
+            with open(os.path.join(self.build_dir, MANIFEST_NAME)) as f:
+                self.manifest = json.load(f)
+        except (FileNotFoundError, ValueError):
+            logger.warning(f"No asset manifest in {self.build_dir}, serving plain static files")
+            self.manifest = {}
+        return self.manifest
+
+    def url_for(self, filename):
+        """URL of the fingerprinted copy, or the plain static URL if there is none."""
+        hashed = self.manifest.get(filename)
+        if hashed is None:
+            return url_for('static', filename=filename)
+        return url_for('assets.asset', filename=hashed)
+
+    def pick(self, filename, accept_encodings):
+        """(file to send, Content-Encoding or None) for a hashed name, or None if unknown."""
+        if filename.endswith(tuple(suffix for _, suffix in ENCODINGS)) or filename == MANIFEST_NAME:
+            return None
+        path = safe_join(self.build_dir, filename)
+        if path is None or not os.path.isfile(path):
+            return None
+        for encoding, suffix in ENCODINGS:
+            if (accept_encodings.quality(encoding) > 0
+                    and os.path.isfile(path + suffix)):
+                return filename + suffix, encoding
+        return filename, None
+
+# Create a singleton instance
+asset_manifest = AssetManifest()
+
+def init_app(app):
+    """Initialize the asset manifest with the Flask app."""
+    asset_manifest.init_app(app)
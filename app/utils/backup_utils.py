@@ -0,0 +1,365 @@
+# app/utils/backup_utils.py
+import os
+import json
+import time
+import shutil
+import hashlib
+import logging
+import threading
+from contextlib import ExitStack, contextmanager
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:
+    # No cross-process lock (Windows); prune then relies on object mtimes
+    fcntl = None
+
+from ..db import online_backup
+
+logger = logging.getLogger('jobmanager')
+
+# Progress is written to the status file at most this often (seconds)
+STATUS_INTERVAL = 0.5
+
+# What a full snapshot covers, relative to the project root
+SNAPSHOT_DIRS = ('app', 'instance')
+SNAPSHOT_FILES = ('run.py', 'wsgi.py', 'gunicorn.conf.py', 'init_db.py', 'db_init.py', 'backup.py',
+                  'build_assets.py', 'gitback.sh', 'requirements.txt', 'LICENSE', 'README.md')
+# Rebuilt on demand, or (the live database) captured with the backup API
+SNAPSHOT_EXCLUDE_DIRS = {'__pycache__', 'thumb_cache', 'asset_build', 'staging'}
+SNAPSHOT_EXCLUDE_SUFFIXES = ('.pyc', '.pyo', '.tmp', '.db', '.db-wal', '.db-shm', '-journal')
+# Runtime state of the running processes, meaningless once restored
+SNAPSHOT_EXCLUDE_FILES = {'scheduler.lock', 'init.lock', 'scheduler_state.json', 'backup_status.json'}
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+class SnapshotStore:
+    """Content-addressed store of full snapshots.
+
+    Each file's content is kept once under objects/<sha256>, and each
+    snapshot is a manifest in snapshots/<name>.json mapping relative paths
+    to hashes. Files whose size and mtime match the previous snapshot are
+    not read again, so a snapshot costs about one stat per file plus the
+    new content.
+
+    create and prune hold an exclusive lock on <root>/.lock, so a prune
+    can't delete the objects of a snapshot whose manifest isn't written yet.
+    The lock is reentrant for one instance, so a caller holding it can
+    still call create.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.objects_dir = os.path.join(root, 'objects')
+        self.snapshots_dir = os.path.join(root, 'snapshots')
+        self.lock_path = os.path.join(root, '.lock')
+        self._held = 0
+
+    def object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest[2:])
+
+    @contextmanager
+    def locked(self, blocking=True):
+        """Hold the store lock; yields False if it is taken and blocking is off."""
+        if fcntl is None or self._held:
+            self._held += 1
+            try:
+                yield True
+            finally:
+                self._held -= 1
+            return
+        os.makedirs(self.root, exist_ok=True)
+        with open(self.lock_path, 'a') as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                yield False
+                return
+            self._held += 1
+            try:
+                yield True
+            finally:
+                self._held -= 1
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def list_snapshots(self):
+        """Snapshot names, oldest first."""
+        try:
+            names = os.listdir(self.snapshots_dir)
+        except FileNotFoundError:
+            return []
+        return sorted(name[:-5] for name in names if name.endswith('.json'))
+
+    def load(self, name):
+        with open(os.path.join(self.snapshots_dir, f'{name}.json')) as f:
+            return json.load(f)
+
+    def _hash(self, path):
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _store(self, path):
+        """Add a file's content if new; returns (hash, bytes written)."""
+        digest = self._hash(path)
+        target = self.object_path(digest)
+        if os.path.exists(target):
+            return digest, 0
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        tmp_path = f'{target}.{os.getpid()}.tmp'
+        shutil.copyfile(path, tmp_path)
+        os.replace(tmp_path, target)
+        return digest, os.path.getsize(target)
+
+    def create(self, name, sources, progress=None):
+        """Snapshot (relative path, absolute path) pairs; returns a summary."""
+        with self.locked():
+            return self._create(name, sources, progress)
+
+    def _create(self, name, sources, progress):
+        snapshots = self.list_snapshots()
+        previous = self.load(snapshots[-1])['files'] if snapshots else {}
+        sources = list(sources)
+        files = {}
+        summary = {'files': len(sources), 'hashed': 0, 'new_objects': 0, 'new_bytes': 0, 'total_bytes': 0}
+
+        for done, (rel_path, path) in enumerate(sources, 1):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entry = previous.get(rel_path)
+            unchanged = (entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns
+                         and os.path.exists(self.object_path(entry['hash'])))
+            if not unchanged:
+                digest, written = self._store(path)
+                summary['hashed'] += 1
+                if written:
+                    summary['new_objects'] += 1
+                    summary['new_bytes'] += written
+                entry = {'hash': digest, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+            files[rel_path] = dict(entry, mode=stat.st_mode & 0o777)
+            summary['total_bytes'] += stat.st_size
+            if progress:
+                progress(done, len(sources))
+
+        manifest = {'name': name, 'created': datetime.now().isoformat(timespec='seconds'),
+                    'summary': summary, 'files': files}
+        os.makedirs(self.snapshots_dir, exist_ok=True)
+        manifest_path = os.path.join(self.snapshots_dir, f'{name}.json')
+        with open(manifest_path + '.tmp', 'w') as f:
+            json.dump(manifest, f)
+        os.replace(manifest_path + '.tmp', manifest_path)
+        return summary
+
+    def restore(self, name, dest):
+        """Write every file of a snapshot below dest."""
+        for rel_path, entry in self.load(name)['files'].items():
+            target = os.path.join(dest, rel_path)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copyfile(self.object_path(entry['hash']), target)
+            os.chmod(target, entry['mode'])
+            os.utime(target, ns=(entry['mtime_ns'], entry['mtime_ns']))
+
+    def prune(self, keep):
+        """Keep the newest snapshots and delete objects nothing refers to."""
+        with self.locked():
+            snapshots = self.list_snapshots()
+            for name in snapshots[:-keep] if keep else snapshots:
+                os.remove(os.path.join(self.snapshots_dir, f'{name}.json'))
+
+            referenced = set()
+            newest = 0
+            for name in self.list_snapshots():
+                referenced.update(entry['hash'] for entry in self.load(name)['files'].values())
+                newest = max(newest, os.path.getmtime(os.path.join(self.snapshots_dir, f'{name}.json')))
+
+            removed = 0
+            for root, _, names in os.walk(self.objects_dir):
+                for object_name in names:
+                    path = os.path.join(root, object_name)
+                    digest = os.path.basename(root) + object_name
+                    # Partial copies, and objects stored after the newest manifest
+                    # by a snapshot still being written where there is no lock
+                    if (digest in referenced or object_name.endswith('.tmp')
+                            or os.path.getmtime(path) > newest):
+                        continue
+                    os.remove(path)
+                    removed += 1
+            return removed
+
+def snapshot_sources(project_root):
+    """(relative path, absolute path) pairs a full snapshot covers."""
+    sources = []
+    for name in SNAPSHOT_FILES:
+        path = os.path.join(project_root, name)
+        if os.path.isfile(path):
+            sources.append((name, path))
+    for dir_name in SNAPSHOT_DIRS:
+        for root, dirs, files in os.walk(os.path.join(project_root, dir_name)):
+            dirs[:] = sorted(d for d in dirs if d not in SNAPSHOT_EXCLUDE_DIRS)
+            for name in sorted(files):
+                if not name.endswith(SNAPSHOT_EXCLUDE_SUFFIXES) and name not in SNAPSHOT_EXCLUDE_FILES:
+                    path = os.path.join(root, name)
+                    sources.append((os.path.relpath(path, project_root), path))
+    return sources
+
+def create_full_snapshot(project_root, database, store, name, progress=None):
+    """Snapshot the project files and an online copy of the database into a SnapshotStore."""
+    os.makedirs(store.root, exist_ok=True)
+    db_copy = os.path.join(store.root, f'{name}.db.tmp')
+    online_backup(database, db_copy)
+    try:
+        sources = snapshot_sources(project_root)
+        db_rel_path = os.path.relpath(database, project_root)
+        if db_rel_path.startswith('..'):
+            db_rel_path = os.path.join('instance', os.path.basename(database))
+        sources.append((db_rel_path, db_copy))
+        summary = store.create(name, sources, progress)
+    finally:
+        os.remove(db_copy)
+    logger.info(f"Snapshot {name}: {summary['files']} files, {summary['hashed']} hashed, "
+                f"{summary['new_objects']} new objects ({summary['new_bytes'] // 1024} KB)")
+    return summary
+
+class BackupManager:
+    """Run backups on a background thread and publish their progress.
+
+    One backup runs at a time: the backup thread holds the snapshot
+    store's lock, so another worker process can't start a second one or
+    prune the store meanwhile. Progress goes to instance/backup_status.json,
+    replaced atomically, so a status request answered by any worker
+    process sees the same state.
+    """
+
+    def __init__(self, app=None):
+        self.project_root = None
+        self.backup_dir = None
+        self.database = None
+        self.status_path = None
+        self.store = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._written = 0
+
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Read the backup settings."""
+        self.project_root = os.path.dirname(app.root_path)
+        app.config.setdefault('BACKUP_DIR', os.path.join(self.project_root, 'backups'))
+        self.backup_dir = app.config['BACKUP_DIR']
+        self.database = app.config['DATABASE']
+        self.status_path = os.path.join(app.instance_path, 'backup_status.json')
+        self.store = SnapshotStore(os.path.join(self.backup_dir, 'store'))
+        app.extensions['backup_manager'] = self
+
+    def start(self, kind):
+        """Start a backup of the given kind; returns (started, status)."""
+        tasks = {'db': (self._backup_db, 'db_backup_{}.db'),
+                 'full': (self._backup_full, 'snapshot_{}')}
+        if kind not in tasks:
+            raise ValueError(f"Unknown backup type: {kind}")
+
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False, self.status()
+            # Held by the backup thread until it finishes; taken elsewhere
+            # means another process is backing up or pruning
+            store_lock = ExitStack()
+            if not store_lock.enter_context(self.store.locked(blocking=False)):
+                store_lock.close()
+                return False, self.status()
+            task, name = tasks[kind]
+            status = {
+                'type': kind,
+                'state': 'running',
+                'name': name.format(datetime.now().strftime('%Y%m%d_%H%M%S')),
+                'progress': 0.0,
+                'started': datetime.now().isoformat(timespec='seconds'),
+                'finished': None,
+                'error': None,
+                'pid': os.getpid()
+            }
+            self._write_status(status, force=True)
+            self._thread = threading.Thread(target=self._run, args=(task, status, store_lock),
+                                            name=f'backup-{kind}', daemon=True)
+            self._thread.start()
+        return True, status
+
+    def _run(self, task, status, store_lock):
+        with store_lock:
+            try:
+                os.makedirs(self.backup_dir, exist_ok=True)
+                task(status)
+                status.update(state='done', progress=1.0)
+                logger.info(f"Backup {status['name']} completed")
+            except Exception as e:
+                logger.error(f"Backup failed: {str(e)}", exc_info=True)
+                status.update(state='failed', error=str(e))
+            status['finished'] = datetime.now().isoformat(timespec='seconds')
+            self._write_status(status, force=True)
+
+    def _backup_db(self, status):
+        def progress(remaining, total):
+            status['progress'] = round(1 - remaining / total, 3) if total else 1.0
+            self._write_status(status)
+
+        online_backup(self.database, os.path.join(self.backup_dir, status['name']), progress=progress)
+
+    def _backup_full(self, status):
+        def progress(done, total):
+            status['progress'] = round(done / total, 3)
+            self._write_status(status)
+
+        status['summary'] = create_full_snapshot(self.project_root, self.database, self.store,
+                                                 status['name'], progress)
+
+    def _write_status(self, status, force=False):
+        now = time.monotonic()
+        if not force and now - self._written < STATUS_INTERVAL:
+            return
+        self._written = now
+        tmp_path = f'{self.status_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(status, f)
+        os.replace(tmp_path, self.status_path)
+
+    def status(self):
+        """Return the latest backup's status, or {'state': 'idle'}."""
+        try:
+            with open(self.status_path) as f:
+                status = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {'state': 'idle'}
+        if status.get('state') == 'running' and not _process_alive(status.get('pid')):
+            status.update(state='failed', error='Interrupted by a restart')
+        return status
+
+    def wait(self, timeout=None):
+        """Block until the running backup, if any, has finished."""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+def _process_alive(pid):
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+# Create a singleton instance
+backup_manager = BackupManager()
+
+def init_app(app):
+    """Initialize the backup manager with the Flask app."""
+    backup_manager.init_app(app)
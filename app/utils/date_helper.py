@@ -1,6 +1,7 @@
 # app/utils/date_helper.py
 from datetime import date, datetime
 import calendar
+from .time_utils import parse_timestamp
 
 def iso_week_number(year, month, day):
     """Calculate the ISO week number for a given date"""
@@ -69,15 +70,7 @@ def add_template_helpers(app):
         if not iso_str:
             return None
         
-        try:
-            if 'Z' in iso_str:
-                return datetime.fromisoformat(iso_str.replace('Z', '+00:00'))
-            elif '+' in iso_str or '-' in iso_str and 'T' in iso_str:
-                return datetime.fromisoformat(iso_str)
-            else:
-                return datetime.fromisoformat(iso_str).replace(tzinfo=timezone.utc)
-        except ValueError:
-            return None
+        return parse_timestamp(iso_str)
 
     
     @app.template_filter('timestamp_to_datetime')
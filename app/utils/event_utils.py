@@ -0,0 +1,157 @@
+# app/utils/event_utils.py
+import json
+import queue
+import sqlite3
+import logging
+import threading
+
+logger = logging.getLogger('jobmanager')
+
+# Events buffered per client before a slow client is dropped (it reconnects)
+SUBSCRIBER_QUEUE_SIZE = 64
+
+class TimerEventBroker:
+    """Fan timer changes out to Server-Sent Event subscribers.
+
+    While anyone is subscribed, one watcher thread per process compares
+    PRAGMA data_version every TIMER_EVENTS_POLL seconds. That value changes
+    whenever another connection (any worker process) commits, so timers
+    started elsewhere are seen too; TimerManager also calls notify() after
+    its own commits for an immediate push. Only when something changed is
+    the open timer re-read (one indexed lookup), and only the differences
+    are published: 'start', 'stop' and 'total' events.
+    """
+
+    def __init__(self, app=None):
+        self.database = None
+        self.poll_interval = 1.0
+        self.state = None
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Read the event settings."""
+        app.config.setdefault('TIMER_EVENTS_POLL', 1.0)
+        app.config.setdefault('TIMER_EVENTS_HEARTBEAT', 15)
+        app.config.setdefault('TIMER_EVENTS_MAX_AGE', 300)
+        self.database = app.config['DATABASE']
+        self.poll_interval = app.config['TIMER_EVENTS_POLL']
+        app.extensions['timer_events'] = self
+
+    def _connect(self):
+        conn = sqlite3.connect(self.database, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def read_state(self, conn):
+        """The running timer, or {'active': None}."""
+        # Only one entry is ever open; no ORDER BY keeps this on idx_time_entry_open
+        row = conn.execute(
+            'SELECT id, job_id, start_time, start_epoch FROM time_entry '
+            'WHERE end_time IS NULL LIMIT 1'
+        ).fetchone()
+        if row is None:
+            return {'active': None}
+        return {'active': {'job_id': row['job_id'], 'entry_id': row['id'],
+                           'start_time': row['start_time'], 'start_epoch': row['start_epoch']}}
+
+    def _job_hours(self, conn, job_id):
+        row = conn.execute('SELECT closed_seconds FROM job_hours_rollup WHERE job_id = ?',
+                           (job_id,)).fetchone()
+        return round((row['closed_seconds'] if row else 0) / 3600.0, 4)
+
+    def diff(self, conn, old, new):
+        """Events that turn state old into state new."""
+        before, after = old['active'], new['active']
+        if before == after:
+            return []
+        events = []
+        if before is not None:
+            events.append(('stop', {'job_id': before['job_id'], 'entry_id': before['entry_id']}))
+            events.append(('total', {'job_id': before['job_id'],
+                                     'total_hours': self._job_hours(conn, before['job_id'])}))
+        if after is not None:
+            events.append(('start', dict(after, status='Active')))
+        return events
+
+    def subscribe(self):
+        """Register a client; its queue starts with a 'state' event."""
+        subscriber = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self._lock:
+            if self._thread is None:
+                # Not watched while nobody listened, so read it afresh
+                conn = self._connect()
+                try:
+                    self.state = self.read_state(conn)
+                finally:
+                    conn.close()
+                self._thread = threading.Thread(target=self._watch, name='timer-events', daemon=True)
+                self._thread.start()
+            subscriber.put(('state', self.state))
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def is_subscribed(self, subscriber):
+        """False once a client has been dropped for falling behind."""
+        with self._lock:
+            return subscriber in self._subscribers
+
+    def notify(self):
+        """Check for changes now, e.g. right after a timer commit."""
+        self._wake.set()
+
+    def publish(self, name, data):
+        """Send an event to every subscriber in this process."""
+        with self._lock:
+            for subscriber in list(self._subscribers):
+                try:
+                    subscriber.put_nowait((name, data))
+                except queue.Full:
+                    self._subscribers.discard(subscriber)
+
+    def _watch(self):
+        conn = self._connect()
+        version = None
+        try:
+            while True:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+                with self._lock:
+                    if not self._subscribers:
+                        self._thread = None
+                        return
+                current = conn.execute('PRAGMA data_version').fetchone()[0]
+                if current == version:
+                    continue
+                version = current
+                state = self.read_state(conn)
+                events = self.diff(conn, self.state, state)
+                self.state = state
+                for name, data in events:
+                    self.publish(name, data)
+        except Exception as e:
+            logger.error(f"Timer event watcher stopped: {str(e)}", exc_info=True)
+            with self._lock:
+                self._thread = None
+        finally:
+            conn.close()
+
+def format_event(name, data):
+    """Encode one Server-Sent Event."""
+    return f'event: {name}\ndata: {json.dumps(data)}\n\n'
+
+# Create a singleton instance
+timer_events = TimerEventBroker()
+
+def init_app(app):
+    """Initialize timer events with the Flask app."""
+    timer_events.init_app(app)
@@ -2,23 +2,92 @@
 from PIL import Image
 from PIL.ExifTags import TAGS
 import os
+import threading
 from datetime import datetime
 import sqlite3
 import mimetypes
 from .time_utils import get_current_time
 
+def _auto_rotate(img):
+    """Rotate an image upright based on its EXIF orientation."""
+    try:
+        for orientation in TAGS.keys():
+            if TAGS[orientation] == 'Orientation':
+                break
+        exif = dict(img._getexif().items())
+        if exif[orientation] == 3:
+            img = img.rotate(180, expand=True)
+        elif exif[orientation] == 6:
+            img = img.rotate(270, expand=True)
+        elif exif[orientation] == 8:
+            img = img.rotate(90, expand=True)
+    except (AttributeError, KeyError, IndexError):
+        pass
+    return img
+
+def _save_atomic(img, path, image_format, quality):
+    """Save through a temporary file so readers never see a partial image.
+
+    The temporary name is unique per process and thread, as two workers
+    may render the same thumbnail at once.
+    """
+    temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        img.save(temp_path, image_format, quality=quality, optimize=True)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def _image_format(filename):
+    ext = filename.rsplit('.', 1)[1].lower() if '.' in filename else 'jpg'
+    return 'JPEG' if ext in ['jpg', 'jpeg'] else ext.upper()
+
+def render_image(source, job_path, filename, max_size):
+    """Write the resized, upright main image for one upload.
+
+    source is a path or file object. Kept at module level so the upload
+    worker pool can run it in another process. Thumbnails are made on
+    request by make_thumbnail.
+    """
+    os.makedirs(job_path, exist_ok=True)
+
+    with Image.open(source) as img:
+        img = _auto_rotate(img)
+
+        # Resize if needed
+        if img.size[0] > max_size[0] or img.size[1] > max_size[1]:
+            img.thumbnail(max_size, Image.LANCZOS)
+
+        _save_atomic(img, os.path.join(job_path, filename), _image_format(filename), 85)
+
+    return filename
+
+def make_thumbnail(source_path, dest_path, size):
+    """Write a thumbnail of a processed image that fits in size x size."""
+    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+    with Image.open(source_path) as img:
+        # draft() lets the JPEG decoder downscale while reading
+        img.draft(img.mode, (size, size))
+        img.thumbnail((size, size), Image.LANCZOS)
+        _save_atomic(img, dest_path, _image_format(source_path), 70)
+    return dest_path
+
 class ImageManager:
     def __init__(self, base_path):
         self.base_path = base_path
-        self.THUMBNAIL_SIZE = (300, 300)
         self.MAX_SIZE = (1024, 1024)
         
     def get_job_identifier(self, db, job_id):
         """Get invoice number or job ID to use in filename"""
-        result = db.execute(
-            'SELECT invoice_number FROM job WHERE id = ?',
-            (job_id,)
-        ).fetchone()
+        try:
+            result = db.execute(
+                'SELECT invoice_number FROM job WHERE id = ?',
+                (job_id,)
+            ).fetchone()
+        except sqlite3.OperationalError:
+            # Databases created from schema.sql have no invoice_number column
+            return f"job{job_id}"
         
         if result and result['invoice_number']:
             # Remove year prefix from invoice number (e.g., '2025-0004' becomes '0004')
@@ -33,9 +102,7 @@ class ImageManager:
         
         # Create job directory if it doesn't exist
         job_path = os.path.join(self.base_path, f'job_{job_id}')
-        thumb_path = os.path.join(job_path, 'thumbnails')
         os.makedirs(job_path, exist_ok=True)
-        os.makedirs(thumb_path, exist_ok=True)
 
         # Generate filename with job identifier and current time
         timestamp = custom_timestamp or datetime.now().strftime('%y%m%d%H%M%S')
@@ -61,38 +128,7 @@ class ImageManager:
             image_file.seek(0)
 
             # Open and process image
-            with Image.open(image_file) as img:
-                # Auto-rotate based on EXIF
-                try:
-                    for orientation in TAGS.keys():
-                        if TAGS[orientation] == 'Orientation':
-                            break
-                    exif = dict(img._getexif().items())
-                    if exif[orientation] == 3:
-                        img = img.rotate(180, expand=True)
-                    elif exif[orientation] == 6:
-                        img = img.rotate(270, expand=True)
-                    elif exif[orientation] == 8:
-                        img = img.rotate(90, expand=True)
-                except (AttributeError, KeyError, IndexError):
-                    pass
-
-                # Resize if needed
-                if img.size[0] > self.MAX_SIZE[0] or img.size[1] > self.MAX_SIZE[1]:
-                    img.thumbnail(self.MAX_SIZE, Image.LANCZOS)
-
-                # Save main image
-                img.save(os.path.join(job_path, filename), 
-                        'JPEG' if ext in ['jpg', 'jpeg'] else ext.upper(), 
-                        quality=85, 
-                        optimize=True)
-
-                # Create thumbnail
-                img.thumbnail(self.THUMBNAIL_SIZE, Image.LANCZOS)
-                img.save(os.path.join(thumb_path, filename),
-                        'JPEG' if ext in ['jpg', 'jpeg'] else ext.upper(),
-                        quality=70,
-                        optimize=True)
+            render_image(image_file, job_path, filename, self.MAX_SIZE)
 
             return filename
 
@@ -1,6 +1,7 @@
 # app/utils/invoice_utils.py
 from datetime import datetime
 import logging
+from ..db import ENTRY_HOURS
 
 class InvoiceManager:
     def __init__(self, db):
@@ -54,12 +55,12 @@ class InvoiceManager:
             WHERE job.id = ?
         ''', (job_id,)).fetchone()
         
-        time_entries = self.db.execute('''
+        time_entries = self.db.execute(f'''
             SELECT *,
-            (julianday(COALESCE(end_time, datetime('now'))) - julianday(start_time)) * 24 as hours
+            {ENTRY_HOURS} as hours
             FROM time_entry
             WHERE job_id = ? AND 
-            (julianday(COALESCE(end_time, datetime('now'))) - julianday(start_time)) * 24 > 0.03
+            {ENTRY_HOURS} > 0.03
             ORDER BY start_time
         ''', (job_id,)).fetchall()
         
@@ -2,6 +2,7 @@
 from flask import Flask, current_app
 from datetime import datetime, timezone, timedelta
 import logging
+from app.utils.time_utils import format_timestamp
 
 logger = logging.getLogger('jobmanager')
 
@@ -15,48 +16,17 @@ def register_jinja_filters(app):
             return ""
             
         try:
-            logger.info(f"format_datetime input: {value}, format: {format}")
-            
-            # Parse timestamp
-            if isinstance(value, str):
-                if 'Z' in value:
-                    dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
-                    logger.info(f"Parsed Z timestamp: {dt}")
-                elif '+' in value or '-' in value and 'T' in value:
-                    dt = datetime.fromisoformat(value)
-                    logger.info(f"Parsed ISO timestamp with TZ: {dt}")
-                else:
-                    dt = datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
-                    logger.info(f"Parsed timestamp without TZ: {dt}")
-            else:
-                dt = datetime.fromtimestamp(value, tz=timezone.utc)
-                logger.info(f"Parsed non-string timestamp: {dt}")
-                
             # Get offset directly from profile_manager to avoid circular import
             from app.utils.profile_utils import profile_manager
             offset_minutes = profile_manager.get_time_offset_minutes()
-            logger.info(f"User time offset: {offset_minutes} minutes")
-            
-            adjusted_dt = dt + timedelta(minutes=offset_minutes)
-            logger.info(f"Adjusted timestamp: {adjusted_dt}")
             
-            result = adjusted_dt.strftime(format)
-            logger.info(f"Final formatted result: {result}")
-            return result
+            # Parsing and formatting are cached per stored value
+            result = format_timestamp(value, format, offset_minutes)
+            return value if result is None else result
             
         except Exception as e:
-            logger.error(f"Error formatting datetime: {str(e)}", exc_info=True)
-            # Fall back to direct formatting without timezone handling
-            try:
-                if isinstance(value, str):
-                    if 'T' in value:
-                        # Remove timezone info for direct formatting
-                        value = value.split('T')[0] + 'T' + value.split('T')[1].split('+')[0].split('Z')[0]
-                    return datetime.fromisoformat(value).strftime(format)
-                else:
-                    return datetime.fromtimestamp(value).strftime(format)
-            except:
-                return value
+            logger.error(f"Error formatting datetime {value!r}: {str(e)}")
+            return value
     
     @app.template_filter('format_time')
     def format_time_filter(value, format='%H:%M'):
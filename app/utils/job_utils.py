@@ -1,32 +1,24 @@
 # app/utils/job_utils.py
 from datetime import datetime
-from ..db import get_job_with_hours, calculate_job_total_hours
+from ..db import get_job_with_hours, calculate_job_total_hours, JOB_HOURS
 
 class JobManager:
     def __init__(self, db):
         self.db = db
 
     def get_all_jobs(self):
-        return self.db.execute('''
-            WITH job_hours AS (
-                SELECT 
-                    job_id,
-                    SUM((julianday(COALESCE(end_time, datetime('now'))) - 
-                         julianday(start_time)) * 24) as hours
-                FROM time_entry
-                GROUP BY job_id
-            )
+        return self.db.execute(f'''
             SELECT 
                 job.*,
                 customer.name as customer_name,
                 te_active.id as active_timer_id,
                 te_active.start_time as timer_start,
-                COALESCE(job_hours.hours, 0) as accumulated_hours
+                {JOB_HOURS} as accumulated_hours
             FROM job 
             JOIN customer ON job.customer_id = customer.id 
             LEFT JOIN time_entry te_active ON job.id = te_active.job_id 
                 AND te_active.end_time IS NULL
-            LEFT JOIN job_hours ON job_hours.job_id = job.id
+            LEFT JOIN job_hours_rollup ON job_hours_rollup.job_id = job.id
             ORDER BY 
                 te_active.id IS NOT NULL DESC,
                 CASE job.status
@@ -0,0 +1,131 @@
+# app/utils/maintenance_utils.py
+import os
+import glob
+import time
+import shutil
+import logging
+
+from ..db import get_pool
+from .backup_utils import backup_manager, SnapshotStore
+from .share_utils import share_links
+from .search_utils import search_index
+from .upload_utils import upload_processor
+from .scheduler_utils import scheduler
+
+logger = logging.getLogger('jobmanager')
+
+DAY = 24 * 3600
+
+def backup_database(app):
+    """Take the daily online database backup."""
+    started, status = backup_manager.start('db')
+    if not started:
+        return 'skipped, another backup is running'
+    backup_manager.wait()
+    status = backup_manager.status()
+    if status['state'] != 'done':
+        raise RuntimeError(status.get('error') or 'backup did not complete')
+    return status['name']
+
+def prune_backups(app):
+    """Keep the newest BACKUP_RETENTION database backups, archives and snapshots."""
+    keep = max(1, app.config['BACKUP_RETENTION'])
+    backup_dir = app.config['BACKUP_DIR']
+    removed = 0
+    # Timestamped names sort oldest first
+    for pattern in ('db_backup_*.db', 'jobmanager_backup_*.zip'):
+        for path in sorted(glob.glob(os.path.join(backup_dir, pattern)))[:-keep]:
+            os.remove(path)
+            removed += 1
+
+    objects = 0
+    store = SnapshotStore(os.path.join(backup_dir, 'store'))
+    if os.path.isdir(store.root):
+        snapshots = len(store.list_snapshots())
+        objects = store.prune(keep)
+        removed += max(0, snapshots - keep)
+    return f'{removed} backups and {objects} snapshot objects removed'
+
+def optimize_database(app):
+    """Refresh statistics for indexes the queries have used and merge the search index."""
+    pool = get_pool(app)
+    conn = pool.acquire()
+    try:
+        conn.execute('PRAGMA optimize')
+        search_index.optimize(conn)
+    finally:
+        pool.release(conn)
+
+def purge_share_links(app):
+    """Delete expired share links."""
+    pool = get_pool(app)
+    conn = pool.acquire()
+    try:
+        return f'{share_links.purge(conn)} expired links removed'
+    finally:
+        pool.release(conn)
+
+def clean_orphan_files(app):
+    """Remove image files with no job_image row and cached variants of missing images.
+
+    Files younger than ORPHAN_GRACE seconds are left alone, since uploads
+    write the file and its row in separate steps.
+    """
+    images_root = os.path.join(app.instance_path, 'images')
+    cutoff = time.time() - app.config['ORPHAN_GRACE']
+
+    pool = get_pool(app)
+    conn = pool.acquire()
+    try:
+        known = {(row['job_id'], row['filename'])
+                 for row in conn.execute('SELECT job_id, filename FROM job_image')}
+    finally:
+        pool.release(conn)
+
+    removed = 0
+    for job_dir in glob.glob(os.path.join(images_root, 'job_*')):
+        try:
+            job_id = int(os.path.basename(job_dir)[4:])
+        except ValueError:
+            continue
+        pending = upload_processor.pending(job_id)
+        # Older releases kept fixed-size thumbnails in a subdirectory
+        for directory in (job_dir, os.path.join(job_dir, 'thumbnails')):
+            for entry in os.scandir(directory) if os.path.isdir(directory) else ():
+                if not entry.is_file() or (job_id, entry.name) in known or entry.name in pending:
+                    continue
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+                    removed += 1
+
+    cache_dir = app.config['THUMBNAIL_CACHE_DIR']
+    variants = 0
+    for source_dir in glob.glob(os.path.join(cache_dir, 'job_*', '*')):
+        job_dir = os.path.basename(os.path.dirname(source_dir))
+        if not os.path.exists(os.path.join(images_root, job_dir, os.path.basename(source_dir))):
+            shutil.rmtree(source_dir, ignore_errors=True)
+            variants += 1
+
+    if removed or variants:
+        logger.info(f"Removed {removed} orphaned files and cached variants of {variants} missing images")
+    return f'{removed} files and {variants} cached images removed'
+
+def init_app(app):
+    """Register the maintenance tasks with the scheduler."""
+    app.config.setdefault('BACKUP_INTERVAL', DAY)
+    app.config.setdefault('BACKUP_RETENTION', 7)
+    app.config.setdefault('OPTIMIZE_INTERVAL', DAY)
+    app.config.setdefault('SHARE_PURGE_INTERVAL', 3600)
+    app.config.setdefault('ORPHAN_CLEANUP_INTERVAL', DAY)
+    app.config.setdefault('ORPHAN_GRACE', DAY)
+
+    scheduler.add_task('backup_database', app.config['BACKUP_INTERVAL'], backup_database,
+                       'Online database backup')
+    scheduler.add_task('prune_backups', app.config['BACKUP_INTERVAL'], prune_backups,
+                       f"Keep the newest {app.config['BACKUP_RETENTION']} backups")
+    scheduler.add_task('optimize_database', app.config['OPTIMIZE_INTERVAL'], optimize_database,
+                       'PRAGMA optimize and search index merge')
+    scheduler.add_task('purge_share_links', app.config['SHARE_PURGE_INTERVAL'], purge_share_links,
+                       'Delete expired share links')
+    scheduler.add_task('clean_orphan_files', app.config['ORPHAN_CLEANUP_INTERVAL'], clean_orphan_files,
+                       'Remove orphaned image files and cached variants')
@@ -0,0 +1,181 @@
+# app/utils/metrics_utils.py
+import time
+import threading
+from flask import g, request, before_render_template, template_rendered
+
+# Latency bucket upper bounds in seconds (Prometheus style, +Inf implied)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Histogram:
+    """Fixed-bucket latency histogram with estimated percentiles."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """Estimate a quantile by interpolating inside its bucket."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for count, upper in zip(self.counts, self.buckets):
+            if seen + count >= rank:
+                return lower + (upper - lower) * ((rank - seen) / count)
+            seen += count
+            lower = upper
+        # Slower than the largest bucket
+        return self.buckets[-1]
+
+class RequestStats:
+    """Totals for one endpoint or blueprint."""
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.response_bytes = 0
+        self.template_seconds = 0.0
+        self.db_seconds = 0.0
+        self.errors = 0
+
+    def add(self, seconds, response_bytes, template_seconds, db_seconds, status):
+        self.latency.observe(seconds)
+        self.response_bytes += response_bytes
+        self.template_seconds += template_seconds
+        self.db_seconds += db_seconds
+        if status >= 500:
+            self.errors += 1
+
+    def as_dict(self):
+        count = self.latency.count
+        return {
+            'requests': count,
+            'errors': self.errors,
+            'mean_ms': self.latency.sum / count * 1000 if count else 0.0,
+            'p50_ms': self.latency.quantile(0.50) * 1000,
+            'p95_ms': self.latency.quantile(0.95) * 1000,
+            'p99_ms': self.latency.quantile(0.99) * 1000,
+            'response_bytes': self.response_bytes,
+            'mean_response_bytes': self.response_bytes / count if count else 0,
+            'template_ms': self.template_seconds * 1000,
+            'db_ms': self.db_seconds * 1000
+        }
+
+class RequestMetrics:
+    """Per-endpoint and per-blueprint request timing collected in-process.
+
+    Each request costs two perf_counter calls, a histogram update and a
+    short lock, so the collector stays on in production. Served at
+    /system/metrics as JSON or Prometheus text.
+    """
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self.reset()
+
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Register the request hooks and template signals."""
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+        before_render_template.connect(self._start_template, app)
+        template_rendered.connect(self._finish_template, app)
+        app.extensions['request_metrics'] = self
+
+    def reset(self):
+        """Forget all collected statistics."""
+        with self._lock:
+            self._endpoints = {}
+            self._blueprints = {}
+
+    def _start_request(self):
+        g.request_started = time.perf_counter()
+        g.template_seconds = 0.0
+
+    def _start_template(self, sender, template, context, **extra):
+        g.template_started = time.perf_counter()
+
+    def _finish_template(self, sender, template, context, **extra):
+        started = g.pop('template_started', None)
+        if started is not None:
+            g.template_seconds = g.get('template_seconds', 0.0) + time.perf_counter() - started
+
+    def _finish_request(self, response):
+        started = g.pop('request_started', None)
+        if started is None:
+            return response
+        seconds = time.perf_counter() - started
+
+        # Statement timings recorded by the query profiler's connection wrapper
+        db_seconds = sum(record['ms'] for record in g.get('sql_statements', ())) / 1000
+        endpoint = request.endpoint or 'unmatched'
+        blueprint = request.blueprint or 'app'
+        sample = (seconds, response.content_length or 0, g.get('template_seconds', 0.0),
+                  db_seconds, response.status_code)
+
+        with self._lock:
+            self._endpoints.setdefault(endpoint, RequestStats()).add(*sample)
+            self._blueprints.setdefault(blueprint, RequestStats()).add(*sample)
+        return response
+
+    def snapshot(self):
+        """Return per-endpoint and per-blueprint statistics as plain dicts."""
+        with self._lock:
+            return {
+                'endpoints': {name: stats.as_dict() for name, stats in self._endpoints.items()},
+                'blueprints': {name: stats.as_dict() for name, stats in self._blueprints.items()}
+            }
+
+    def prometheus(self):
+        """Render the endpoint statistics in Prometheus text format."""
+        lines = [
+            '# HELP jobmanager_request_duration_seconds Request latency by endpoint.',
+            '# TYPE jobmanager_request_duration_seconds histogram'
+        ]
+        counters = {
+            'jobmanager_request_errors_total': ('Requests answered with a 5xx status.', 'errors'),
+            'jobmanager_response_bytes_total': ('Response body bytes sent.', 'response_bytes'),
+            'jobmanager_template_seconds_total': ('Time spent rendering templates.', 'template_seconds'),
+            'jobmanager_db_seconds_total': ('Time spent in SQLite statements.', 'db_seconds'),
+        }
+
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+            for name, stats in endpoints:
+                labels = f'endpoint="{name}"'
+                cumulative = 0
+                for bound, count in zip(stats.latency.buckets, stats.latency.counts):
+                    cumulative += count
+                    lines.append(f'jobmanager_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'jobmanager_request_duration_seconds_bucket{{{labels},le="+Inf"}} {stats.latency.count}')
+                lines.append(f'jobmanager_request_duration_seconds_sum{{{labels}}} {stats.latency.sum}')
+                lines.append(f'jobmanager_request_duration_seconds_count{{{labels}}} {stats.latency.count}')
+
+            for metric, (help_text, attribute) in counters.items():
+                lines.append(f'# HELP {metric} {help_text}')
+                lines.append(f'# TYPE {metric} counter')
+                for name, stats in endpoints:
+                    lines.append(f'{metric}{{endpoint="{name}"}} {getattr(stats, attribute)}')
+
+        return '\n'.join(lines) + '\n'
+
+# Create a singleton instance
+request_metrics = RequestMetrics()
+
+def init_app(app):
+    """Initialize request metrics with the Flask app."""
+    request_metrics.init_app(app)
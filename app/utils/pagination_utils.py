@@ -0,0 +1,41 @@
+# app/utils/pagination_utils.py
+import json
+import base64
+import logging
+from flask import request
+
+logger = logging.getLogger('jobmanager')
+
+def get_page_size(default, maximum):
+    """Read the per_page query parameter, clamped to 1..maximum."""
+    try:
+        per_page = int(request.args.get('per_page', default))
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(per_page, maximum))
+
+def encode_cursor(*values):
+    """Encode the sort key of the last row shown as an opaque URL-safe token."""
+    raw = json.dumps(values, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(token, size):
+    """Decode a cursor token into its sort key values.
+
+    Returns None for a missing or malformed token, which callers treat as
+    the first page.
+    """
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        logger.warning(f"Ignoring invalid page cursor {token!r}: {e}")
+        return None
+    if (not isinstance(values, list) or len(values) != size
+            or not all(value is None or isinstance(value, (str, int, float)) for value in values)):
+        # Only scalars can be bound as SQL parameters
+        logger.warning(f"Ignoring page cursor with unexpected shape: {token!r}")
+        return None
+    return values
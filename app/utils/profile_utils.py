@@ -1,8 +1,10 @@
 # app/utils/profile_utils.py
 import os
+import copy
 import json
 import logging
 from datetime import datetime, timezone
+from flask import g, has_app_context
 
 logger = logging.getLogger('jobmanager')
 
@@ -37,6 +39,7 @@ class ProfileManager:
         self.app = app
         self.profile_path = None
         self._profile_cache = None
+        self._profile_stamp = None
         
         if app:
             self.init_app(app)
@@ -47,49 +50,71 @@ class ProfileManager:
         
         # Set profile path in instance directory
         self.profile_path = os.path.join(app.instance_path, 'user_profile.json')
+        self._profile_cache = None
+        self._profile_stamp = None
         
         # Ensure the profile exists
         if not os.path.exists(self.profile_path):
             self.save_profile(DEFAULT_PROFILE)
             logger.info(f"Created default user profile at {self.profile_path}")
     
+    def _file_stamp(self):
+        """Return (mtime, size) of the profile file, or None if it is missing."""
+        try:
+            stat = os.stat(self.profile_path)
+        except (OSError, TypeError):
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _load_profile(self):
+        """Return the cached profile, re-reading the file only when it changed."""
+        stamp = self._file_stamp()
+        if stamp is None:
+            self.save_profile(copy.deepcopy(DEFAULT_PROFILE))
+            return self._profile_cache
+
+        if self._profile_cache is not None and stamp == self._profile_stamp:
+            return self._profile_cache
+
+        with open(self.profile_path, 'r') as f:
+            profile = json.load(f)
+
+        # Ensure preferences exist
+        if 'preferences' not in profile:
+            profile['preferences'] = {'time_offset_minutes': 0}
+        elif 'time_offset_minutes' not in profile['preferences']:
+            profile['preferences']['time_offset_minutes'] = 0
+
+        self._profile_cache = profile
+        self._profile_stamp = stamp
+        return profile
+
     def get_profile(self):
-        """Get the user profile."""
-        # Always read fresh from disk to avoid caching issues
-        self._profile_cache = None
-            
+        """Get a copy of the user profile."""
         try:
-            if not os.path.exists(self.profile_path):
-                self.save_profile(DEFAULT_PROFILE)
-                return DEFAULT_PROFILE
-            
-            with open(self.profile_path, 'r') as f:
-                profile = json.load(f)
-            
-            # Ensure preferences exist
-            if 'preferences' not in profile:
-                profile['preferences'] = {'time_offset_minutes': 0}
-            elif 'time_offset_minutes' not in profile['preferences']:
-                profile['preferences']['time_offset_minutes'] = 0
-                
-            # Cache profile
-            self._profile_cache = profile
-            return profile
+            return copy.deepcopy(self._load_profile())
         except Exception as e:
             logger.error(f"Error loading user profile: {str(e)}")
             return DEFAULT_PROFILE
     
     def get_time_offset_minutes(self):
-        """Get the user's time offset in minutes."""
+        """Get the user's time offset in minutes.
+
+        Within a request the value is read once and reused, since the
+        date filters ask for it for every timestamp they render.
+        """
+        if has_app_context() and 'time_offset_minutes' in g:
+            return g.time_offset_minutes
+
         try:
-            profile = self.get_profile()
-            offset = profile.get('preferences', {}).get('time_offset_minutes', 0)
-            
-            logger.info(f"Using time offset: {offset} minutes")
-            return offset
+            offset = self._load_profile().get('preferences', {}).get('time_offset_minutes', 0)
         except Exception as e:
             logger.error(f"Error getting time offset: {str(e)}")
             return 0
+
+        if has_app_context():
+            g.time_offset_minutes = offset
+        return offset
             
     def save_profile(self, profile):
         """Save the user profile with last modified timestamp."""
@@ -105,12 +130,18 @@ class ProfileManager:
             if self.profile_path:
                 os.makedirs(os.path.dirname(self.profile_path), exist_ok=True)
                 
-                with open(self.profile_path, 'w') as f:
+                # Write and rename, so other worker processes never read half a file
+                tmp_path = f'{self.profile_path}.{os.getpid()}.tmp'
+                with open(tmp_path, 'w') as f:
                     json.dump(profile, f, indent=2)
+                os.replace(tmp_path, self.profile_path)
                 logger.info(f"User profile saved with time offset: {profile['preferences']['time_offset_minutes']}")
                 
-                # Update cache
-                self._profile_cache = profile
+                # Update cache and drop this request's offset snapshot
+                self._profile_cache = copy.deepcopy(profile)
+                self._profile_stamp = self._file_stamp()
+                if has_app_context():
+                    g.pop('time_offset_minutes', None)
                 
                 return True
             else:
@@ -0,0 +1,211 @@
+# app/utils/query_utils.py
+import os
+import time
+import logging
+import threading
+from logging.handlers import RotatingFileHandler
+from flask import g, request
+
+from ..db import udf_call_count
+
+logger = logging.getLogger('jobmanager')
+
+# Statements kept in the per-statement table; SQL text in this app is static,
+# so this only guards against ad-hoc queries built with string formatting.
+MAX_TRACKED_STATEMENTS = 500
+
+class ProfiledCursor:
+    """Cursor wrapper that adds fetch time and row counts to a statement record."""
+
+    def __init__(self, cursor, record):
+        self._cursor = cursor
+        self._record = record
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def _fetch(self, method, *args):
+        started = time.perf_counter()
+        udf_before = udf_call_count()
+        result = method(*args)
+        self._record['ms'] += (time.perf_counter() - started) * 1000
+        self._record['udf_calls'] += udf_call_count() - udf_before
+        return result
+
+    def fetchone(self):
+        row = self._fetch(self._cursor.fetchone)
+        if row is not None:
+            self._record['rows'] += 1
+        return row
+
+    def fetchmany(self, *args):
+        rows = self._fetch(self._cursor.fetchmany, *args)
+        self._record['rows'] += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._fetch(self._cursor.fetchall)
+        self._record['rows'] += len(rows)
+        return rows
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+class ProfiledConnection:
+    """Connection wrapper that records every statement run during a request."""
+
+    def __init__(self, connection, statements):
+        self.raw_connection = connection
+        self._statements = statements
+
+    def __getattr__(self, name):
+        return getattr(self.raw_connection, name)
+
+    def __enter__(self):
+        self.raw_connection.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        return self.raw_connection.__exit__(*exc_info)
+
+    def _run(self, method, sql, *args):
+        record = {'sql': sql, 'ms': 0.0, 'rows': 0, 'udf_calls': 0}
+        started = time.perf_counter()
+        udf_before = udf_call_count()
+        try:
+            cursor = method(sql, *args)
+        finally:
+            record['ms'] += (time.perf_counter() - started) * 1000
+            record['udf_calls'] += udf_call_count() - udf_before
+            self._statements.append(record)
+        return ProfiledCursor(cursor, record)
+
+    def execute(self, sql, parameters=()):
+        return self._run(self.raw_connection.execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._run(self.raw_connection.executemany, sql, seq_of_parameters)
+
+    def executescript(self, script):
+        return self._run(self.raw_connection.executescript, script)
+
+class QueryProfiler:
+    """Collect per-request SQL statistics and log slow statements.
+
+    Every request connection is wrapped so request metrics can report time
+    spent in the database. Statement-level work is opt-in with the
+    SQL_PROFILING config value: statements slower than SLOW_QUERY_MS are
+    written to SLOW_QUERY_LOG, and totals per endpoint and per statement
+    are served by /system/metrics.
+    """
+
+    def __init__(self, app=None):
+        self.enabled = False
+        self.slow_query_ms = 100
+        self.slow_logger = logging.getLogger('jobmanager.slow_sql')
+        self._lock = threading.Lock()
+        self.reset()
+
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Read settings and register the request hooks."""
+        app.config.setdefault('SQL_PROFILING', os.environ.get('JOBMANAGER_SQL_PROFILING') == '1')
+        app.config.setdefault('SLOW_QUERY_MS', 100)
+        app.config.setdefault('SLOW_QUERY_LOG', os.path.join('logs', 'slow_queries.log'))
+
+        self.enabled = app.config['SQL_PROFILING']
+        self.slow_query_ms = app.config['SLOW_QUERY_MS']
+        app.extensions['query_profiler'] = self
+
+        app.teardown_request(self._finish_request)
+        if self.enabled:
+            self._setup_slow_log(app.config['SLOW_QUERY_LOG'])
+            logger.info(f"SQL profiling enabled, slow query threshold {self.slow_query_ms} ms")
+
+    def _setup_slow_log(self, path):
+        if self.slow_logger.handlers:
+            return
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        handler = RotatingFileHandler(path, maxBytes=5*1024*1024, backupCount=3)
+        handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+        self.slow_logger.addHandler(handler)
+        self.slow_logger.setLevel(logging.INFO)
+        self.slow_logger.propagate = False
+
+    def reset(self):
+        """Forget all collected statistics."""
+        with self._lock:
+            self._endpoints = {}
+            self._statements = {}
+
+    def wrap(self, connection):
+        """Wrap a connection so its statements are recorded for this request."""
+        g.sql_statements = []
+        return ProfiledConnection(connection, g.sql_statements)
+
+    def _finish_request(self, e=None):
+        statements = g.pop('sql_statements', None)
+        if not statements or not self.enabled:
+            return
+
+        endpoint = request.endpoint or 'unknown'
+        for record in statements:
+            record['sql'] = ' '.join(record['sql'].split())
+            if record['ms'] >= self.slow_query_ms:
+                self.slow_logger.info(
+                    f"{record['ms']:.1f} ms rows={record['rows']} udf_calls={record['udf_calls']} "
+                    f"endpoint={endpoint} sql={record['sql']}"
+                )
+
+        with self._lock:
+            totals = self._endpoints.setdefault(endpoint, {
+                'requests': 0, 'queries': 0, 'max_queries': 0,
+                'total_ms': 0.0, 'rows': 0, 'udf_calls': 0
+            })
+            totals['requests'] += 1
+            totals['queries'] += len(statements)
+            totals['max_queries'] = max(totals['max_queries'], len(statements))
+
+            for record in statements:
+                totals['total_ms'] += record['ms']
+                totals['rows'] += record['rows']
+                totals['udf_calls'] += record['udf_calls']
+
+                stats = self._statements.get(record['sql'])
+                if stats is None:
+                    if len(self._statements) >= MAX_TRACKED_STATEMENTS:
+                        continue
+                    stats = self._statements[record['sql']] = {
+                        'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'rows': 0, 'udf_calls': 0
+                    }
+                stats['count'] += 1
+                stats['total_ms'] += record['ms']
+                stats['max_ms'] = max(stats['max_ms'], record['ms'])
+                stats['rows'] += record['rows']
+                stats['udf_calls'] += record['udf_calls']
+
+    def snapshot(self, top=20):
+        """Return per-endpoint totals and the most expensive statements."""
+        with self._lock:
+            endpoints = {name: dict(totals) for name, totals in self._endpoints.items()}
+            statements = sorted(
+                ({'sql': sql, **stats} for sql, stats in self._statements.items()),
+                key=lambda stats: stats['total_ms'],
+                reverse=True
+            )[:top]
+
+        return {
+            'enabled': self.enabled,
+            'slow_query_ms': self.slow_query_ms,
+            'endpoints': endpoints,
+            'statements': statements
+        }
+
+# Create a singleton instance
+query_profiler = QueryProfiler()
+
+def init_app(app):
+    """Initialize the query profiler with the Flask app."""
+    query_profiler.init_app(app)
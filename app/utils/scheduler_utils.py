@@ -0,0 +1,169 @@
+# app/utils/scheduler_utils.py
+import os
+import json
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:
+    # No cross-process lock (Windows); each process then runs its own tasks
+    fcntl = None
+
+logger = logging.getLogger('jobmanager')
+
+# How often each process checks for due tasks (seconds)
+TICK_SECONDS = 60
+
+class Scheduler:
+    """Run periodic maintenance tasks on a background thread.
+
+    Every worker process runs the thread, but due tasks only run in the
+    process holding an exclusive lock on instance/scheduler.lock. Last run
+    times are kept in instance/scheduler_state.json, so each task runs once
+    per interval however many gunicorn workers there are, and a restart
+    does not reset the clock.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.tasks = {}
+        self.lock_path = None
+        self.state_path = None
+        self._thread = None
+        self._stop = threading.Event()
+
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Read settings and start the scheduler thread."""
+        app.config.setdefault('SCHEDULER_ENABLED', True)
+        app.config.setdefault('SCHEDULER_TICK', TICK_SECONDS)
+        self.app = app
+        self.lock_path = os.path.join(app.instance_path, 'scheduler.lock')
+        self.state_path = os.path.join(app.instance_path, 'scheduler_state.json')
+        app.extensions['scheduler'] = self
+
+        if app.config.get('START_BACKGROUND', True):
+            self.start()
+
+    def start(self):
+        """Start the scheduler thread in this process if it isn't running.
+
+        Threads don't survive fork, so gunicorn workers forked from a
+        preloaded app call this again (see gunicorn.conf.py).
+        """
+        if not self.app.config['SCHEDULER_ENABLED']:
+            return
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, args=(self.app.config['SCHEDULER_TICK'],),
+                                        name='scheduler', daemon=True)
+        self._thread.start()
+
+    def add_task(self, name, interval, func, description=''):
+        """Run func(app) every interval seconds; an interval of 0 disables it."""
+        if interval and interval > 0:
+            self.tasks[name] = {'interval': interval, 'func': func, 'description': description}
+        else:
+            self.tasks.pop(name, None)
+
+    @contextmanager
+    def _locked(self):
+        if fcntl is None:
+            yield True
+            return
+        with open(self.lock_path, 'a') as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_state(self):
+        try:
+            with open(self.state_path) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write_state(self, state):
+        tmp_path = f'{self.state_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+
+    def run_pending(self, force=False):
+        """Run due tasks (all of them with force); returns the names run."""
+        ran = []
+        with self._locked() as acquired:
+            if not acquired:
+                return ran
+            # Re-read under the lock: another process may have just run them
+            state = self._read_state()
+            for name, task in self.tasks.items():
+                last_run = state.get(name, {}).get('last_run', 0)
+                if not force and time.time() - last_run < task['interval']:
+                    continue
+
+                started = time.time()
+                entry = {'last_run': started, 'status': 'ok', 'result': None, 'error': None}
+                try:
+                    result = task['func'](self.app)
+                    entry['result'] = None if result is None else str(result)
+                except Exception as e:
+                    logger.error(f"Scheduled task {name} failed: {str(e)}", exc_info=True)
+                    entry.update(status='failed', error=str(e))
+                entry['duration'] = round(time.time() - started, 3)
+                state[name] = entry
+                self._write_state(state)
+                ran.append(name)
+        return ran
+
+    def _run(self, tick):
+        while not self._stop.wait(tick):
+            try:
+                self.run_pending()
+            except Exception as e:
+                logger.error(f"Scheduler tick failed: {str(e)}", exc_info=True)
+
+    def status(self):
+        """Each task with its interval, last run, outcome and next run."""
+        state = self._read_state()
+        tasks = []
+        for name, task in self.tasks.items():
+            entry = state.get(name, {})
+            last_run = entry.get('last_run')
+            # Never-run tasks are due at the next tick
+            next_run = last_run + task['interval'] if last_run else time.time()
+            tasks.append({
+                'name': name,
+                'description': task['description'],
+                'interval': task['interval'],
+                'last_run': datetime.fromtimestamp(last_run).isoformat(timespec='seconds') if last_run else None,
+                'next_run': datetime.fromtimestamp(next_run).isoformat(timespec='seconds'),
+                'status': entry.get('status'),
+                'duration': entry.get('duration'),
+                'result': entry.get('result'),
+                'error': entry.get('error')
+            })
+        return tasks
+
+    def stop(self):
+        """Stop the scheduler thread."""
+        self._stop.set()
+
+# Create a singleton instance
+scheduler = Scheduler()
+
+def init_app(app):
+    """Initialize the scheduler with the Flask app."""
+    scheduler.init_app(app)
@@ -0,0 +1,109 @@
+# app/utils/search_utils.py
+import re
+import html
+import logging
+
+logger = logging.getLogger('jobmanager')
+
+# search_index rowids are source_id * 8 + kind (see schema.sql)
+KINDS = {1: 'job', 2: 'customer', 3: 'note', 4: 'material', 5: 'image'}
+
+# Results per search and the most a caller may ask for
+SEARCH_RESULTS = 20
+SEARCH_MAX_RESULTS = 100
+
+# Title matches (job description, customer name, material, image
+# description) weigh ten times a match in the body
+RANK = 'bm25(10.0, 1.0)'
+
+# Words of context in each snippet
+SNIPPET_TOKENS = 12
+
+# Stand-ins for <mark> so the snippet text can be escaped safely
+MARK_START, MARK_END = '\x02', '\x03'
+
+TERM = re.compile(r'\w+')
+
+def build_match(text, prefix=False):
+    """Turn user input into an FTS5 query, or None if it has no words.
+
+    Each word becomes a quoted term, so operators and quotes in the input
+    are never interpreted, and all terms must match. With prefix the last
+    word also matches longer words, for type-ahead.
+    """
+    terms = [f'"{term}"' for term in TERM.findall(text)]
+    if not terms:
+        return None
+    if prefix:
+        terms[-1] += '*'
+    return ' '.join(terms)
+
+def highlight(snippet):
+    """Escape a snippet and turn the match markers into <mark> tags."""
+    return (html.escape(snippet)
+            .replace(MARK_START, '<mark>')
+            .replace(MARK_END, '</mark>'))
+
+class SearchIndex:
+    """Ranked full-text search over the search_index FTS5 table.
+
+    The table is filled by triggers on the source tables, so searching is
+    a single MATCH ordered by bm25 with LIMIT; only the returned rows are
+    joined to their job and customer for display.
+    """
+
+    def __init__(self, app=None):
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Register the index with the app."""
+        app.config.setdefault('SEARCH_RESULTS', SEARCH_RESULTS)
+        app.extensions['search_index'] = self
+
+    def search(self, db, text, prefix=False, limit=SEARCH_RESULTS):
+        """Best matches first, as dicts with kind, ids, labels and a highlighted snippet."""
+        match = build_match(text, prefix)
+        if match is None:
+            return []
+
+        rows = db.execute('''
+            SELECT hits.rowid % 8 AS kind, hits.rowid / 8 AS ref_id, hits.job_id,
+                   hits.snippet, hits.score,
+                   job.description AS job_description,
+                   customer.id AS customer_id, customer.name AS customer_name
+            FROM (
+                SELECT rowid, job_id, rank AS score,
+                       snippet(search_index, -1, ?, ?, '…', ?) AS snippet
+                FROM search_index
+                WHERE search_index MATCH ? AND rank MATCH ?
+                ORDER BY rank
+                LIMIT ?
+            ) AS hits
+            LEFT JOIN job ON job.id = hits.job_id
+            LEFT JOIN customer ON customer.id = CASE hits.rowid % 8
+                WHEN 2 THEN hits.rowid / 8 ELSE job.customer_id END
+            ORDER BY hits.score
+        ''', (MARK_START, MARK_END, SNIPPET_TOKENS, match, RANK, limit)).fetchall()
+
+        return [{
+            'kind': KINDS[row['kind']],
+            'id': row['ref_id'],
+            'job_id': row['job_id'],
+            'job_description': row['job_description'],
+            'customer_id': row['customer_id'],
+            'customer_name': row['customer_name'],
+            'snippet': highlight(row['snippet']),
+        } for row in rows]
+
+    def optimize(self, db):
+        """Merge the index b-trees into one, which speeds up later queries."""
+        db.execute("INSERT INTO search_index (search_index) VALUES ('optimize')")
+        db.commit()
+
+# Create a singleton instance
+search_index = SearchIndex()
+
+def init_app(app):
+    """Initialize full-text search with the Flask app."""
+    search_index.init_app(app)
@@ -0,0 +1,80 @@
+# app/utils/share_utils.py
+import json
+import time
+import uuid
+import logging
+from datetime import datetime
+
+logger = logging.getLogger('jobmanager')
+
+class ShareLinkStore:
+    """Temporary share links kept in the share_link table.
+
+    Lookups are by primary key, so every worker process sees every link
+    and links survive restarts. Expired rows are deleted by purge(), which
+    the scheduler runs every SHARE_PURGE_INTERVAL seconds using the expiry
+    index.
+    """
+
+    def __init__(self, app=None):
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Register the store with the app."""
+        app.extensions['share_links'] = self
+
+    def create(self, db, job_id, image_ids, expiry_hours):
+        """Store a link to the given job_image ids; returns (token, expires epoch)."""
+        token = str(uuid.uuid4())
+        now = int(time.time())
+        expires = now + int(float(expiry_hours) * 3600)
+        db.execute(
+            'INSERT INTO share_link (token, job_id, image_ids, created_epoch, expires_epoch) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (token, job_id, json.dumps(image_ids), now, expires)
+        )
+        db.commit()
+        return token, expires
+
+    def get(self, db, token):
+        """Return a link's share data, None if unknown, or {'expired': True}."""
+        link = db.execute('SELECT * FROM share_link WHERE token = ?', (token,)).fetchone()
+        if link is None:
+            return None
+        if link['expires_epoch'] <= time.time():
+            return {'expired': True}
+
+        job = db.execute(
+            'SELECT job.description, customer.name AS customer_name FROM job '
+            'LEFT JOIN customer ON customer.id = job.customer_id WHERE job.id = ?',
+            (link['job_id'],)
+        ).fetchone()
+        # Images deleted since the link was made simply drop out
+        images = db.execute(
+            'SELECT id, filename FROM job_image '
+            'WHERE job_id = ? AND id IN (SELECT value FROM json_each(?)) ORDER BY id',
+            (link['job_id'], link['image_ids'])
+        ).fetchall()
+
+        return {
+            'expired': False,
+            'job_id': link['job_id'],
+            'images': [{'id': img['id'], 'filename': img['filename']} for img in images],
+            'expires': datetime.fromtimestamp(link['expires_epoch']).isoformat(),
+            'customer_name': job['customer_name'] if job else None,
+            'job_description': job['description'] if job else None
+        }
+
+    def purge(self, db):
+        """Delete expired links; returns how many were removed."""
+        cursor = db.execute('DELETE FROM share_link WHERE expires_epoch <= ?', (int(time.time()),))
+        db.commit()
+        return cursor.rowcount
+
+# Create a singleton instance
+share_links = ShareLinkStore()
+
+def init_app(app):
+    """Initialize share link storage with the Flask app."""
+    share_links.init_app(app)
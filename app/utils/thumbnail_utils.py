@@ -0,0 +1,172 @@
+# app/utils/thumbnail_utils.py
+import os
+import time
+import shutil
+import logging
+import threading
+
+from .image_utils import make_thumbnail
+
+logger = logging.getLogger('jobmanager')
+
+# Cache hits refresh an entry's mtime (its LRU position) at most this often
+TOUCH_INTERVAL = 3600
+
+class ThumbnailCache:
+    """Image variants generated on first request into a bounded disk cache.
+
+    Variants live at THUMBNAIL_CACHE_DIR/job_<id>/<filename>/<size>-<mtime>.<ext>,
+    so a replaced source gets fresh variants and deleting an image can drop
+    its whole directory. File mtimes record last use; once the cache grows
+    past THUMBNAIL_CACHE_BYTES the least recently used files are evicted.
+    Concurrent requests for the same missing variant wait for one render.
+    """
+
+    def __init__(self, app=None):
+        self.cache_dir = None
+        self.max_bytes = 0
+        self.sizes = ()
+        self._lock = threading.Lock()
+        self._evict_lock = threading.Lock()
+        self._inflight = {}
+        self._total_bytes = None
+
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Read the cache settings."""
+        app.config.setdefault('THUMBNAIL_SIZES', (150, 300, 600))
+        app.config.setdefault('THUMBNAIL_CACHE_DIR', os.path.join(app.instance_path, 'thumb_cache'))
+        app.config.setdefault('THUMBNAIL_CACHE_BYTES', 200 * 1024 * 1024)
+
+        self.sizes = tuple(sorted(app.config['THUMBNAIL_SIZES']))
+        self.cache_dir = app.config['THUMBNAIL_CACHE_DIR']
+        self.max_bytes = app.config['THUMBNAIL_CACHE_BYTES']
+        self._total_bytes = None
+        app.extensions['thumbnail_cache'] = self
+
+    def pick_size(self, requested):
+        """Snap a requested size to the smallest configured size that covers it."""
+        for size in self.sizes:
+            if size >= requested:
+                return size
+        return self.sizes[-1]
+
+    def _source_dir(self, job_id, filename):
+        return os.path.join(self.cache_dir, f'job_{job_id}', filename)
+
+    def variant_path(self, job_id, filename, source_path, size):
+        mtime_ns = os.stat(source_path).st_mtime_ns
+        ext = filename.rsplit('.', 1)[1].lower() if '.' in filename else 'jpg'
+        return os.path.join(self._source_dir(job_id, filename), f'{size}-{mtime_ns}.{ext}')
+
+    def get(self, job_id, filename, source_path, size):
+        """Return the path of a variant, generating it on first request."""
+        path = self.variant_path(job_id, filename, source_path, size)
+        try:
+            stat = os.stat(path)
+            if time.time() - stat.st_mtime > TOUCH_INTERVAL:
+                os.utime(path)
+            return path
+        except FileNotFoundError:
+            pass
+
+        # Single flight: the first request renders, the rest wait for it
+        with self._lock:
+            done = self._inflight.get(path)
+            leader = done is None
+            if leader:
+                done = self._inflight[path] = threading.Event()
+
+        if not leader:
+            done.wait(timeout=30)
+            if not os.path.exists(path):
+                # The render failed; not a FileNotFoundError, the source exists
+                raise OSError(f"Thumbnail generation failed for {filename}")
+            return path
+
+        try:
+            make_thumbnail(source_path, path, size)
+            self._account(path)
+        finally:
+            with self._lock:
+                self._inflight.pop(path, None)
+            done.set()
+        return path
+
+    def discard(self, job_id, filename):
+        """Remove every cached variant of an image."""
+        shutil.rmtree(self._source_dir(job_id, filename), ignore_errors=True)
+
+    def _entries(self):
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                # Renders still being written by another thread or process
+                if name.endswith('.tmp'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _account(self, added_path):
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _, size, _ in self._entries())
+            else:
+                self._total_bytes += os.path.getsize(added_path)
+            over_budget = self._total_bytes > self.max_bytes
+        if over_budget:
+            self.evict(keep=added_path)
+
+    def evict(self, keep=None):
+        """Delete least recently used variants until the cache is 90% of budget.
+
+        keep is a variant about to be served, which is never removed.
+        """
+        if not self._evict_lock.acquire(blocking=False):
+            return
+        try:
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            target = self.max_bytes * 0.9
+            removed = 0
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                if path == keep:
+                    continue
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                removed += 1
+            with self._lock:
+                self._total_bytes = total
+            if removed:
+                logger.info(f"Evicted {removed} thumbnails, cache now {total // 1024} KB")
+        finally:
+            self._evict_lock.release()
+
+    def stats(self):
+        """Return cache size and budget."""
+        entries = self._entries()
+        return {
+            'files': len(entries),
+            'bytes': sum(size for _, size, _ in entries),
+            'max_bytes': self.max_bytes,
+            'sizes': list(self.sizes)
+        }
+
+# Create a singleton instance
+thumbnail_cache = ThumbnailCache()
+
+def init_app(app):
+    """Initialize the thumbnail cache with the Flask app."""
+    thumbnail_cache.init_app(app)
@@ -1,9 +1,79 @@
 # app/utils/time_utils.py
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
+from functools import lru_cache
 import logging
 
 logger = logging.getLogger('jobmanager')
 
+# Distinct (timestamp, format, offset) combinations kept by the format cache
+TIMESTAMP_CACHE_SIZE = 8192
+
+# Bound once: parse_timestamp runs for every timestamp in reports and exports
+_fromisoformat = datetime.fromisoformat
+
+def parse_timestamp(value):
+    """Parse a stored ISO timestamp into a timezone-aware datetime.
+
+    Stored values end in 'Z', carry a +HH:MM offset or are naive UTC. Not
+    cached: reports and exports parse mostly distinct values, where a cache
+    miss would cost more than the parse. Returns None for strings that are
+    not timestamps.
+    """
+    try:
+        sign = value[-6]
+        if sign == '+' or value[-1] == 'Z':
+            return _fromisoformat(value)
+        if sign != '-':
+            # Naive UTC: appending the offset is several times cheaper than
+            # replace(tzinfo=...) on the parsed result
+            return _fromisoformat(value + '+00:00')
+        # Negative offsets and plain dates
+        dt = _fromisoformat(value)
+    except (ValueError, IndexError):
+        # Pythons before 3.11 reject the 'Z' suffix
+        if value[-1:] != 'Z':
+            return None
+        try:
+            return _fromisoformat(value[:-1] + '+00:00')
+        except ValueError:
+            return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+def to_datetime(value):
+    """Convert a stored timestamp, Unix time or datetime to an aware datetime."""
+    if value is None or value == '':
+        return None
+    if isinstance(value, str):
+        return parse_timestamp(value)
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    return datetime.fromtimestamp(value, tz=timezone.utc)
+
+@lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)
+def _format_stored(value, format_str, offset_minutes):
+    dt = parse_timestamp(value)
+    if dt is None:
+        return None
+    if offset_minutes:
+        dt += timedelta(minutes=offset_minutes)
+    return dt.strftime(format_str)
+
+def format_timestamp(value, format_str='%Y-%m-%d %H:%M:%S', offset_minutes=0):
+    """Format a timestamp with an offset applied, or None if it can't be parsed.
+
+    Stored strings are cached by (value, format, offset) because list pages
+    render the same rows again on every reload.
+    """
+    if isinstance(value, str):
+        return _format_stored(value, format_str, offset_minutes)
+
+    dt = to_datetime(value)
+    if dt is None:
+        return None
+    if offset_minutes:
+        dt += timedelta(minutes=offset_minutes)
+    return dt.strftime(format_str)
+
 def get_current_time():
     """Get current time as ISO format string with UTC timezone."""
     # Always include timezone information for consistent calculations
@@ -15,22 +85,10 @@ def format_time(timestamp, format_str='%Y-%m-%d %H:%M:%S'):
         return ""
     
     try:
-        # Parse timestamp with appropriate timezone handling
-        if isinstance(timestamp, str):
-            if 'Z' in timestamp:
-                # Handle UTC marker
-                dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-            elif '+' in timestamp or '-' in timestamp and 'T' in timestamp:
-                # Handle ISO format with timezone
-                dt = datetime.fromisoformat(timestamp)
-            else:
-                # Handle without timezone (assume UTC)
-                dt = datetime.fromisoformat(timestamp).replace(tzinfo=timezone.utc)
-        else:
-            # If timestamp is a number (Unix timestamp), convert it
-            dt = datetime.fromtimestamp(timestamp, tz=timezone.utc)
-        
-        return dt.strftime(format_str)
+        formatted = format_timestamp(timestamp, format_str)
+        if formatted is None:
+            raise ValueError(f"Invalid isoformat string: {timestamp!r}")
+        return formatted
     except (ValueError, TypeError) as e:
         logger.error(f"Error formatting time: {e}")
         return "Invalid time"
@@ -66,36 +124,11 @@ def get_time_difference_seconds(start_time_str, end_time_str=None):
         return 0
     
     try:
-        # Parse start time with timezone handling
-        if isinstance(start_time_str, str):
-            if 'Z' in start_time_str:
-                start_time = datetime.fromisoformat(start_time_str.replace('Z', '+00:00'))
-            elif '+' in start_time_str or '-' in start_time_str and 'T' in start_time_str:
-                start_time = datetime.fromisoformat(start_time_str)
-            else:
-                start_time = datetime.fromisoformat(start_time_str).replace(tzinfo=timezone.utc)
-        else:
-            # Handle non-string input (like datetime objects)
-            start_time = start_time_str
-            if not start_time.tzinfo:
-                start_time = start_time.replace(tzinfo=timezone.utc)
-        
+        start_time = to_datetime(start_time_str)
         # Get end time or use current UTC time
-        if end_time_str:
-            if isinstance(end_time_str, str):
-                if 'Z' in end_time_str:
-                    end_time = datetime.fromisoformat(end_time_str.replace('Z', '+00:00'))
-                elif '+' in end_time_str or '-' in end_time_str and 'T' in end_time_str:
-                    end_time = datetime.fromisoformat(end_time_str)
-                else:
-                    end_time = datetime.fromisoformat(end_time_str).replace(tzinfo=timezone.utc)
-            else:
-                # Handle non-string input
-                end_time = end_time_str
-                if not end_time.tzinfo:
-                    end_time = end_time.replace(tzinfo=timezone.utc)
-        else:
-            end_time = datetime.now(timezone.utc)
+        end_time = to_datetime(end_time_str) if end_time_str else datetime.now(timezone.utc)
+        if start_time is None or end_time is None:
+            raise ValueError(f"Invalid time range: {start_time_str!r} - {end_time_str!r}")
         
         # Return the raw time difference including negative values
         diff_seconds = (end_time - start_time).total_seconds()
@@ -110,32 +143,22 @@ def iso_to_datetime(iso_str):
     if not iso_str:
         return None
         
-    try:
-        if 'Z' in iso_str:
-            return datetime.fromisoformat(iso_str.replace('Z', '+00:00'))
-        elif '+' in iso_str or '-' in iso_str and 'T' in iso_str:
-            return datetime.fromisoformat(iso_str)
-        else:
-            return datetime.fromisoformat(iso_str).replace(tzinfo=timezone.utc)
-    except ValueError as e:
-        logger.error(f"Error parsing ISO datetime: {e}")
-        return None
+    dt = parse_timestamp(iso_str)
+    if dt is None:
+        logger.error(f"Error parsing ISO datetime: {iso_str!r}")
+    return dt
 
 def format_display_time(timestamp, format_str='%Y-%m-%d %H:%M:%S'):
     """Format time with user's timezone offset applied."""
-    dt = iso_to_datetime(timestamp) if isinstance(timestamp, str) else timestamp
-    if not dt:
+    if not timestamp:
         return ""
         
     try:
         from .profile_utils import profile_manager
-        # Apply user's time offset if needed
+        # Apply user's time offset
         offset_minutes = profile_manager.get_time_offset_minutes()
-        if offset_minutes and dt.tzinfo:  # Only apply if timestamp has timezone info
-            from datetime import timedelta
-            dt = dt + timedelta(minutes=offset_minutes)
-            
-        return dt.strftime(format_str)
+        formatted = format_timestamp(timestamp, format_str, offset_minutes)
+        return "" if formatted is None else formatted
     except Exception as e:
         logger.error(f"Error formatting display time: {e}")
-        return "Invalid time"
\ No newline at end of file
+        return "Invalid time"
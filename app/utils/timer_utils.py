@@ -2,6 +2,8 @@
 from datetime import datetime, timezone
 from .error_utils import TimerError, handle_errors
 from .time_utils import get_current_time
+from .event_utils import timer_events
+from ..db import ENTRY_HOURS
 import logging
 
 class TimerManager:
@@ -45,6 +47,7 @@ class TimerManager:
             )
         
         self.db.commit()
+        timer_events.notify()
 
     @handle_errors
     def stop(self, job_id):
@@ -68,6 +71,7 @@ class TimerManager:
                 (now_iso, active_timer['id'])
             )
             self.db.commit()
+            timer_events.notify()
 
     def get_active_timer(self):
         """Get currently active timer if any exists."""
@@ -78,6 +82,25 @@ class TimerManager:
             WHERE time_entry.end_time IS NULL
         ''').fetchone()
 
+    def get_state(self):
+        """The running timer with its job's closed seconds, or {'active': None}.
+
+        Reads the open entry through idx_time_entry_open and the total from
+        job_hours_rollup, so no per-entry hours are computed. Nothing in the
+        result depends on the current time; clients add now - start_epoch.
+        """
+        row = self.db.execute('''
+            SELECT time_entry.id AS entry_id, time_entry.job_id, time_entry.start_time,
+                   time_entry.start_epoch, job.status,
+                   COALESCE(job_hours_rollup.closed_seconds, 0) AS closed_seconds
+            FROM time_entry
+            JOIN job ON job.id = time_entry.job_id
+            LEFT JOIN job_hours_rollup ON job_hours_rollup.job_id = time_entry.job_id
+            WHERE time_entry.end_time IS NULL
+            LIMIT 1
+        ''').fetchone()
+        return {'active': dict(row) if row else None}
+
     @handle_errors
     def stop_all_active(self):
         """Stop all active timers in the system."""
@@ -95,12 +118,12 @@ class TimerManager:
     @handle_errors
     def calculate_total_hours(self, job_id):
         """Calculate the total hours for a job."""
-        result = self.db.execute('''
+        result = self.db.execute(f'''
             SELECT 
-                SUM(time_diff_hours(start_time, COALESCE(end_time, current_iso_time()))) as total_hours
+                SUM({ENTRY_HOURS}) as total_hours
             FROM time_entry
             WHERE job_id = ? AND 
-                  time_diff_hours(start_time, COALESCE(end_time, current_iso_time())) > 0.03
+                  {ENTRY_HOURS} > 0.03
         ''', (job_id,)).fetchone()
         
         total_hours = result['total_hours'] if result['total_hours'] else 0
@@ -0,0 +1,167 @@
+# app/utils/upload_utils.py
+import os
+import logging
+import threading
+import multiprocessing
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+
+from .image_utils import ImageManager, render_image
+
+logger = logging.getLogger('jobmanager')
+
+# Suffix given to a staged upload that could not be processed
+FAILED_SUFFIX = '.failed'
+
+# The pool is started from a threaded server worker; a forked child could
+# inherit a lock (logging, SQLite, PIL) held by another thread and hang
+POOL_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+class UploadProcessor:
+    """Resize uploaded photos in a process pool so uploads return at once.
+
+    Uploads are written to instance/staging/job_<id>/ and acknowledged;
+    a pool of IMAGE_WORKERS processes writes the resized main image and
+    removes the staged copy. Status is read from the filesystem, so
+    any worker process can answer it. IMAGE_WORKERS = 0 processes inline.
+    """
+
+    def __init__(self, app=None):
+        self.workers = 0
+        self.images_root = None
+        self.staging_root = None
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Read settings and pick up uploads left staged by a restart."""
+        app.config.setdefault('IMAGE_WORKERS', min(4, os.cpu_count() or 1))
+        self.workers = app.config['IMAGE_WORKERS']
+        self.images_root = os.path.join(app.instance_path, 'images')
+        self.staging_root = os.path.join(app.instance_path, 'staging')
+        app.extensions['upload_processor'] = self
+        # Under gunicorn the first worker resumes instead of the preloading master
+        if app.config.get('START_BACKGROUND', True):
+            self.resume()
+
+    def _get_executor(self):
+        with self._lock:
+            # A forked process can't use its parent's pool
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context(POOL_START_METHOD))
+                self._pid = os.getpid()
+            return self._executor
+
+    def staged_path(self, job_id, filename):
+        return os.path.join(self.staging_root, f'job_{job_id}', filename)
+
+    def stage(self, job_id, file, filename):
+        """Write an uploaded file to the staging area."""
+        path = self.staged_path(job_id, filename)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        file.save(path)
+        return path
+
+    def submit(self, job_id, filename):
+        """Queue a staged upload for processing."""
+        image_mgr = ImageManager(self.images_root)
+        args = (self.staged_path(job_id, filename), os.path.join(self.images_root, f'job_{job_id}'),
+                filename, image_mgr.MAX_SIZE)
+
+        if self.workers <= 0:
+            try:
+                render_image(*args)
+            except Exception as e:
+                self._mark_failed(job_id, filename, e)
+            else:
+                self._remove_staged(job_id, filename)
+            return
+
+        future = self._get_executor().submit(render_image, *args)
+        future.add_done_callback(partial(self._finished, job_id, filename))
+
+    def _finished(self, job_id, filename, future):
+        error = future.exception()
+        if error:
+            self._mark_failed(job_id, filename, error)
+        else:
+            self._remove_staged(job_id, filename)
+            logger.info(f"Processed upload {filename} for job {job_id}")
+
+    def _remove_staged(self, job_id, filename):
+        try:
+            os.remove(self.staged_path(job_id, filename))
+        except FileNotFoundError:
+            # Already handled by another worker process
+            pass
+
+    def _mark_failed(self, job_id, filename, error):
+        logger.error(f"Processing upload {filename} for job {job_id} failed: {error}")
+        path = self.staged_path(job_id, filename)
+        try:
+            os.replace(path, path + FAILED_SUFFIX)
+        except FileNotFoundError:
+            pass
+
+    def status(self, job_id, filename):
+        """Return 'processing', 'failed', 'ready' or 'missing' for an upload."""
+        path = self.staged_path(job_id, filename)
+        if os.path.exists(path):
+            return 'processing'
+        if os.path.exists(path + FAILED_SUFFIX):
+            return 'failed'
+        image_mgr = ImageManager(self.images_root)
+        if os.path.exists(image_mgr.get_image_path(job_id, filename)):
+            return 'ready'
+        return 'missing'
+
+    def pending(self, job_id):
+        """Filenames for a job that are still waiting to be processed."""
+        try:
+            names = os.listdir(os.path.join(self.staging_root, f'job_{job_id}'))
+        except FileNotFoundError:
+            return set()
+        return {name for name in names if not name.endswith(FAILED_SUFFIX)}
+
+    def discard(self, job_id, filename):
+        """Drop a staged or failed upload, e.g. when its record is deleted."""
+        path = self.staged_path(job_id, filename)
+        for candidate in (path, path + FAILED_SUFFIX):
+            try:
+                os.remove(candidate)
+            except FileNotFoundError:
+                pass
+
+    def resume(self):
+        """Queue uploads that were staged but not processed before a restart."""
+        if not self.staging_root or not os.path.isdir(self.staging_root):
+            return
+        for job_dir in os.listdir(self.staging_root):
+            if not job_dir.startswith('job_'):
+                continue
+            try:
+                job_id = int(job_dir[4:])
+            except ValueError:
+                continue
+            for filename in self.pending(job_id):
+                logger.info(f"Resuming staged upload {filename} for job {job_id}")
+                self.submit(job_id, filename)
+
+    def shutdown(self):
+        """Stop the worker pool, waiting for queued images."""
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown(wait=True)
+            self._executor = None
+
+# Create a singleton instance
+upload_processor = UploadProcessor()
+
+def init_app(app):
+    """Initialize the upload processor with the Flask app."""
+    upload_processor.init_app(app)
@@ -0,0 +1,145 @@
+# app/utils/zip_utils.py
+import os
+import time
+import zlib
+import struct
+import hashlib
+
+# Bytes read from a member file at a time
+CHUNK_SIZE = 64 * 1024
+
+# Offsets and sizes are 32-bit without zip64 extensions
+ZIP_LIMIT = 0xFFFFFFFF
+
+_LOCAL_HEADER = struct.Struct('<IHHHHHIIIHH')
+_DATA_DESCRIPTOR = struct.Struct('<IIII')
+_CENTRAL_HEADER = struct.Struct('<IHHHHHHIIIHHHHHII')
+_END_RECORD = struct.Struct('<IHHHHIIH')
+
+# General purpose flags: sizes and CRC follow the data, names are UTF-8
+_FLAGS = 0x0008 | 0x0800
+_VERSION = 20
+
+def _dos_time(mtime):
+    t = time.localtime(mtime)
+    if t.tm_year < 1980:
+        return 0, (1 << 5) | 1
+    return ((t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2),
+            ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday)
+
+class _Member:
+    def __init__(self, arcname, path, offset):
+        stat = os.stat(path)
+        self.name = arcname.encode('utf-8')
+        self.path = path
+        self.size = stat.st_size
+        self.mtime_ns = stat.st_mtime_ns
+        self.dos_time, self.dos_date = _dos_time(stat.st_mtime)
+        self.offset = offset
+        self.crc = None
+
+    @property
+    def header_length(self):
+        return _LOCAL_HEADER.size + len(self.name)
+
+    @property
+    def length(self):
+        return self.header_length + self.size + _DATA_DESCRIPTOR.size
+
+    def local_header(self):
+        return _LOCAL_HEADER.pack(0x04034b50, _VERSION, _FLAGS, 0, self.dos_time, self.dos_date,
+                                  0, 0, 0, len(self.name), 0) + self.name
+
+    def data_descriptor(self):
+        return _DATA_DESCRIPTOR.pack(0x08074b50, self.get_crc(), self.size, self.size)
+
+    def central_header(self):
+        return _CENTRAL_HEADER.pack(0x02014b50, _VERSION, _VERSION, _FLAGS, 0, self.dos_time,
+                                    self.dos_date, self.get_crc(), self.size, self.size,
+                                    len(self.name), 0, 0, 0, 0, 0, self.offset) + self.name
+
+    def get_crc(self):
+        # Only computed here when the data itself was skipped by a range
+        if self.crc is None:
+            crc = 0
+            with open(self.path, 'rb') as f:
+                for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                    crc = zlib.crc32(chunk, crc)
+            self.crc = crc
+        return self.crc
+
+    def iter_data(self, start, stop):
+        """Yield file bytes [start, stop), computing the CRC when read in full."""
+        crc = 0 if start == 0 else None
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            remaining = stop - start
+            while remaining > 0:
+                chunk = f.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    raise IOError(f"{self.path} shrank while being archived")
+                if crc is not None:
+                    crc = zlib.crc32(chunk, crc)
+                remaining -= len(chunk)
+                yield chunk
+        if crc is not None and stop == self.size:
+            self.crc = crc
+
+class StreamingZip:
+    """An uncompressed ZIP archive generated from files on disk as it is sent.
+
+    Members are stored rather than deflated; the shareable formats (JPEG,
+    PNG, GIF, PDF) are already compressed. That fixes the archive layout
+    from file sizes alone, so the total length is known before anything is
+    read and any byte range can be produced by seeking, which lets clients
+    resume interrupted downloads. Memory use is one read chunk.
+    """
+
+    def __init__(self, files):
+        """files is an iterable of (archive name, path) pairs."""
+        self.members = []
+        offset = 0
+        for arcname, path in files:
+            member = _Member(arcname, path, offset)
+            self.members.append(member)
+            offset += member.length
+        self.central_offset = offset
+        self.central_length = sum(_CENTRAL_HEADER.size + len(m.name) for m in self.members)
+        self.size = offset + self.central_length + _END_RECORD.size
+        if self.size > ZIP_LIMIT or len(self.members) > 0xFFFF:
+            raise ValueError("Archive too large for a ZIP without zip64 extensions")
+
+    @property
+    def etag(self):
+        """A validator that changes whenever any member does."""
+        digest = hashlib.sha1()
+        for member in self.members:
+            digest.update(b'%s\0%d\0%d\0' % (member.name, member.size, member.mtime_ns))
+        return digest.hexdigest()
+
+    @property
+    def last_modified(self):
+        return max((m.mtime_ns for m in self.members), default=0) / 1e9
+
+    def _segments(self):
+        """(length, producer) pairs in archive order; producer(start, stop) yields bytes."""
+        for member in self.members:
+            yield member.header_length, lambda a, b, m=member: [m.local_header()[a:b]]
+            yield member.size, member.iter_data
+            yield _DATA_DESCRIPTOR.size, lambda a, b, m=member: [m.data_descriptor()[a:b]]
+        yield self.central_length, lambda a, b: [b''.join(m.central_header() for m in self.members)[a:b]]
+        end_record = _END_RECORD.pack(0x06054b50, 0, 0, len(self.members), len(self.members),
+                                      self.central_length, self.central_offset, 0)
+        yield _END_RECORD.size, lambda a, b: [end_record[a:b]]
+
+    def iter_bytes(self, start=0, stop=None):
+        """Yield the archive bytes [start, stop)."""
+        stop = self.size if stop is None else stop
+        position = 0
+        for length, produce in self._segments():
+            segment_end = position + length
+            if segment_end > start and position < stop:
+                yield from produce(max(start - position, 0), min(stop, segment_end) - position)
+            position = segment_end
+            if position >= stop:
+                break
@@ -1,64 +1,44 @@
 # app_backup.py
 import os
-import zipfile
-from datetime import datetime
-import shutil
+import sys
+import argparse
 import logging
+from datetime import datetime
+
+from app.utils.backup_utils import SnapshotStore, create_full_snapshot
+
+ROOT_PATH = os.path.dirname(os.path.abspath(__file__))
+STORE_PATH = os.path.join(ROOT_PATH, 'backups', 'store')
+DATABASE_PATH = os.path.join(ROOT_PATH, 'instance', 'jobmanager.db')
 
 def create_backup():
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M')
-    backup_name = f'jobmanager_backup_{timestamp}.zip'
-    
-    include_dirs = ['app', 'instance']
-    include_files = ['run.py', 'init_db.py', 'gitback.sh', 'LICENSE']
-    
-    # Explicitly what to exclude
-    EXCLUDE_PREFIXES = ['instance/images/', 'instance/backups/']
-    
+    name = f"snapshot_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
     try:
-        with zipfile.ZipFile(backup_name, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            # Add individual files
-            for file in include_files:
-                if os.path.exists(file):
-                    zipf.write(file)
-                    logging.info(f"Adding file: {file}")
-                    
-            # Add directories
-            for dir_name in include_dirs:
-                if os.path.exists(dir_name):
-                    for root, dirs, files in os.walk(dir_name):
-                        # Convert Windows paths if needed
-                        root_path = root.replace('\\', '/')
-                        
-                        # Debug print
-                        logging.info(f"Checking path: {root_path}")
-                        
-                        # Check if this directory should be excluded
-                        if any(root_path.startswith(prefix) for prefix in EXCLUDE_PREFIXES):
-                            logging.info(f"Excluding directory: {root_path}")
-                            dirs[:] = []
-                            continue
-                            
-                        for file in files:
-                            if file.endswith('.db'):
-                                continue
-                                
-                            file_path = os.path.join(root, file).replace('\\', '/')
-                            
-                            # Check if file path should be excluded
-                            if not any(file_path.startswith(prefix) for prefix in EXCLUDE_PREFIXES):
-                                zipf.write(file_path)
-                                logging.info(f"Adding file: {file_path}")
-                            else:
-                                logging.info(f"Excluding file: {file_path}")
-                                
-            backup_dir = 'backups'
-            if not os.path.exists(backup_dir):
-                os.makedirs(backup_dir)
-            shutil.move(backup_name, os.path.join(backup_dir, backup_name))
-            
+        summary = create_full_snapshot(ROOT_PATH, DATABASE_PATH, SnapshotStore(STORE_PATH), name)
+        print(f"{name}: {summary['files']} files, {summary['new_objects']} new "
+              f"({summary['new_bytes'] // 1024} KB stored)")
     except Exception as e:
         logging.error(f"Error creating backup: {str(e)}")
+        sys.exit(1)
+
+def main():
+    parser = argparse.ArgumentParser(description='Full snapshots of the job manager')
+    parser.add_argument('--list', action='store_true', help='list snapshots')
+    parser.add_argument('--restore', nargs=2, metavar=('NAME', 'DEST'), help='restore a snapshot into DEST')
+    parser.add_argument('--prune', type=int, metavar='KEEP', help='keep only the newest KEEP snapshots')
+    args = parser.parse_args()
+
+    store = SnapshotStore(STORE_PATH)
+    if args.list:
+        for name in store.list_snapshots():
+            summary = store.load(name)['summary']
+            print(f"{name}  {summary['files']} files  {summary['total_bytes'] // 1024} KB")
+    elif args.restore:
+        store.restore(*args.restore)
+    elif args.prune is not None:
+        print(f"Removed {store.prune(args.prune)} unreferenced objects")
+    else:
+        create_backup()
 
 if __name__ == '__main__':
-    create_backup()
\ No newline at end of file
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# benchmarks/bench_indexes.py
+# Compare query plans and latencies with and without the schema.sql indexes
+
+import os
+import sys
+import re
+import time
+import random
+import sqlite3
+import argparse
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.db import SCHEMA_PATH, ENTRY_HOURS, JOB_HOURS
+
+# The per-job lookups named in the index request, plus the job list
+QUERIES = {
+    'time entries for job': f'''
+        SELECT *, {ENTRY_HOURS} as hours
+        FROM time_entry
+        WHERE job_id = ? AND {ENTRY_HOURS} > 0
+        ORDER BY start_time DESC
+    ''',
+    'materials for job': 'SELECT * FROM job_material WHERE job_id = ? ORDER BY timestamp DESC',
+    'notes for job': 'SELECT * FROM job_note WHERE job_id = ? ORDER BY timestamp DESC',
+    'images for job': 'SELECT * FROM job_image WHERE job_id = ? ORDER BY timestamp DESC',
+    'active timer': '''
+        SELECT time_entry.*, job.id as job_id
+        FROM time_entry
+        JOIN job ON time_entry.job_id = job.id
+        WHERE time_entry.end_time IS NULL
+    ''',
+    'active jobs': f'''
+        SELECT job.*, {JOB_HOURS} as accumulated_hours
+        FROM job
+        LEFT JOIN time_entry te_active ON job.id = te_active.job_id
+            AND te_active.end_time IS NULL
+        LEFT JOIN job_hours_rollup ON job_hours_rollup.job_id = job.id
+        WHERE job.status = 'Active'
+        ORDER BY job.last_active DESC
+    ''',
+}
+
+def build_database(path, with_indexes, jobs, entries_per_job, seed):
+    """Create a synthetic database, optionally without the secondary indexes."""
+    with open(SCHEMA_PATH, 'r') as f:
+        schema_sql = f.read()
+    if not with_indexes:
+        schema_sql = re.sub(r'CREATE INDEX[^;]*;', '', schema_sql)
+
+    conn = sqlite3.connect(path)
+    conn.executescript(schema_sql)
+
+    rng = random.Random(seed)
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    statuses = ['Active'] * 2 + ['Pending'] + ['Completed'] * 7
+
+    conn.execute("INSERT INTO customer (name) VALUES ('Benchmark Customer')")
+    conn.executemany(
+        'INSERT INTO job (customer_id, description, status, creation_date, last_active) VALUES (1, ?, ?, ?, ?)',
+        [(f'Job {i}', rng.choice(statuses), start.isoformat(),
+          (start + timedelta(days=rng.randint(0, 1500))).isoformat())
+         for i in range(jobs)]
+    )
+
+    entries = []
+    for job_id in range(1, jobs + 1):
+        for _ in range(entries_per_job):
+            begin = start + timedelta(minutes=rng.randint(0, 1500 * 24 * 60))
+            end = begin + timedelta(minutes=rng.randint(15, 480))
+            entries.append((job_id, begin.isoformat(), end.isoformat()))
+    # One running timer
+    entries.append((1, datetime.now(timezone.utc).isoformat(), None))
+    conn.executemany(
+        "INSERT INTO time_entry (job_id, start_time, end_time, entry_type) VALUES (?, ?, ?, 'auto')",
+        entries
+    )
+
+    children = [(rng.randint(1, jobs), (start + timedelta(days=rng.randint(0, 1500))).isoformat())
+                for _ in range(jobs * 5)]
+    conn.executemany(
+        "INSERT INTO job_material (job_id, material, quantity, timestamp) VALUES (?, 'Screws', 1, ?)",
+        children
+    )
+    conn.executemany("INSERT INTO job_note (job_id, note, timestamp) VALUES (?, 'Note', ?)", children)
+    conn.executemany(
+        "INSERT INTO job_image (job_id, filename, timestamp) VALUES (?, 'image.jpg', ?)",
+        children
+    )
+    conn.commit()
+    if with_indexes:
+        conn.execute('ANALYZE')
+    return conn
+
+def time_query(conn, sql, params, repeat):
+    """Return the median latency of a query in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        conn.execute(sql, params).fetchall()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+def query_plan(conn, sql, params):
+    rows = conn.execute(f'EXPLAIN QUERY PLAN {sql}', params).fetchall()
+    return '; '.join(row[3] for row in rows)
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare query plans and latencies with and without indexes')
+    parser.add_argument('--jobs', type=int, default=2000)
+    parser.add_argument('--entries-per-job', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        results = {}
+        for label, with_indexes in (('before', False), ('after', True)):
+            print(f"Building {label} database: {args.jobs} jobs, "
+                  f"{args.jobs * args.entries_per_job} time entries")
+            conn = build_database(os.path.join(temp_dir, f'{label}.db'), with_indexes,
+                                  args.jobs, args.entries_per_job, args.seed)
+            for name, sql in QUERIES.items():
+                params = [args.jobs // 2] if '?' in sql else []
+                results.setdefault(name, {})[label] = (
+                    time_query(conn, sql, params, args.repeat),
+                    query_plan(conn, sql, params)
+                )
+            conn.close()
+
+    print()
+    for name, result in results.items():
+        before_ms, before_plan = result['before']
+        after_ms, after_plan = result['after']
+        print(f"{name}: {before_ms:.2f} ms -> {after_ms:.2f} ms")
+        print(f"  before: {before_plan}")
+        print(f"  after:  {after_plan}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# benchmarks/bench_routes.py
+# Latency and memory of the busiest routes against generated databases, with
+# regression checks against a saved baseline
+#
+#   python benchmarks/bench_routes.py --output baseline.json     # on main
+#   python benchmarks/bench_routes.py --baseline baseline.json   # on a branch, exits 1 on regressions
+
+import io
+import os
+import sys
+import json
+import time
+import random
+import logging
+import sqlite3
+import argparse
+import platform
+import tempfile
+import tracemalloc
+from datetime import date, datetime, timezone
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from db_init import create_tables, insert_scaled_data
+from app import create_app
+from app.utils.metrics_utils import request_metrics
+from app.utils.upload_utils import upload_processor
+
+# Fixed end of the generated activity so every run sees the same data
+UNTIL = date(2025, 6, 30)
+
+# Routes to time; each gets the benchmark's targets (busiest job, latest week)
+ROUTES = {
+    'job_list': lambda t: ('GET', '/job/'),
+    'quick_timer': lambda t: ('GET', '/job/quick_timer'),
+    'job_details': lambda t: ('GET', f"/job/details/{t['job_id']}"),
+    'invoice': lambda t: ('GET', f"/job/{t['job_id']}/invoice"),
+    'weekly_summary': lambda t: ('GET', f"/report/weekly_summary?week={t['week']}"),
+    'weekly_summary_all': lambda t: ('GET', '/report/weekly_summary?show_all=true'),
+    # Last, so its background image processing can be drained before the next size
+    'upload_direct': lambda t: ('POST', f"/image/upload/direct/{t['job_id']}"),
+}
+
+# A result only counts as a regression when it is also this much worse in
+# absolute terms, so sub-millisecond noise never fails a run
+MIN_DELTA_MS = 1.0
+MIN_DELTA_KB = 256
+
+def build_instance(root, scale, seed):
+    """Generate a database at the given scale with one running timer."""
+    os.makedirs(root, exist_ok=True)
+    conn = create_tables(os.path.join(root, 'jobmanager.db'))
+    counts = insert_scaled_data(conn, scale, seed=seed, until=UNTIL)
+    job_id, week = conn.execute('''
+        SELECT job_id, MAX(iso_week) FROM time_entry
+        GROUP BY job_id ORDER BY COUNT(*) DESC, job_id LIMIT 1
+    ''').fetchone()
+    conn.execute("INSERT INTO time_entry (job_id, start_time, entry_type) VALUES (?, ?, 'auto')",
+                 (job_id, datetime.now(timezone.utc).isoformat()))
+    conn.commit()
+    conn.close()
+    return counts, {'job_id': job_id, 'week': week}
+
+def photo_bytes(seed):
+    """A phone-sized JPEG with enough detail to compress like a photo."""
+    from PIL import Image
+    rng = random.Random(seed)
+    image = Image.frombytes('RGB', (400, 300), rng.randbytes(400 * 300 * 3)).resize((1600, 1200))
+    buffer = io.BytesIO()
+    image.save(buffer, 'JPEG', quality=85)
+    return buffer.getvalue()
+
+def send(client, method, url, photo):
+    if method == 'POST':
+        return client.post(url, data={'file': (io.BytesIO(photo), 'photo.jpg')},
+                           content_type='multipart/form-data')
+    return client.get(url)
+
+def percentile(sorted_values, q):
+    index = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def bench_route(client, name, method, url, requests, warmup, photo):
+    """Time one route; returns the latency distribution and peak allocation."""
+    for _ in range(warmup):
+        response = send(client, method, url, photo)
+        if response.status_code >= 400:
+            raise RuntimeError(f"{name}: {method} {url} returned {response.status_code}")
+
+    request_metrics.reset()
+    timings = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = send(client, method, url, photo)
+        timings.append((time.perf_counter() - started) * 1000)
+    stats = next(iter(request_metrics.snapshot()['endpoints'].values()))
+
+    # Separate pass, since tracing allocations slows everything down
+    tracemalloc.start()
+    send(client, method, url, photo)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings.sort()
+    return {
+        'url': url,
+        'status': response.status_code,
+        'requests': requests,
+        'min_ms': timings[0],
+        'p50_ms': percentile(timings, 0.50),
+        'p90_ms': percentile(timings, 0.90),
+        'p95_ms': percentile(timings, 0.95),
+        'p99_ms': percentile(timings, 0.99),
+        'max_ms': timings[-1],
+        'mean_ms': sum(timings) / len(timings),
+        'template_ms': stats['template_ms'] / requests,
+        'response_kb': stats['response_bytes'] / requests / 1024,
+        'peak_alloc_kb': peak / 1024,
+    }
+
+def run(scales, requests, warmup, seed, routes=None):
+    """Benchmark every route at every scale; returns the results document."""
+    results = {}
+    photo = photo_bytes(seed)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for scale in scales:
+            root = os.path.join(temp_dir, f'scale_{scale}')
+            counts, targets = build_instance(root, scale, seed)
+            app = create_app(instance_path=root, config={'TESTING': True, 'SCHEDULER_ENABLED': False})
+            # Request logging would dominate the console, not the timings
+            logging.getLogger('jobmanager').setLevel(logging.WARNING)
+            client = app.test_client()
+
+            timings = {}
+            for name, target in ROUTES.items():
+                if routes and name not in routes:
+                    continue
+                method, url = target(targets)
+                timings[name] = bench_route(client, name, method, url, requests, warmup, photo)
+                print(f"scale {scale:>4} {name:<20} p50 {timings[name]['p50_ms']:8.2f} ms  "
+                      f"p95 {timings[name]['p95_ms']:8.2f} ms  peak {timings[name]['peak_alloc_kb']:8.0f} KB")
+            upload_processor.shutdown()
+            results[f'scale_{scale}'] = {'dataset': counts, 'routes': timings}
+
+    return {
+        'created': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+        'seed': seed,
+        'requests': requests,
+        # Peak resident set of the whole run, in KB on Linux
+        'max_rss_kb': _max_rss_kb(),
+        'results': results,
+    }
+
+def _max_rss_kb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def compare(current, baseline, threshold, metric='p50_ms'):
+    """List routes whose latency or peak allocation grew by more than threshold."""
+    regressions = []
+    for scale, result in current['results'].items():
+        base_routes = baseline.get('results', {}).get(scale, {}).get('routes', {})
+        for name, stats in result['routes'].items():
+            base = base_routes.get(name)
+            if base is None:
+                continue
+            for key, min_delta in ((metric, MIN_DELTA_MS), ('peak_alloc_kb', MIN_DELTA_KB)):
+                now, before = stats[key], base[key]
+                if now > before * (1 + threshold) and now - before > min_delta:
+                    regressions.append(f"{scale} {name} {key}: {before:.1f} -> {now:.1f}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the hot routes against generated databases')
+    parser.add_argument('--scales', default='1,10,50',
+                        help='comma-separated db_init --scale sizes (default: 1,10,50)')
+    parser.add_argument('--requests', type=int, default=30, help='timed requests per route')
+    parser.add_argument('--warmup', type=int, default=3, help='untimed requests per route first')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--routes', help=f"comma-separated subset of: {', '.join(ROUTES)}")
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    parser.add_argument('--baseline', help='results JSON from an earlier run to compare against')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='allowed growth over the baseline before failing (default: 0.25 = 25%%)')
+    parser.add_argument('--metric', default='p50_ms', choices=['p50_ms', 'p90_ms', 'p95_ms', 'mean_ms'],
+                        help='latency statistic compared with the baseline (default: p50_ms)')
+    args = parser.parse_args()
+
+    scales = [int(scale) for scale in args.scales.split(',')]
+    routes = args.routes.split(',') if args.routes else None
+    current = run(scales, args.requests, args.warmup, args.seed, routes)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(current, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold, args.metric)
+        if regressions:
+            print(f"Regressions over {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"No regressions over {args.threshold:.0%} against {args.baseline}")
+
+if __name__ == '__main__':
+    main()
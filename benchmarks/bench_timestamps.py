@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# benchmarks/bench_timestamps.py
+# Compare the previous per-call timestamp parsing with the shared parser and
+# the cached formatter
+
+import gc
+import os
+import sys
+import time
+import random
+import argparse
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.utils.time_utils import parse_timestamp, format_timestamp, _format_stored
+
+def legacy_parse(value):
+    """The parsing branch each filter and helper used to carry."""
+    if 'Z' in value:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    elif '+' in value or '-' in value and 'T' in value:
+        return datetime.fromisoformat(value)
+    else:
+        return datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+
+def legacy_format(value, format_str, offset_minutes):
+    """The format_datetime filter body, without its per-call logging."""
+    dt = legacy_parse(value)
+    return (dt + timedelta(minutes=offset_minutes)).strftime(format_str)
+
+def stored_values(count, distinct, seed):
+    """Timestamps in the shapes found in time_entry: Z, offset and naive UTC."""
+    rng = random.Random(seed)
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    pool = []
+    for i in range(distinct):
+        dt = start + timedelta(seconds=rng.randint(0, 5 * 365 * 86400))
+        shape = i % 3
+        if shape == 0:
+            pool.append(dt.isoformat())
+        elif shape == 1:
+            pool.append(dt.isoformat().replace('+00:00', 'Z'))
+        else:
+            pool.append(dt.replace(tzinfo=None).isoformat())
+    return [pool[i % distinct] for i in range(count)]
+
+def clear_caches():
+    _format_stored.cache_clear()
+
+def best_of(repeat, funcs, values):
+    """Fastest of several runs of each function, in milliseconds.
+
+    The functions take turns within each repeat and the collector is off
+    while timing, so drifting machine load or a GC pass over the
+    previous results doesn't land on one side only.
+    """
+    timings = [[] for _ in funcs]
+    for _ in range(repeat):
+        for func, runs in zip(funcs, timings):
+            clear_caches()
+            gc.collect()
+            gc.disable()
+            try:
+                started = time.perf_counter()
+                func(values)
+                runs.append((time.perf_counter() - started) * 1000)
+            finally:
+                gc.enable()
+    return [min(runs) for runs in timings]
+
+def render_page(format_func, values, reloads):
+    """Date and time columns for each row, the page reloaded several times."""
+    for _ in range(reloads):
+        for value in values:
+            format_func(value, '%Y-%m-%d', 60)
+            format_func(value, '%H:%M', 60)
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare legacy and cached timestamp parsing')
+    parser.add_argument('--values', type=int, default=100000)
+    parser.add_argument('--page-rows', type=int, default=500)
+    parser.add_argument('--reloads', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    unique = stored_values(args.values, args.values, args.seed)
+    repeated = stored_values(args.values, 2000, args.seed)
+    page = stored_values(args.page_rows, args.page_rows, args.seed)
+
+    scenarios = [
+        (f'parse {args.values} unique values',
+         lambda values: [legacy_parse(v) for v in values],
+         lambda values: [parse_timestamp(v) for v in values], unique),
+        (f'parse {args.values} values, 2000 distinct',
+         lambda values: [legacy_parse(v) for v in values],
+         lambda values: [parse_timestamp(v) for v in values], repeated),
+        (f'render {args.page_rows} rows x {args.reloads} reloads',
+         lambda values: render_page(legacy_format, values, args.reloads),
+         lambda values: render_page(format_timestamp, values, args.reloads), page),
+    ]
+
+    for name, legacy, cached, values in scenarios:
+        before_ms, after_ms = best_of(args.repeat, (legacy, cached), values)
+        print(f"{name}: {before_ms:.1f} ms -> {after_ms:.1f} ms ({before_ms / after_ms:.1f}x)")
+
+if __name__ == '__main__':
+    main()
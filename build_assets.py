@@ -0,0 +1,29 @@
+# build_assets.py
+# Fingerprint and precompress app/static ahead of time, e.g. on a faster
+# machine or in a deploy step, instead of at startup:
+#
+#   python build_assets.py --output /srv/jobmanager/assets
+#
+# then set ASSET_BUILD_DIR to that folder and ASSET_BUILD = False.
+import os
+import argparse
+import logging
+
+from app.utils.asset_utils import AssetManifest, brotli
+
+ROOT_PATH = os.path.dirname(os.path.abspath(__file__))
+
+def main():
+    parser = argparse.ArgumentParser(description='Fingerprint and precompress the static CSS/JS/SVG')
+    parser.add_argument('--static', default=os.path.join(ROOT_PATH, 'app', 'static'),
+                        help='static folder to read (default: app/static)')
+    parser.add_argument('--output', default=os.path.join(ROOT_PATH, 'instance', 'asset_build'),
+                        help='folder to write to (default: instance/asset_build, used at startup)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    manifest = AssetManifest(static_folder=args.static, build_dir=args.output).build()
+    print(f"{len(manifest)} assets in {args.output}" + ('' if brotli else ' (gzip only, brotli not installed)'))
+
+if __name__ == '__main__':
+    main()
@@ -3,8 +3,11 @@
 # Enhanced database initialization with demo data
 
 import os
+import io
 import sqlite3
-from datetime import datetime, timedelta
+import random
+import argparse
+from datetime import datetime, date, timedelta, timezone
 import json
 import logging
 
@@ -124,11 +127,202 @@ def insert_demo_data(conn):
     conn.commit()
     logger.info("Demonstration data inserted successfully")
 
+# Synthetic data per unit of --scale: customers, and jobs per customer
+SCALE_CUSTOMERS = 20
+SCALE_JOBS_PER_CUSTOMER = (1, 9)
+
+FIRST_NAMES = ['Anna', 'Ben', 'Clara', 'David', 'Elif', 'Felix', 'Greta', 'Hannah', 'Jonas', 'Karl',
+               'Lena', 'Marco', 'Nina', 'Oskar', 'Paula', 'Sophie', 'Tom', 'Yusuf']
+LAST_NAMES = ['Müller', 'Schmidt', 'Schneider', 'Fischer', 'Weber', 'Meyer', 'Wagner', 'Becker',
+              'Schulz', 'Hoffmann', 'Koch', 'Richter', 'Klein', 'Wolf', 'Smith', 'Jansen', 'Özdemir']
+COMPANY_SUFFIXES = ['GmbH', 'Immobilien', 'Hausverwaltung', 'Renovations', 'Properties', 'Bau KG']
+STREETS = ['Hauptstrasse', 'Gartenweg', 'Bahnhofstrasse', 'Lindenallee', 'Schulstrasse',
+           'Am Markt', 'Bergstrasse', 'Kirchplatz', 'Mühlenweg', 'Rosenstrasse']
+CITIES = [('Berlin', '10115'), ('Munich', '80331'), ('Hamburg', '20095'), ('Köln', '50667'),
+          ('Leipzig', '04109'), ('Dresden', '01067'), ('Potsdam', '14467'), ('Bonn', '53111')]
+PAYMENT_TERMS = ['Net 14 days', 'Net 30 days', 'Payment upon completion', '50% upfront']
+CUSTOMER_NOTES = ['Prefers email contact', 'Weekend appointments only', 'Key with neighbour',
+                  'Dog on premises', 'Call before arriving', 'Invoice to property manager', None, None]
+JOB_WORK = ['Bathroom renovation', 'Kitchen cabinet installation', 'Garden shed construction',
+            'Roof repair', 'Window replacement', 'Floor tiling', 'Interior painting', 'Drywall repair',
+            'Fence installation', 'Gutter cleaning', 'Boiler service', 'Staircase refinishing',
+            'Deck construction', 'Door fitting', 'Insulation upgrade', 'Plumbing repair']
+JOB_DETAILS = ['', ' - Phase 1', ' - Phase 2', ' ground floor', ' upstairs', ' rental unit',
+               ' (insurance claim)', ' after water damage', ' in basement', ' for new tenants']
+MATERIALS = [('Cement (25kg bag)', 12.50, 'bag'), ('Ceramic tiles (1 sqm)', 15.75, 'sqm'),
+             ('Wood panels (standard)', 8.25, 'pcs'), ('Drywall sheet', 9.90, 'pcs'),
+             ('Wall paint (10 l)', 54.00, 'bucket'), ('Copper pipe (1 m)', 7.40, 'm'),
+             ('Roof tiles', 1.85, 'pcs'), ('Screws (box of 200)', 6.50, 'box'),
+             ('Silicone sealant', 4.20, 'tube'), ('Mineral wool insulation', 22.00, 'roll'),
+             ('Timber 45x70 (3 m)', 6.80, 'pcs'), ('Grout (5kg)', 11.30, 'bag')]
+NOTES = ['Customer prefers work to be done during morning hours.',
+         'Additional tiles needed, customer will provide them next week.',
+         'Project completed on schedule, customer very satisfied.',
+         'Found rotten beam behind the panel, discussed options with customer.',
+         'Waiting for delivery of materials.', 'Parking only available in the back yard.',
+         'Customer asked for a quote for the second bathroom.',
+         'Old pipes replaced up to the main valve.', 'Painted second coat, needs 24h to dry.',
+         'Neighbour complained about noise before 8am.']
+IMAGE_DESCRIPTIONS = ['Before work', 'After work', 'Damage detail', 'Progress', 'Material delivery',
+                      'Measurements', 'Hidden pipework', 'Finished surface']
+IMAGE_TAGS = ['before', 'after', 'damage', 'progress', 'invoice', 'detail']
+
+def _timestamp(rng, moment):
+    """Format a UTC moment the way one of the app's versions or imports stored it."""
+    style = rng.random()
+    if style < 0.3:
+        return moment.isoformat(timespec='seconds')  # naive, read as UTC
+    if style < 0.5:
+        return moment.isoformat(timespec='seconds') + 'Z'
+    if style < 0.8:
+        return moment.replace(tzinfo=timezone.utc).isoformat()  # as TimerManager writes
+    # German local time with its offset (DST approximated by month)
+    offset = timezone(timedelta(hours=2 if 4 <= moment.month <= 9 else 1))
+    return moment.replace(tzinfo=timezone.utc).astimezone(offset).isoformat(timespec='seconds')
+
+def _workday(day):
+    """The next Monday-Friday on or after day."""
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+    return day
+
+def _placeholder_jpeg():
+    """A small grey JPEG used for every generated image file."""
+    from PIL import Image
+    buffer = io.BytesIO()
+    Image.new('RGB', (64, 48), (160, 160, 160)).save(buffer, 'JPEG')
+    return buffer.getvalue()
+
+def insert_scaled_data(conn, scale, seed=1, years=3, until=None, image_dir=None):
+    """Insert scale units of realistic synthetic data for benchmarks and profiling.
+
+    Each unit adds SCALE_CUSTOMERS customers with 1-9 jobs each. Jobs get
+    0.5-4 hour sessions on workdays until their estimate is used up, spread
+    over the given years up to until (default today), with timestamps in a
+    mix of naive, Z, +00:00 and local offset formats, plus materials, notes
+    and image rows. The same seed and until give the same database. With
+    image_dir, a placeholder JPEG is written for every image row.
+    Returns the number of rows added per table.
+    """
+    rng = random.Random(seed)
+    until = until or date.today()
+    first_day = until - timedelta(days=int(years * 365))
+    next_customer = conn.execute('SELECT COALESCE(MAX(id), 0) + 1 FROM customer').fetchone()[0]
+    next_job = conn.execute('SELECT COALESCE(MAX(id), 0) + 1 FROM job').fetchone()[0]
+
+    customers, jobs, entries, materials, notes, images = [], [], [], [], [], []
+    for customer_id in range(next_customer, next_customer + scale * SCALE_CUSTOMERS):
+        city, postal_code = rng.choice(CITIES)
+        if rng.random() < 0.4:
+            name = f'{rng.choice(LAST_NAMES)} {rng.choice(COMPANY_SUFFIXES)}'
+        else:
+            name = f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}'
+        customers.append((customer_id, name, f"{name.lower().replace(' ', '.')}@example.com",
+                          f'+49 {rng.randint(100, 999)} {rng.randint(100000, 999999)}',
+                          f'{rng.choice(STREETS)} {rng.randint(1, 120)}', city, postal_code, 'DE',
+                          rng.choice(PAYMENT_TERMS), rng.choice(CUSTOMER_NOTES)))
+
+        for _ in range(rng.randint(*SCALE_JOBS_PER_CUSTOMER)):
+            job_id = next_job
+            next_job += 1
+            created = first_day + timedelta(days=rng.randint(0, (until - first_day).days))
+            estimate = round(min(200.0, 1 + rng.expovariate(1 / 25)), 1)
+
+            # Sessions until the estimate, give or take, is used up; a few
+            # jobs are never started
+            sessions = []
+            budget = estimate * rng.uniform(0.7, 1.3)
+            day = _workday(created)
+            started = rng.random() > 0.05
+            while started and budget > 0 and day <= until:
+                for _ in range(2 if rng.random() < 0.25 else 1):
+                    hours = max(0.25, min(budget, rng.uniform(0.5, 4.0)))
+                    start = datetime.combine(day, datetime.min.time()) + timedelta(
+                        hours=rng.uniform(6, 14), microseconds=rng.randint(0, 999999))
+                    sessions.append((start, start + timedelta(hours=hours)))
+                    budget -= hours
+                day = _workday(day + timedelta(days=rng.choice([1, 1, 1, 2, 3, 7, 14])))
+
+            if not sessions:
+                status, last_active = 'Pending', None
+            else:
+                recent = (until - sessions[-1][1].date()).days <= 14
+                status = 'Active' if recent and budget > 0 else 'Completed'
+                last_active = sessions[-1][1].replace(tzinfo=timezone.utc).isoformat()
+            jobs.append((job_id, customer_id, rng.choice(JOB_WORK) + rng.choice(JOB_DETAILS), status,
+                         datetime.combine(created, datetime.min.time()).isoformat(),
+                         rng.choice([40.0, 45.0, 50.0, 55.0, 65.0]), estimate, last_active))
+
+            for start, end in sessions:
+                entries.append((job_id, _timestamp(rng, start), _timestamp(rng, end),
+                                'manual' if rng.random() < 0.15 else 'auto'))
+
+            work_times = [start for start, _ in sessions] or [datetime.combine(created, datetime.min.time())]
+            for _ in range(rng.randint(0, 6) if sessions else 0):
+                material, price, unit = rng.choice(MATERIALS)
+                materials.append((job_id, material, rng.randint(1, 20), unit,
+                                  round(price * rng.uniform(0.9, 1.1), 2), rng.choice(work_times).isoformat()))
+            for _ in range(rng.randint(0, 4)):
+                notes.append((job_id, rng.choice(NOTES), rng.choice(work_times).isoformat()))
+            filenames = set()
+            for _ in range(rng.randint(0, 8) if sessions else 0):
+                taken = rng.choice(work_times) + timedelta(seconds=rng.randint(0, 3600))
+                filename = f'job{job_id}-{taken:%y%m%d%H%M%S}.jpg'
+                if filename in filenames:
+                    continue
+                filenames.add(filename)
+                images.append((job_id, filename,
+                               rng.choice(IMAGE_DESCRIPTIONS) if rng.random() < 0.4 else None,
+                               taken.isoformat(),
+                               ','.join(rng.sample(IMAGE_TAGS, 2)) if rng.random() < 0.3 else None))
+
+    # One transaction with executemany per table; the schema triggers fill
+    # the epoch, week, rollup and search columns as rows go in
+    with conn:
+        conn.executemany('''
+            INSERT INTO customer (id, name, email, phone, street, city, postal_code, country, payment_terms, notes)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', customers)
+        conn.executemany('''
+            INSERT INTO job (id, customer_id, description, status, creation_date, base_rate, estimated_hours, last_active)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', jobs)
+        conn.executemany('''
+            INSERT INTO time_entry (job_id, start_time, end_time, entry_type)
+            VALUES (?, ?, ?, ?)
+        ''', entries)
+        conn.executemany('''
+            INSERT INTO job_material (job_id, material, quantity, unit, price, timestamp)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', materials)
+        conn.executemany('''
+            INSERT INTO job_note (job_id, note, timestamp)
+            VALUES (?, ?, ?)
+        ''', notes)
+        conn.executemany('''
+            INSERT INTO job_image (job_id, filename, description, timestamp, tags)
+            VALUES (?, ?, ?, ?, ?)
+        ''', images)
+    conn.execute('ANALYZE')
+
+    if image_dir:
+        jpeg = _placeholder_jpeg()
+        for job_id, filename, *_ in images:
+            job_dir = os.path.join(image_dir, f'job_{job_id}')
+            os.makedirs(job_dir, exist_ok=True)
+            with open(os.path.join(job_dir, filename), 'wb') as f:
+                f.write(jpeg)
+
+    counts = {'customer': len(customers), 'job': len(jobs), 'time_entry': len(entries),
+              'job_material': len(materials), 'job_note': len(notes), 'job_image': len(images)}
+    logger.info(f"Inserted synthetic data at scale {scale}: {counts}")
+    return counts
+
 def ensure_database_exists(db_path, with_demo_data=True):
     """Ensure the database exists and is initialized with tables and optionally demo data."""
     # Check if the database directory exists
     db_dir = os.path.dirname(db_path)
-    if not os.path.exists(db_dir):
+    if db_dir and not os.path.exists(db_dir):
         os.makedirs(db_dir)
         logger.info(f"Created database directory: {db_dir}")
     
@@ -172,19 +366,38 @@ def ensure_database_exists(db_path, with_demo_data=True):
     return False
 
 if __name__ == "__main__":
-    # Path to the database
-    db_path = os.path.join('instance', 'jobmanager.db')
-    
-    # Check if --no-demo flag is provided
-    import sys
-    with_demo = "--no-demo" not in sys.argv
+    parser = argparse.ArgumentParser(description='Create the database, optionally with synthetic data.')
+    parser.add_argument('--db', default=os.path.join('instance', 'jobmanager.db'),
+                        help='database file (default: instance/jobmanager.db)')
+    parser.add_argument('--no-demo', action='store_true', help='create the tables without demo data')
+    parser.add_argument('--scale', type=int, default=0, metavar='N',
+                        help=f'add N units of synthetic data ({SCALE_CUSTOMERS} customers each) '
+                             'instead of the demo data')
+    parser.add_argument('--seed', type=int, default=1, help='random seed for --scale (default: 1)')
+    parser.add_argument('--years', type=float, default=3, help='years of activity for --scale (default: 3)')
+    parser.add_argument('--until', type=date.fromisoformat, metavar='YYYY-MM-DD',
+                        help='last day of activity for --scale (default: today)')
+    parser.add_argument('--image-files', action='store_true',
+                        help='with --scale, also write placeholder JPEGs to the images folder')
+    args = parser.parse_args()
+
+    # Synthetic data replaces the demo data
+    with_demo = not args.no_demo and not args.scale
     
     # Ensure database exists
-    is_new = ensure_database_exists(db_path, with_demo_data=with_demo)
+    is_new = ensure_database_exists(args.db, with_demo_data=with_demo)
     
     if is_new:
         print("Database initialized successfully")
         if with_demo:
             print("Demonstration data has been added")
-    else:
-        print("Database already exists, no changes made")
\ No newline at end of file
+    elif not args.scale:
+        print("Database already exists, no changes made")
+
+    if args.scale:
+        conn = sqlite3.connect(args.db)
+        image_dir = os.path.join(os.path.dirname(os.path.abspath(args.db)), 'images') if args.image_files else None
+        counts = insert_scaled_data(conn, args.scale, seed=args.seed, years=args.years,
+                                    until=args.until, image_dir=image_dir)
+        conn.close()
+        print("Synthetic data added: " + ", ".join(f"{count} {table}" for table, count in counts.items()))
@@ -0,0 +1,64 @@
+# gunicorn.conf.py
+# Production server settings, sized for a Raspberry Pi:
+#
+#   gunicorn -c gunicorn.conf.py
+#
+# Environment overrides: JOBMANAGER_BIND, WEB_CONCURRENCY (worker processes),
+# JOBMANAGER_THREADS (threads per worker).
+import os
+
+wsgi_app = 'wsgi:app'
+chdir = os.path.dirname(os.path.abspath(__file__))
+
+# The port the quick timer QR code points phones at
+bind = os.environ.get('JOBMANAGER_BIND', '0.0.0.0:8080')
+
+# Threaded workers: each open /timer/events stream holds a thread, and most
+# request time is spent waiting on SQLite or the SD card, not the CPU. Two
+# processes keep one serving while the other is recycled; image resizing
+# has its own process pool, so more processes would only cost memory.
+worker_class = 'gthread'
+workers = int(os.environ.get('WEB_CONCURRENCY', min(2, os.cpu_count() or 1)))
+threads = int(os.environ.get('JOBMANAGER_THREADS', 8))
+
+# Create, migrate and import the app once in the master and fork the workers
+# from it, sharing its memory. Threads and process pools started during that
+# import would be left behind in the master, so create_app is told not to
+# start them and post_worker_init starts them in each worker instead.
+preload_app = True
+raw_env = ['JOBMANAGER_START_BACKGROUND=0']
+
+# Recycle workers now and then so slow leaks can't build up on a small
+# machine; the jitter keeps both from restarting at once
+max_requests = 1000
+max_requests_jitter = 100
+
+# Phones poll and reconnect a lot; keep their connections open between requests
+keepalive = 5
+# Heartbeat timeout; gthread workers keep beating during long streams
+timeout = 30
+# Open event streams are cut after this and reconnect to the other worker
+graceful_timeout = 10
+
+# Worker heartbeat files in RAM instead of on the SD card
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+errorlog = '-'
+loglevel = 'info'
+
+def post_worker_init(worker):
+    """Start the background work the preloaded master skipped."""
+    from app.utils.scheduler_utils import scheduler
+    from app.utils.upload_utils import upload_processor
+
+    # Every worker runs the thread; the scheduler lock lets one run the tasks
+    scheduler.start()
+    # Only the first worker picks up uploads staged before a restart
+    if worker.age == 1:
+        upload_processor.resume()
+
+def worker_exit(server, worker):
+    """Finish resizing queued uploads before a recycled worker goes away."""
+    from app.utils.upload_utils import upload_processor
+    upload_processor.shutdown()
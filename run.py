@@ -1,4 +1,6 @@
 # run.py
+# Development server. In production run gunicorn -c gunicorn.conf.py instead,
+# which serves wsgi.py with threaded, preloaded workers on port 8080.
 from app import create_app
 import logging
 from logging.handlers import RotatingFileHandler
@@ -39,7 +41,9 @@ if __name__ == '__main__':
     
     try:
         logger.info("Starting Job Manager application")
-        app.run(host='0.0.0.0', port=5000, debug=True)
+        # The debugger allows running code from the browser; opt in with JOBMANAGER_DEBUG=1
+        app.run(host='0.0.0.0', port=int(os.environ.get('PORT', 5000)),
+                debug=os.environ.get('JOBMANAGER_DEBUG') == '1', threaded=True)
     except Exception as e:
         logger.error(f"Failed to start application: {str(e)}", exc_info=True)
         raise
\ No newline at end of file
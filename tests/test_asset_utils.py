@@ -0,0 +1,81 @@
+# tests/test_asset_utils.py
+import unittest
+import sys
+import os
+import gzip
+import shutil
+import tempfile
+from flask import Flask, render_template_string
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.utils import asset_utils
+from app.routes import asset_routes
+
+CSS = b'body { margin: 0; }\n' + b'.job-row { padding: 4px; }\n' * 50
+
+class TestAssets(unittest.TestCase):
+    """Tests for fingerprinted, precompressed static assets"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.static = os.path.join(self.temp_dir, 'static')
+        os.makedirs(os.path.join(self.static, 'css'))
+        self.write('css/styles.css', CSS)
+        self.write('favicon.ico', b'\0' * 100)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write(self, name, data):
+        with open(os.path.join(self.static, name), 'wb') as f:
+            f.write(data)
+
+    def make_app(self):
+        app = Flask(__name__, static_folder=self.static, instance_path=self.temp_dir)
+        asset_utils.init_app(app)
+        app.register_blueprint(asset_routes.bp, url_prefix='/assets')
+        return app
+
+    def test_names_follow_content(self):
+        """Hashed names change with the content and old names keep working"""
+        app = self.make_app()
+        manifest = asset_utils.asset_manifest.manifest
+        self.assertEqual(list(manifest), ['css/styles.css'])
+        first = manifest['css/styles.css']
+        self.assertRegex(first, r'^css/styles\.[0-9a-f]{12}\.css$')
+
+        with app.test_request_context():
+            html = render_template_string("{{ static_url('css/styles.css') }} {{ static_url('favicon.ico') }}")
+        self.assertEqual(html, f'/assets/{first} /static/favicon.ico')
+
+        self.write('css/styles.css', CSS + b'p { color: red; }\n')
+        app = self.make_app()
+        second = asset_utils.asset_manifest.manifest['css/styles.css']
+        self.assertNotEqual(first, second)
+        self.assertEqual(app.test_client().get(f'/assets/{first}').status_code, 200)
+
+    def test_serves_precompressed_variant(self):
+        """Accept-Encoding picks the variant; every response is cached as immutable"""
+        client = self.make_app().test_client()
+        url = f"/assets/{asset_utils.asset_manifest.manifest['css/styles.css']}"
+
+        response = client.get(url, headers={'Accept-Encoding': 'gzip, deflate'})
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.data), CSS)
+        self.assertEqual(response.mimetype, 'text/css')
+        self.assertIn('Accept-Encoding', response.headers['Vary'])
+        self.assertTrue(response.cache_control.immutable)
+        self.assertEqual(response.cache_control.max_age, asset_utils.ASSET_MAX_AGE)
+
+        response = client.get(url, headers={'Accept-Encoding': 'gzip;q=0'})
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertEqual(response.data, CSS)
+
+        self.assertEqual(client.get(url + '.gz').status_code, 404)
+        self.assertEqual(client.get('/assets/manifest.json').status_code, 404)
+        self.assertEqual(client.get('/assets/../static/css/styles.css').status_code, 404)
+
+if __name__ == "__main__":
+    unittest.main()
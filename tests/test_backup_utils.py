@@ -0,0 +1,104 @@
+# tests/test_backup_utils.py
+import unittest
+import sys
+import os
+import json
+import shutil
+import sqlite3
+import tempfile
+from flask import Flask
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.db import online_backup
+from app.utils import backup_utils
+from app.utils.backup_utils import BackupManager
+
+class TestOnlineBackup(unittest.TestCase):
+    """Tests for backups taken with the SQLite backup API"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+        db = sqlite3.connect(self.db_path)
+        db.execute('PRAGMA journal_mode = WAL')
+        db.execute('CREATE TABLE t (x BLOB)')
+        db.executemany('INSERT INTO t VALUES (randomblob(4000))', [()] * 500)
+        db.commit()
+        db.close()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_snapshot_while_writing(self):
+        """Writes during the copy neither restart it nor appear in it"""
+        writer = sqlite3.connect(self.db_path, isolation_level=None)
+        calls = []
+
+        def progress(remaining, total):
+            calls.append(remaining)
+            writer.execute('INSERT INTO t VALUES (1)')
+
+        dest = os.path.join(self.temp_dir, 'backup.db')
+        online_backup(self.db_path, dest, pages=50, pause=0, progress=progress)
+        writer.close()
+
+        # Remaining pages only ever go down
+        self.assertGreater(len(calls), 5)
+        self.assertEqual(calls, sorted(calls, reverse=True))
+        self.assertFalse(os.path.exists(dest + '.tmp'))
+
+        backup = sqlite3.connect(dest)
+        self.assertEqual(backup.execute('PRAGMA integrity_check').fetchone()[0], 'ok')
+        self.assertEqual(backup.execute('SELECT COUNT(*) FROM t').fetchone()[0], 500)
+        backup.close()
+
+    def test_manager_reports_progress(self):
+        """A background backup ends with a done status and the file in place"""
+        app = Flask(__name__, instance_path=self.temp_dir)
+        app.config['DATABASE'] = self.db_path
+        app.config['BACKUP_DIR'] = os.path.join(self.temp_dir, 'backups')
+        manager = BackupManager(app)
+        self.assertEqual(manager.status(), {'state': 'idle'})
+
+        started, status = manager.start('db')
+        self.assertTrue(started)
+        manager.wait(10)
+
+        status = manager.status()
+        self.assertEqual(status['state'], 'done')
+        self.assertEqual(status['progress'], 1.0)
+        self.assertTrue(os.path.exists(os.path.join(app.config['BACKUP_DIR'], status['name'])))
+
+        # A backup left running by a process that no longer exists failed
+        status.update(state='running', pid=2 ** 22 + 1)
+        with open(manager.status_path, 'w') as f:
+            json.dump(status, f)
+        self.assertEqual(manager.status()['state'], 'failed')
+
+    @unittest.skipIf(backup_utils.fcntl is None, "needs fcntl")
+    def test_backup_running_elsewhere_is_refused(self):
+        """While another process holds the store lock no second backup starts"""
+        app = Flask(__name__, instance_path=self.temp_dir)
+        app.config['DATABASE'] = self.db_path
+        app.config['BACKUP_DIR'] = os.path.join(self.temp_dir, 'backups')
+        manager = BackupManager(app)
+        os.makedirs(manager.store.root)
+        with open(manager.store.lock_path, 'a') as other:
+            backup_utils.fcntl.flock(other, backup_utils.fcntl.LOCK_EX | backup_utils.fcntl.LOCK_NB)
+            started, status = manager.start('db')
+            self.assertFalse(started)
+            self.assertEqual(status, {'state': 'idle'})
+
+        self.assertTrue(manager.start('db')[0])
+        # A second manager stands in for another worker process
+        other = BackupManager(app)
+        self.assertFalse(other.start('db')[0])
+        manager.wait(10)
+        self.assertEqual(manager.status()['state'], 'done')
+        self.assertTrue(other.start('db')[0])
+        other.wait(10)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+# tests/test_db_init.py
+import unittest
+import sys
+import os
+import shutil
+import sqlite3
+import tempfile
+from datetime import date
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from db_init import create_tables, insert_scaled_data, SCALE_CUSTOMERS
+
+TABLES = ('customer', 'job', 'time_entry', 'job_material', 'job_note', 'job_image')
+
+class TestScaledData(unittest.TestCase):
+    """Tests for the synthetic dataset generator"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def generate(self, name, seed, **kwargs):
+        conn = create_tables(os.path.join(self.temp_dir, name))
+        counts = insert_scaled_data(conn, 2, seed=seed, until=date(2025, 3, 14), **kwargs)
+        return conn, counts
+
+    def dump(self, conn):
+        return {table: conn.execute(f'SELECT * FROM {table} ORDER BY id').fetchall() for table in TABLES}
+
+    def test_same_seed_same_data(self):
+        """A seed and end date always give the same rows"""
+        first, counts = self.generate('a.db', 7)
+        second, _ = self.generate('b.db', 7)
+        other, _ = self.generate('c.db', 8)
+        self.assertEqual(counts['customer'], 2 * SCALE_CUSTOMERS)
+        self.assertEqual(counts, {table: len(rows) for table, rows in self.dump(first).items()})
+        self.assertEqual(self.dump(first), self.dump(second))
+        self.assertNotEqual(self.dump(first), self.dump(other))
+
+    def test_time_entries_are_valid_and_mixed(self):
+        """Every entry parses to a positive duration and all timestamp styles occur"""
+        conn, _ = self.generate('a.db', 1)
+        invalid = conn.execute('SELECT COUNT(*) FROM time_entry '
+                               'WHERE start_epoch IS NULL OR end_epoch <= start_epoch').fetchone()[0]
+        self.assertEqual(invalid, 0)
+        last = conn.execute('SELECT MAX(end_epoch) FROM time_entry').fetchone()[0]
+        self.assertLess(last, 1742000000)  # 2025-03-15
+
+        starts = [row[0] for row in conn.execute('SELECT start_time FROM time_entry')]
+        self.assertTrue(any(s.endswith('Z') for s in starts))
+        self.assertTrue(any(s.endswith('+00:00') for s in starts))
+        self.assertTrue(any(s.endswith(('+01:00', '+02:00')) for s in starts))
+        self.assertTrue(any(s[-1].isdigit() and '+' not in s for s in starts))
+
+    def test_placeholder_image_files(self):
+        """With an image folder every image row gets a file"""
+        image_dir = os.path.join(self.temp_dir, 'images')
+        conn, counts = self.generate('a.db', 1, image_dir=image_dir)
+        job_id, filename = conn.execute('SELECT job_id, filename FROM job_image LIMIT 1').fetchone()
+        self.assertTrue(os.path.isfile(os.path.join(image_dir, f'job_{job_id}', filename)))
+        files = sum(len(names) for _, _, names in os.walk(image_dir))
+        self.assertEqual(files, counts['job_image'])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+# tests/test_db_pool.py
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.db import ConnectionPool
+
+class TestConnectionPool(unittest.TestCase):
+    """Tests for the pooled SQLite connections"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.pool = ConnectionPool(os.path.join(self.temp_dir, 'test.db'), max_idle=2)
+
+    def tearDown(self):
+        self.pool.close_all()
+        shutil.rmtree(self.temp_dir)
+
+    def test_connections_are_reused_and_tuned(self):
+        """A released connection is handed out again with its PRAGMAs intact"""
+        conn = self.pool.acquire()
+        self.assertEqual(conn.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+        self.assertEqual(conn.execute('PRAGMA synchronous').fetchone()[0], 1)  # NORMAL
+        self.pool.release(conn)
+
+        self.assertIs(self.pool.acquire(), conn)
+        stats = self.pool.stats()
+        self.assertEqual(stats['created'], 1)
+        self.assertEqual(stats['reused'], 1)
+        self.assertEqual(stats['in_use'], 1)
+
+    def test_release_rolls_back_and_discards_closed(self):
+        """Uncommitted work is rolled back and closed connections are dropped"""
+        conn = self.pool.acquire()
+        conn.execute('CREATE TABLE t (x INTEGER)')
+        conn.commit()
+        conn.execute('INSERT INTO t VALUES (1)')
+        self.pool.release(conn)
+
+        conn = self.pool.acquire()
+        self.assertEqual(conn.execute('SELECT COUNT(*) FROM t').fetchone()[0], 0)
+
+        conn.close()
+        self.pool.release(conn)
+        self.assertEqual(self.pool.stats()['idle'], 0)
+        self.assertEqual(self.pool.stats()['discarded'], 1)
+
+    def test_forked_process_opens_its_own_connections(self):
+        """Connections inherited from a parent process are never handed out"""
+        conn = self.pool.acquire()
+        self.pool.release(conn)
+
+        # Pretend the pool was created in a parent process
+        self.pool._pid = -1
+        self.assertIsNot(self.pool.acquire(), conn)
+        conn.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+# tests/test_event_utils.py
+import unittest
+import sys
+import os
+import queue
+import shutil
+import sqlite3
+import tempfile
+from flask import Flask
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.db import migrate_db
+from app.utils.event_utils import TimerEventBroker, format_event
+
+class TestTimerEventBroker(unittest.TestCase):
+    """Tests for pushing timer changes to subscribers"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        app = Flask(__name__, instance_path=self.temp_dir)
+        app.config['DATABASE'] = os.path.join(self.temp_dir, 'test.db')
+        app.config['TIMER_EVENTS_POLL'] = 0.05
+        migrate_db(app.config['DATABASE'])
+        self.broker = TimerEventBroker(app)
+        self.db = sqlite3.connect(app.config['DATABASE'])
+        self.db.row_factory = sqlite3.Row
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.temp_dir)
+
+    def add_entry(self, job_id, start_time, end_time=None):
+        cursor = self.db.execute(
+            'INSERT INTO time_entry (job_id, start_time, end_time, entry_type) VALUES (?, ?, ?, "auto")',
+            (job_id, start_time, end_time)
+        )
+        self.db.commit()
+        return cursor.lastrowid
+
+    def test_diff_switching_jobs(self):
+        """Moving the timer stops one job, reports its total and starts the other"""
+        first = self.add_entry(1, '2025-03-14 09:00:00', '2025-03-14 10:30:00')
+        second = self.add_entry(2, '2025-03-14 10:30:00')
+        old = {'active': {'job_id': 1, 'entry_id': first, 'start_time': '2025-03-14 09:00:00',
+                          'start_epoch': 1741942800}}
+        new = self.broker.read_state(self.db)
+
+        self.assertEqual(self.broker.diff(self.db, old, new), [
+            ('stop', {'job_id': 1, 'entry_id': first}),
+            ('total', {'job_id': 1, 'total_hours': 1.5}),
+            ('start', {'job_id': 2, 'entry_id': second, 'start_time': '2025-03-14 10:30:00',
+                       'start_epoch': 1741948200, 'status': 'Active'}),
+        ])
+        self.assertEqual(self.broker.diff(self.db, new, new), [])
+
+    def test_subscriber_sees_commits_from_other_connections(self):
+        """The watcher notices another connection's commit via data_version"""
+        subscriber = self.broker.subscribe()
+        try:
+            self.assertEqual(subscriber.get(timeout=1), ('state', {'active': None}))
+            entry_id = self.add_entry(3, '2025-03-14 11:00:00')
+            self.broker.notify()
+            name, data = subscriber.get(timeout=2)
+            self.assertEqual(name, 'start')
+            self.assertEqual(data['entry_id'], entry_id)
+            with self.assertRaises(queue.Empty):
+                subscriber.get(timeout=0.2)
+        finally:
+            self.broker.unsubscribe(subscriber)
+
+    def test_format_event(self):
+        """Events are encoded as SSE frames"""
+        self.assertEqual(format_event('stop', {'job_id': 1}),
+                         'event: stop\ndata: {"job_id": 1}\n\n')
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+# tests/test_image_routes.py
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import zipfile
+import io
+import sqlite3
+from flask import Flask
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.routes import image_routes
+from app.db import migrate_db, close_db
+from app.utils.share_utils import ShareLinkStore
+from app.utils import thumbnail_utils, upload_utils
+
+class TestStoredFileCaching(unittest.TestCase):
+    """Tests for HTTP caching of stored files"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        job_dir = os.path.join(self.temp_dir, 'images', 'job_1')
+        os.makedirs(job_dir)
+        with open(os.path.join(job_dir, 'job1-250314120000.pdf'), 'wb') as f:
+            f.write(b'%PDF-1.4' + b'x' * 1000)
+
+        app = Flask(__name__, instance_path=self.temp_dir)
+        app.register_blueprint(image_routes.bp, url_prefix='/image')
+        self.client = app.test_client()
+        self.url = '/image/serve_file/1/job1-250314120000.pdf'
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_cached_immutably_and_revalidated(self):
+        """Files are cacheable for a year and a matching ETag returns 304"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.cache_control.immutable)
+        self.assertEqual(response.cache_control.max_age, image_routes.IMMUTABLE_MAX_AGE)
+        etag, weak = response.get_etag()
+        self.assertFalse(weak)
+
+        response = self.client.get(self.url, headers={'If-None-Match': f'"{etag}"'})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+
+    def test_range_request(self):
+        """Range requests return only the requested bytes"""
+        response = self.client.get(self.url, headers={'Range': 'bytes=0-7'})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.data, b'%PDF-1.4')
+        self.assertEqual(response.headers['Content-Range'], 'bytes 0-7/1008')
+
+    def test_missing_and_nested_paths_are_not_found(self):
+        """Unknown files and paths outside the job directory give 404"""
+        self.assertEqual(self.client.get('/image/serve_file/1/nope.pdf').status_code, 404)
+        self.assertEqual(self.client.get('/image/serve_file/1/../job_1/job1-250314120000.pdf').status_code, 404)
+
+class TestServeImage(unittest.TestCase):
+    """Tests for resized image variants"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        job_dir = os.path.join(self.temp_dir, 'images', 'job_1')
+        os.makedirs(job_dir)
+        with open(os.path.join(job_dir, 'job1-broken.jpg'), 'wb') as f:
+            f.write(b'not a jpeg at all')
+
+        app = Flask(__name__, instance_path=self.temp_dir)
+        thumbnail_utils.init_app(app)
+        upload_utils.init_app(app)
+        app.register_blueprint(image_routes.bp, url_prefix='/image')
+        self.client = app.test_client()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_unreadable_image_falls_back_to_original(self):
+        """A thumbnail of a corrupt upload sends the stored file instead of failing"""
+        response = self.client.get('/image/serve_image/1/job1-broken.jpg?size=200')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, b'not a jpeg at all')
+        self.assertEqual(self.client.get('/image/serve_image/1/job1-missing.jpg?size=200').status_code, 404)
+
+    def test_status_rejects_nested_paths(self):
+        """Upload status can't be used to probe files outside the job directory"""
+        self.assertEqual(self.client.get('/image/status/1/job1-broken.jpg').json['status'], 'ready')
+        self.assertEqual(self.client.get('/image/status/1/..%2F..%2Fjobmanager.db').status_code, 404)
+        self.assertEqual(self.client.get('/image/status/1/../../jobmanager.db').status_code, 404)
+
+class TestSharedDownload(unittest.TestCase):
+    """Tests for the streamed ZIP of shared files"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        db_path = os.path.join(self.temp_dir, 'test.db')
+        migrate_db(db_path)
+        db = sqlite3.connect(db_path)
+        db.execute("INSERT INTO customer (id, name) VALUES (1, 'Acme')")
+        db.execute("INSERT INTO job (id, customer_id, description, status, creation_date) "
+                   "VALUES (1, 1, 'Roof', 'Active', '2025-03-14T12:00:00Z')")
+
+        job_dir = os.path.join(self.temp_dir, 'images', 'job_1')
+        os.makedirs(job_dir)
+        image_ids = []
+        for name in ('job1-a.jpg', 'job1-b.pdf'):
+            with open(os.path.join(job_dir, name), 'wb') as f:
+                f.write(os.urandom(5000))
+            cursor = db.execute("INSERT INTO job_image (job_id, filename, timestamp) "
+                                "VALUES (1, ?, '2025-03-14T12:00:00Z')", (name,))
+            image_ids.append(cursor.lastrowid)
+        self.token, _ = ShareLinkStore().create(db, 1, image_ids, 1)
+        db.close()
+
+        app = Flask(__name__, instance_path=self.temp_dir)
+        app.config['DATABASE'] = db_path
+        app.teardown_appcontext(close_db)
+        app.register_blueprint(image_routes.bp, url_prefix='/image')
+        self.client = app.test_client()
+        self.url = f'/image/download/{self.token}'
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_download_resumes_with_range(self):
+        """A ranged request continues the same archive"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Accept-Ranges'], 'bytes')
+        full = response.data
+        self.assertEqual(response.content_length, len(full))
+        with zipfile.ZipFile(io.BytesIO(full)) as zf:
+            self.assertEqual(zf.namelist(), ['job1-a.jpg', 'job1-b.pdf'])
+
+        etag = response.get_etag()[0]
+        response = self.client.get(self.url,
+                                   headers={'Range': 'bytes=6000-', 'If-Range': f'"{etag}"'})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.data, full[6000:])
+
+        # A stale If-Range restarts the download from the beginning
+        response = self.client.get(self.url,
+                                   headers={'Range': 'bytes=6000-', 'If-Range': '"stale"'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, full)
+
+        # If-Range may also carry the Last-Modified date
+        last_modified = response.headers['Last-Modified']
+        response = self.client.get(self.url, headers={'Range': 'bytes=6000-', 'If-Range': last_modified})
+        self.assertEqual(response.status_code, 206)
+        response = self.client.get(self.url,
+                                   headers={'Range': 'bytes=6000-', 'If-Range': 'Mon, 01 Jan 2001 00:00:00 GMT'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, full)
+
+    def test_multiple_or_unsatisfiable_ranges(self):
+        """Multi-range requests get the whole archive; ranges past the end get 416"""
+        full = self.client.get(self.url).data
+        response = self.client.get(self.url, headers={'Range': 'bytes=0-1,5-9'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, full)
+
+        response = self.client.get(self.url, headers={'Range': f'bytes={len(full) + 10}-'})
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response.headers['Content-Range'], f'bytes */{len(full)}')
+
+if __name__ == "__main__":
+    unittest.main()
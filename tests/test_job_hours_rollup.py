@@ -0,0 +1,68 @@
+# tests/test_job_hours_rollup.py
+import unittest
+import sys
+import os
+import sqlite3
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.db import SCHEMA_PATH
+
+class TestJobHoursRollup(unittest.TestCase):
+    """Tests for the trigger-maintained job_hours_rollup table"""
+
+    def setUp(self):
+        self.db = sqlite3.connect(':memory:')
+        self.db.row_factory = sqlite3.Row
+        with open(SCHEMA_PATH) as f:
+            self.db.executescript(f.read())
+
+    def tearDown(self):
+        self.db.close()
+
+    def add_entry(self, job_id, start_time, end_time=None):
+        cursor = self.db.execute(
+            'INSERT INTO time_entry (job_id, start_time, end_time, entry_type) VALUES (?, ?, ?, "auto")',
+            (job_id, start_time, end_time)
+        )
+        return cursor.lastrowid
+
+    def assert_rollup_matches_entries(self):
+        """The rollup must equal a full aggregation over closed entries"""
+        expected = dict(self.db.execute('''
+            SELECT job_id, SUM(end_epoch - start_epoch)
+            FROM time_entry
+            WHERE end_epoch IS NOT NULL
+            GROUP BY job_id
+        ''').fetchall())
+        actual = dict(self.db.execute(
+            'SELECT job_id, closed_seconds FROM job_hours_rollup WHERE closed_seconds != 0'
+        ).fetchall())
+        self.assertEqual(actual, expected)
+
+    def test_rollup_follows_entry_changes(self):
+        """Insert, stop, edit, move and delete all keep the rollup current"""
+        self.add_entry(1, '2025-03-14T12:00:00+00:00', '2025-03-14T13:00:00+00:00')
+        open_id = self.add_entry(1, '2025-03-14T14:00:00Z')
+        self.add_entry(2, '2025-03-14T08:00:00', '2025-03-14T08:30:00')
+        self.assert_rollup_matches_entries()
+
+        # An open timer contributes nothing until it is stopped
+        closed = self.db.execute('SELECT closed_seconds FROM job_hours_rollup WHERE job_id = 1').fetchone()
+        self.assertEqual(closed['closed_seconds'], 3600)
+
+        self.db.execute('UPDATE time_entry SET end_time = ? WHERE id = ?', ('2025-03-14T14:15:00Z', open_id))
+        self.assert_rollup_matches_entries()
+
+        self.db.execute('UPDATE time_entry SET start_time = ? WHERE id = 1', ('2025-03-14T11:00:00+00:00',))
+        self.assert_rollup_matches_entries()
+
+        self.db.execute('UPDATE time_entry SET job_id = 2 WHERE id = ?', (open_id,))
+        self.assert_rollup_matches_entries()
+
+        self.db.execute('DELETE FROM time_entry WHERE id = 1')
+        self.assert_rollup_matches_entries()
+
+if __name__ == "__main__":
+    unittest.main()
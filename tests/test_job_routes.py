@@ -0,0 +1,64 @@
+# tests/test_job_routes.py
+import unittest
+import sys
+import os
+import re
+import shutil
+import sqlite3
+import tempfile
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from app.utils.pagination_utils import encode_cursor
+
+class TestJobListPaging(unittest.TestCase):
+    """Tests for keyset paging of the job list"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        app = create_app(instance_path=self.temp_dir, config={'TESTING': True, 'SCHEDULER_ENABLED': False})
+        db = sqlite3.connect(app.config['DATABASE'])
+        db.execute("DELETE FROM time_entry")
+        db.execute("UPDATE job SET status = 'Completed'")
+        db.execute("INSERT INTO customer (id, name) VALUES (100, 'Paging Customer')")
+        for day in range(1, 6):
+            db.execute("INSERT INTO job (customer_id, description, status, creation_date) "
+                       "VALUES (100, ?, 'Completed', ?)", (f'Paged job {day}', f'2020-01-0{day}T12:00:00Z'))
+        db.commit()
+        self.job_count = db.execute('SELECT COUNT(*) FROM job').fetchone()[0]
+        db.close()
+        self.client = app.test_client()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def page(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        html = response.get_data(as_text=True)
+        rows = re.findall(r'data-job-id="(\d+)"', html)
+        cursor = re.search(r'after=([^&"]+)', html)
+        return rows, cursor.group(1) if cursor else None
+
+    def test_cursor_follows_to_the_next_page(self):
+        """Following ?after= continues where the page ended, without repeats"""
+        seen, url = [], '/job/?per_page=3'
+        while url:
+            rows, cursor = self.page(url)
+            self.assertLessEqual(len(rows), 3)
+            seen += rows
+            url = f'/job/?per_page=3&after={cursor}' if cursor else None
+        self.assertEqual(len(seen), self.job_count)
+        self.assertEqual(len(set(seen)), self.job_count)
+
+    def test_malformed_cursor_serves_first_page(self):
+        """Cursors that aren't a pair of scalars fall back to the first page"""
+        first, _ = self.page('/job/?per_page=3')
+        for cursor in (encode_cursor({'a': 1}, [2]), encode_cursor('x'), 'not-a-cursor'):
+            rows, _ = self.page(f'/job/?per_page=3&after={cursor}')
+            self.assertEqual(rows, first)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+# tests/test_maintenance_utils.py
+import unittest
+import sys
+import os
+import time
+import shutil
+import sqlite3
+import tempfile
+from flask import Flask
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.db import migrate_db
+from app.utils import maintenance_utils
+from app.utils.upload_utils import upload_processor
+
+class TestMaintenanceTasks(unittest.TestCase):
+    """Tests for scheduled backup pruning and orphan cleanup"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.app = Flask(__name__, instance_path=self.temp_dir)
+        self.app.config['DATABASE'] = os.path.join(self.temp_dir, 'test.db')
+        self.app.config['BACKUP_DIR'] = os.path.join(self.temp_dir, 'backups')
+        self.app.config['THUMBNAIL_CACHE_DIR'] = os.path.join(self.temp_dir, 'thumb_cache')
+        self.app.config['SCHEDULER_ENABLED'] = False
+        maintenance_utils.init_app(self.app)
+        self.staging_root = upload_processor.staging_root
+        upload_processor.staging_root = os.path.join(self.temp_dir, 'staging')
+        migrate_db(self.app.config['DATABASE'])
+
+    def tearDown(self):
+        upload_processor.staging_root = self.staging_root
+        shutil.rmtree(self.temp_dir)
+
+    def touch(self, *parts, age=0):
+        path = os.path.join(self.temp_dir, *parts)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(b'x')
+        os.utime(path, (time.time() - age, time.time() - age))
+        return path
+
+    def test_prune_keeps_newest_backups(self):
+        """Only BACKUP_RETENTION database backups are kept"""
+        self.app.config['BACKUP_RETENTION'] = 2
+        for day in range(1, 5):
+            self.touch('backups', f'db_backup_2025031{day}_020000.db')
+        maintenance_utils.prune_backups(self.app)
+        self.assertEqual(sorted(os.listdir(self.app.config['BACKUP_DIR'])),
+                         ['db_backup_20250313_020000.db', 'db_backup_20250314_020000.db'])
+
+    def test_orphans_removed_after_grace(self):
+        """Old files without a job_image row go; recent, recorded and pending files stay"""
+        db = sqlite3.connect(self.app.config['DATABASE'])
+        db.execute("INSERT INTO job_image (job_id, filename, timestamp) VALUES (1, 'kept.jpg', '2025-03-14')")
+        db.commit()
+        db.close()
+
+        day = maintenance_utils.DAY
+        kept = self.touch('images', 'job_1', 'kept.jpg', age=2 * day)
+        orphan = self.touch('images', 'job_1', 'orphan.jpg', age=2 * day)
+        old_thumb = self.touch('images', 'job_1', 'thumbnails', 'orphan.jpg', age=2 * day)
+        recent = self.touch('images', 'job_1', 'recent.jpg')
+        pending = self.touch('images', 'job_1', 'pending.jpg', age=2 * day)
+        self.touch('staging', 'job_1', 'pending.jpg')
+        kept_variant = self.touch('thumb_cache', 'job_1', 'kept.jpg', '300-1.jpg')
+        stale_variant = self.touch('thumb_cache', 'job_1', 'gone.jpg', '300-1.jpg')
+
+        maintenance_utils.clean_orphan_files(self.app)
+
+        for path in (kept, recent, pending, kept_variant):
+            self.assertTrue(os.path.exists(path), path)
+        for path in (orphan, old_thumb, stale_variant):
+            self.assertFalse(os.path.exists(path), path)
+
+if __name__ == "__main__":
+    unittest.main()
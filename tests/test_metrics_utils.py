@@ -0,0 +1,37 @@
+# tests/test_metrics_utils.py
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.utils.metrics_utils import Histogram
+
+class TestHistogram(unittest.TestCase):
+    """Tests for the request latency histogram"""
+
+    def test_quantiles_interpolate_within_buckets(self):
+        """Percentiles land inside the bucket holding that rank"""
+        histogram = Histogram(buckets=(0.1, 0.2, 0.4))
+        for _ in range(50):
+            histogram.observe(0.05)
+        for _ in range(50):
+            histogram.observe(0.15)
+
+        self.assertEqual(histogram.count, 100)
+        self.assertAlmostEqual(histogram.quantile(0.5), 0.1)
+        self.assertAlmostEqual(histogram.quantile(0.75), 0.15)
+        self.assertLessEqual(histogram.quantile(0.99), 0.2)
+
+    def test_empty_and_overflow(self):
+        """No samples gives zero and slow outliers cap at the largest bucket"""
+        histogram = Histogram(buckets=(0.1, 0.2))
+        self.assertEqual(histogram.quantile(0.5), 0.0)
+
+        histogram.observe(30)
+        self.assertEqual(histogram.counts, [0, 0, 1])
+        self.assertEqual(histogram.quantile(0.99), 0.2)
+
+if __name__ == "__main__":
+    unittest.main()
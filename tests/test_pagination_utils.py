@@ -0,0 +1,40 @@
+# tests/test_pagination_utils.py
+import unittest
+import sys
+import os
+from flask import Flask
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.utils.pagination_utils import get_page_size, encode_cursor, decode_cursor
+
+class TestPaginationUtils(unittest.TestCase):
+    """Tests for keyset cursor helpers"""
+
+    def setUp(self):
+        self.app = Flask(__name__)
+
+    def test_cursor_round_trip(self):
+        """A cursor decodes back to the sort key it was built from"""
+        token = encode_cursor('12025-03-14T12:00:00+00:00', 42)
+        self.assertNotIn('=', token)
+        self.assertEqual(decode_cursor(token, 2), ['12025-03-14T12:00:00+00:00', 42])
+
+    def test_invalid_cursor_means_first_page(self):
+        """Missing, malformed or wrongly sized cursors are ignored"""
+        self.assertIsNone(decode_cursor(None, 2))
+        self.assertIsNone(decode_cursor('', 2))
+        self.assertIsNone(decode_cursor('not a cursor', 2))
+        self.assertIsNone(decode_cursor(encode_cursor('only one'), 2))
+        self.assertIsNone(decode_cursor(encode_cursor({'a': 1}, [2]), 2))
+
+    def test_page_size_is_clamped(self):
+        """per_page falls back to the default and stays within bounds"""
+        cases = {'': 50, '?per_page=10': 10, '?per_page=0': 1, '?per_page=9999': 200, '?per_page=abc': 50}
+        for query, expected in cases.items():
+            with self.app.test_request_context(f'/{query}'):
+                self.assertEqual(get_page_size(50, 200), expected)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+# tests/test_profile_utils.py
+import unittest
+import sys
+import os
+import json
+import shutil
+import tempfile
+from unittest.mock import patch
+from flask import Flask
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.utils.profile_utils import ProfileManager
+
+class TestProfileCache(unittest.TestCase):
+    """Tests for the cached user profile"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.app = Flask(__name__, instance_path=self.temp_dir)
+        self.manager = ProfileManager(self.app)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write_offset(self, minutes):
+        """Change the profile file behind the manager's back"""
+        with open(self.manager.profile_path) as f:
+            profile = json.loads(f.read())
+        profile['preferences']['time_offset_minutes'] = minutes
+        with open(self.manager.profile_path, 'w') as f:
+            json.dump(profile, f, indent=4)
+
+    def test_profile_read_once_until_file_changes(self):
+        """Unchanged files are served from memory; edits are picked up"""
+        with patch('app.utils.profile_utils.json.load', wraps=json.load) as load:
+            self.manager.get_profile()
+            reads = load.call_count
+            self.manager.get_profile()
+            self.manager.get_time_offset_minutes()
+            self.assertEqual(load.call_count, reads)
+
+            self.write_offset(60)
+            self.assertEqual(self.manager.get_profile()['preferences']['time_offset_minutes'], 60)
+            self.assertEqual(load.call_count, reads + 1)
+
+    def test_returned_profile_is_a_copy(self):
+        """Callers editing the returned dict do not change the cache"""
+        profile = self.manager.get_profile()
+        profile['preferences']['time_offset_minutes'] = 120
+        self.assertEqual(self.manager.get_time_offset_minutes(), 0)
+
+    def test_offset_snapshot_per_request(self):
+        """The offset is read once per request and refreshed by save_profile"""
+        with self.app.test_request_context():
+            self.assertEqual(self.manager.get_time_offset_minutes(), 0)
+            self.write_offset(30)
+            # Same request keeps its snapshot
+            self.assertEqual(self.manager.get_time_offset_minutes(), 0)
+
+            profile = self.manager.get_profile()
+            profile['preferences']['time_offset_minutes'] = 45
+            self.manager.save_profile(profile)
+            self.assertEqual(self.manager.get_time_offset_minutes(), 45)
+
+        with self.app.test_request_context():
+            self.assertEqual(self.manager.get_time_offset_minutes(), 45)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+# tests/test_query_utils.py
+import unittest
+import sys
+import os
+import sqlite3
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.db import init_db_time_functions
+from app.utils.query_utils import ProfiledConnection
+
+class TestProfiledConnection(unittest.TestCase):
+    """Tests for the statement recording connection wrapper"""
+
+    def setUp(self):
+        self.raw = init_db_time_functions(sqlite3.connect(':memory:'))
+        self.statements = []
+        self.db = ProfiledConnection(self.raw, self.statements)
+
+    def tearDown(self):
+        self.raw.close()
+
+    def test_records_rows_and_udf_calls(self):
+        """Each statement is recorded with its row count and UDF calls"""
+        self.db.execute('CREATE TABLE t (x INTEGER)')
+        self.db.executemany('INSERT INTO t VALUES (?)', [(1,), (2,), (3,)])
+        rows = self.db.execute('SELECT x, current_iso_time() FROM t').fetchall()
+
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(len(self.statements), 3)
+        select = self.statements[-1]
+        self.assertEqual(select['sql'], 'SELECT x, current_iso_time() FROM t')
+        self.assertEqual(select['rows'], 3)
+        self.assertEqual(select['udf_calls'], 3)
+        self.assertGreaterEqual(select['ms'], 0)
+
+    def test_passes_through_connection_api(self):
+        """Cursor and connection attributes still work through the wrapper"""
+        self.db.execute('CREATE TABLE t (x INTEGER)')
+        cursor = self.db.execute('INSERT INTO t VALUES (1)')
+        self.assertEqual(cursor.lastrowid, 1)
+        self.db.commit()
+        self.assertEqual([row[0] for row in self.db.execute('SELECT x FROM t')], [1])
+        self.assertEqual(self.statements[-1]['rows'], 1)
+
+if __name__ == "__main__":
+    unittest.main()
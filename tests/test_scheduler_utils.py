@@ -0,0 +1,87 @@
+# tests/test_scheduler_utils.py
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import threading
+from flask import Flask
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.utils import scheduler_utils
+from app.utils.scheduler_utils import Scheduler
+
+class TestScheduler(unittest.TestCase):
+    """Tests for the cross-process maintenance scheduler"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.calls = []
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def make_scheduler(self):
+        app = Flask(__name__, instance_path=self.temp_dir)
+        app.config['SCHEDULER_ENABLED'] = False
+        scheduler = Scheduler(app)
+        scheduler.add_task('count', 3600, lambda app: self.calls.append(1) or len(self.calls), 'Count')
+        scheduler.add_task('broken', 3600, lambda app: 1 / 0, 'Broken')
+        scheduler.add_task('disabled', 0, lambda app: self.calls.append('never'))
+        return scheduler
+
+    def test_tasks_run_once_per_interval_across_processes(self):
+        """A second scheduler sharing the instance folder sees the last runs"""
+        first = self.make_scheduler()
+        self.assertEqual(first.run_pending(), ['count', 'broken'])
+        self.assertEqual(first.run_pending(), [])
+
+        # Another worker process, or the same one after a restart
+        second = self.make_scheduler()
+        self.assertEqual(second.run_pending(), [])
+        self.assertEqual(self.calls, [1])
+
+        status = {task['name']: task for task in second.status()}
+        self.assertEqual(set(status), {'count', 'broken'})
+        self.assertEqual(status['count']['status'], 'ok')
+        self.assertEqual(status['count']['result'], '1')
+        self.assertGreater(status['count']['next_run'], status['count']['last_run'])
+        self.assertEqual(status['broken']['status'], 'failed')
+        self.assertIn('division by zero', status['broken']['error'])
+
+        self.assertEqual(second.run_pending(force=True), ['count', 'broken'])
+        self.assertEqual(self.calls, [1, 1])
+
+    @unittest.skipIf(scheduler_utils.fcntl is None, "needs fcntl")
+    def test_lock_held_elsewhere_skips_tasks(self):
+        """Only the process holding the lock file runs tasks"""
+        scheduler = self.make_scheduler()
+        with open(scheduler.lock_path, 'a') as other:
+            scheduler_utils.fcntl.flock(other, scheduler_utils.fcntl.LOCK_EX | scheduler_utils.fcntl.LOCK_NB)
+            self.assertEqual(scheduler.run_pending(), [])
+        self.assertEqual(scheduler.run_pending(), ['count', 'broken'])
+
+    def test_start_deferred_for_preloaded_workers(self):
+        """Without START_BACKGROUND the thread waits for start(), which restarts a dead one"""
+        app = Flask(__name__, instance_path=self.temp_dir)
+        app.config.update(START_BACKGROUND=False, SCHEDULER_TICK=3600)
+        scheduler = Scheduler(app)
+        self.assertIsNone(scheduler._thread)
+        try:
+            scheduler.start()
+            first = scheduler._thread
+            self.assertTrue(first.is_alive())
+            scheduler.start()
+            self.assertIs(scheduler._thread, first)
+
+            # As in a forked worker, where the parent's thread is not running
+            scheduler._thread = threading.Thread(target=lambda: None)
+            scheduler.start()
+            self.assertTrue(scheduler._thread.is_alive())
+        finally:
+            scheduler.stop()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+# tests/test_search_utils.py
+import unittest
+import sys
+import os
+import shutil
+import sqlite3
+import tempfile
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.db import migrate_db, _rebuild_search_index
+from app.utils.search_utils import SearchIndex, build_match
+
+class TestSearchIndex(unittest.TestCase):
+    """Tests for the trigger-maintained full-text search index"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        db_path = os.path.join(self.temp_dir, 'test.db')
+        migrate_db(db_path)
+        self.db = sqlite3.connect(db_path)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("INSERT INTO customer (id, name, city, notes) "
+                        "VALUES (1, 'Müller GmbH', 'Köln', 'Gate code 4711')")
+        self.db.execute("INSERT INTO job (id, customer_id, description, status, creation_date) "
+                        "VALUES (1, 1, 'Roof repair', 'Active', '2025-03-14T12:00:00Z')")
+        self.db.execute("INSERT INTO job_note (job_id, note, timestamp) "
+                        "VALUES (1, 'Replaced broken roof tiles near the chimney', '2025-03-14')")
+        self.db.execute("INSERT INTO job_material (job_id, material, timestamp) "
+                        "VALUES (1, 'Clay roof tiles', '2025-03-14')")
+        self.db.execute("INSERT INTO job_image (job_id, filename, timestamp) "
+                        "VALUES (1, 'job1-a.jpg', '2025-03-14')")
+        self.db.commit()
+        self.index = SearchIndex()
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.temp_dir)
+
+    def kinds(self, text, **kwargs):
+        return [result['kind'] for result in self.index.search(self.db, text, **kwargs)]
+
+    def test_sources_ranked_with_job_and_customer(self):
+        """Title matches outrank body matches and results carry their job"""
+        results = self.index.search(self.db, 'roof')
+        self.assertEqual([r['kind'] for r in results][:2], ['job', 'material'])
+        self.assertEqual(set(r['kind'] for r in results), {'job', 'material', 'note'})
+        self.assertTrue(all(r['job_id'] == 1 and r['customer_name'] == 'Müller GmbH' for r in results))
+        self.assertIn('<mark>roof</mark>', results[-1]['snippet'])
+
+        customer = self.index.search(self.db, 'koln muller')
+        self.assertEqual(customer[0]['kind'], 'customer')
+        self.assertEqual(customer[0]['id'], 1)
+        self.assertIsNone(customer[0]['job_id'])
+
+    def test_triggers_follow_changes(self):
+        """Updates, deletes and image descriptions reach the index"""
+        self.db.execute("UPDATE job SET description = 'Gutter cleaning' WHERE id = 1")
+        self.db.execute("UPDATE job_image SET description = 'Chimney before work' WHERE job_id = 1")
+        self.db.execute("DELETE FROM job_note")
+        self.assertEqual(self.kinds('roof'), ['material'])
+        self.assertEqual(self.kinds('gutter'), ['job'])
+        self.assertEqual(self.kinds('chimney'), ['image'])
+
+    def test_prefix_mode(self):
+        """Only prefix mode matches a partly typed last word"""
+        self.assertEqual(self.kinds('chim'), [])
+        self.assertEqual(self.kinds('broken chim', prefix=True), ['note'])
+
+    def test_query_syntax_is_not_interpreted(self):
+        """Quotes, operators and markup in the input are plain words"""
+        self.assertIsNone(build_match('" * -'))
+        self.assertEqual(build_match('roof OR "tiles', prefix=True), '"roof" "OR" "tiles"*')
+        # NEAR is matched as the word in the note, not as an operator
+        self.assertEqual(self.kinds('roof NEAR('), ['note'])
+
+        self.db.execute("UPDATE job_note SET note = '<b>roof</b> & tiles'")
+        snippet = self.index.search(self.db, 'tiles')[-1]['snippet']
+        self.assertEqual(snippet, '&lt;b&gt;roof&lt;/b&gt; &amp; <mark>tiles</mark>')
+
+    def test_rebuild_indexes_existing_rows(self):
+        """The migration rebuild gives the same results as the triggers"""
+        before = self.index.search(self.db, 'roof')
+        self.db.execute('DELETE FROM search_index')
+        self.assertEqual(self.index.search(self.db, 'roof'), [])
+        _rebuild_search_index(self.db)
+        self.assertEqual(self.index.search(self.db, 'roof'), before)
+
+if __name__ == "__main__":
+    unittest.main()
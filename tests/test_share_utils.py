@@ -0,0 +1,73 @@
+# tests/test_share_utils.py
+import unittest
+import sys
+import os
+import time
+import shutil
+import sqlite3
+import tempfile
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.db import migrate_db
+from app.utils.share_utils import ShareLinkStore
+
+class TestShareLinkStore(unittest.TestCase):
+    """Tests for share links stored in SQLite"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+        migrate_db(self.db_path)
+        self.db = sqlite3.connect(self.db_path)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("INSERT INTO customer (id, name) VALUES (1, 'Acme')")
+        self.db.execute("INSERT INTO job (id, customer_id, description, status, creation_date) "
+                        "VALUES (1, 1, 'Roof', 'Active', '2025-03-14T12:00:00Z')")
+        for name in ('job1-a.jpg', 'job1-b.jpg'):
+            self.db.execute("INSERT INTO job_image (job_id, filename, timestamp) "
+                            "VALUES (1, ?, '2025-03-14T12:00:00Z')", (name,))
+        self.store = ShareLinkStore()
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_link_survives_a_new_connection(self):
+        """A link created on one connection resolves on another"""
+        token, _ = self.store.create(self.db, 1, [1, 2], 24)
+
+        other = sqlite3.connect(self.db_path)
+        other.row_factory = sqlite3.Row
+        share_data = self.store.get(other, token)
+        other.close()
+
+        self.assertFalse(share_data['expired'])
+        self.assertEqual(share_data['customer_name'], 'Acme')
+        self.assertEqual(share_data['job_description'], 'Roof')
+        self.assertEqual([img['filename'] for img in share_data['images']], ['job1-a.jpg', 'job1-b.jpg'])
+
+        # Deleted images drop out of the link
+        self.db.execute('DELETE FROM job_image WHERE id = 1')
+        self.assertEqual([img['id'] for img in self.store.get(self.db, token)['images']], [2])
+        self.assertIsNone(self.store.get(self.db, 'unknown'))
+
+    def test_purge_removes_only_expired_links(self):
+        """Expired links read as expired until the sweep deletes them"""
+        live, _ = self.store.create(self.db, 1, [1], 24)
+        expired, _ = self.store.create(self.db, 1, [1], 24)
+        self.db.execute('UPDATE share_link SET expires_epoch = ? WHERE token = ?',
+                        (int(time.time()) - 1, expired))
+
+        self.assertTrue(self.store.get(self.db, expired)['expired'])
+        self.assertEqual(self.store.purge(self.db), 1)
+        self.assertIsNone(self.store.get(self.db, expired))
+        self.assertFalse(self.store.get(self.db, live)['expired'])
+
+        plan = ' '.join(row[3] for row in self.db.execute(
+            'EXPLAIN QUERY PLAN DELETE FROM share_link WHERE expires_epoch <= 0'))
+        self.assertIn('idx_share_link_expires', plan)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+# tests/test_snapshot_store.py
+import unittest
+import sys
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+from unittest.mock import patch
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.utils import backup_utils
+from app.utils.backup_utils import SnapshotStore, create_full_snapshot
+
+class TestSnapshotStore(unittest.TestCase):
+    """Tests for incremental, deduplicated full snapshots"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.project = os.path.join(self.temp_dir, 'project')
+        self.store_root = os.path.join(self.temp_dir, 'store')
+        self.write('run.py', b'print("run")')
+        self.write('app/__init__.py', b'# app')
+        self.write('app/__pycache__/x.pyc', b'cache')
+        self.write('instance/images/job_1/a.jpg', b'photo' * 1000)
+        self.write('instance/images/job_2/a-copy.jpg', b'photo' * 1000)
+        self.write('instance/thumb_cache/job_1/a.jpg/150-1.jpg', b'thumb')
+        # Runtime files of the running processes
+        self.write('instance/staging/job_1/upload.jpg', b'half uploaded')
+        self.write('instance/scheduler_state.json', b'{}')
+        self.write('instance/backup_status.json', b'{}')
+        self.write('instance/init.lock', b'')
+
+        self.database = os.path.join(self.project, 'instance', 'jobmanager.db')
+        db = sqlite3.connect(self.database)
+        db.execute('CREATE TABLE t (x)')
+        db.execute('INSERT INTO t VALUES (42)')
+        db.commit()
+        db.close()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write(self, rel_path, data):
+        path = os.path.join(self.project, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+
+    def snapshot(self, name):
+        return create_full_snapshot(self.project, self.database, SnapshotStore(self.store_root), name)
+
+    def test_snapshots_are_incremental_and_deduplicated(self):
+        """Identical content is stored once and unchanged files are not reread"""
+        summary = self.snapshot('snapshot_1')
+        # Two identical photos, run.py, app/__init__.py and the database
+        self.assertEqual(summary['files'], 5)
+        self.assertEqual(summary['new_objects'], 4)
+
+        store = SnapshotStore(self.store_root)
+        files = store.load('snapshot_1')['files']
+        self.assertNotIn('app/__pycache__/x.pyc', files)
+        self.assertNotIn('instance/thumb_cache/job_1/a.jpg/150-1.jpg', files)
+        self.assertFalse([path for path in files if 'staging' in path or path.endswith(('.lock', 'state.json', 'status.json'))])
+
+        self.write('instance/images/job_1/b.jpg', b'new photo')
+        with patch.object(SnapshotStore, '_hash', autospec=True, side_effect=SnapshotStore._hash) as hashed:
+            summary = self.snapshot('snapshot_2')
+        # Only the new photo and the fresh database copy were read
+        self.assertEqual(hashed.call_count, 2)
+        self.assertEqual(summary['files'], 6)
+        self.assertEqual(store.list_snapshots(), ['snapshot_1', 'snapshot_2'])
+
+    def test_restore_and_prune(self):
+        """A restored snapshot matches the original files and pruning drops unused content"""
+        self.snapshot('snapshot_1')
+        os.remove(os.path.join(self.project, 'instance/images/job_2/a-copy.jpg'))
+        os.remove(os.path.join(self.project, 'instance/images/job_1/a.jpg'))
+        self.snapshot('snapshot_2')
+
+        store = SnapshotStore(self.store_root)
+        dest = os.path.join(self.temp_dir, 'restored')
+        store.restore('snapshot_1', dest)
+        with open(os.path.join(dest, 'instance/images/job_2/a-copy.jpg'), 'rb') as f:
+            self.assertEqual(f.read(), b'photo' * 1000)
+        db = sqlite3.connect(os.path.join(dest, 'instance/jobmanager.db'))
+        self.assertEqual(db.execute('SELECT x FROM t').fetchone()[0], 42)
+        db.close()
+
+        # Only the photo is unique to snapshot_1; the unchanged database dedups
+        self.assertEqual(store.prune(1), 1)
+        self.assertEqual(store.list_snapshots(), ['snapshot_2'])
+        store.restore('snapshot_2', os.path.join(self.temp_dir, 'restored_2'))
+
+    def test_prune_while_snapshot_is_half_written(self):
+        """A prune waits for a snapshot in progress and never drops its objects"""
+        self.snapshot('snapshot_1')
+        os.remove(os.path.join(self.project, 'instance/images/job_2/a-copy.jpg'))
+        os.remove(os.path.join(self.project, 'instance/images/job_1/a.jpg'))
+        self.write('instance/images/job_1/b.jpg', b'new photo')
+        store = SnapshotStore(self.store_root)
+        pruned, threads = [], []
+
+        def progress(done, total):
+            # Every object is stored but the manifest isn't written yet
+            if done == total:
+                prune = threading.Thread(target=lambda: pruned.append(store.prune(1)))
+                prune.start()
+                prune.join(0.2)
+                if backup_utils.fcntl is not None:
+                    self.assertTrue(prune.is_alive())
+                threads.append(prune)
+
+        create_full_snapshot(self.project, self.database, SnapshotStore(self.store_root), 'snapshot_2', progress)
+        threads[0].join(10)
+        # Only the photo unique to snapshot_1 went
+        self.assertEqual(pruned, [1])
+        self.assertEqual(store.list_snapshots(), ['snapshot_2'])
+        store.restore('snapshot_2', os.path.join(self.temp_dir, 'restored'))
+        with open(os.path.join(self.temp_dir, 'restored/instance/images/job_1/b.jpg'), 'rb') as f:
+            self.assertEqual(f.read(), b'new photo')
+
+    def test_prune_without_lock_skips_new_objects(self):
+        """Where there is no lock, partial copies and objects newer than every manifest stay"""
+        self.snapshot('snapshot_1')
+        store = SnapshotStore(self.store_root)
+        self.write('new.jpg', b'stored by a snapshot in progress')
+        digest, _ = store._store(os.path.join(self.project, 'new.jpg'))
+        partial = f'{store.object_path(digest)}.123.tmp'
+        with open(partial, 'wb') as f:
+            f.write(b'partial')
+        self.write('old.jpg', b'left behind long ago')
+        old_digest, _ = store._store(os.path.join(self.project, 'old.jpg'))
+        os.utime(store.object_path(old_digest), (0, 0))
+
+        with patch.object(backup_utils, 'fcntl', None):
+            self.assertEqual(store.prune(1), 1)
+        self.assertTrue(os.path.exists(partial))
+        self.assertTrue(os.path.exists(store.object_path(digest)))
+        self.assertFalse(os.path.exists(store.object_path(old_digest)))
+
+if __name__ == "__main__":
+    unittest.main()
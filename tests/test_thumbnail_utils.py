@@ -0,0 +1,116 @@
+# tests/test_thumbnail_utils.py
+import unittest
+import sys
+import os
+import time
+import shutil
+import tempfile
+import threading
+from unittest.mock import patch
+from flask import Flask
+from PIL import Image
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.utils import thumbnail_utils
+from app.utils.thumbnail_utils import ThumbnailCache
+
+class TestThumbnailCache(unittest.TestCase):
+    """Tests for on-demand image variants"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.source = os.path.join(self.temp_dir, 'job1-250314120000.jpg')
+        Image.new('RGB', (1024, 768), (200, 100, 50)).save(self.source, 'JPEG')
+        app = Flask(__name__, instance_path=self.temp_dir)
+        self.cache = ThumbnailCache(app)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def get(self, size, filename='job1-250314120000.jpg'):
+        return self.cache.get(1, filename, self.source, size)
+
+    def test_variant_generated_once_per_size(self):
+        """Variants are rendered on first request and reused afterwards"""
+        self.assertEqual(self.cache.pick_size(100), 150)
+        self.assertEqual(self.cache.pick_size(300), 300)
+        self.assertEqual(self.cache.pick_size(5000), 600)
+
+        path = self.get(150)
+        with Image.open(path) as img:
+            self.assertEqual(max(img.size), 150)
+
+        with patch.object(thumbnail_utils, 'make_thumbnail') as make:
+            self.assertEqual(self.get(150), path)
+            make.assert_not_called()
+
+        # Replacing the source image yields a new variant
+        time.sleep(0.01)
+        Image.new('RGB', (600, 600)).save(self.source, 'JPEG')
+        self.assertNotEqual(self.get(150), path)
+
+    def test_concurrent_requests_share_one_render(self):
+        """Requests for a variant that is being rendered wait for it"""
+        calls = []
+        real_make = thumbnail_utils.make_thumbnail
+
+        def slow_make(*args):
+            calls.append(args)
+            time.sleep(0.2)
+            return real_make(*args)
+
+        results = []
+        with patch.object(thumbnail_utils, 'make_thumbnail', side_effect=slow_make):
+            threads = [threading.Thread(target=lambda: results.append(self.get(300))) for _ in range(5)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(set(results)), 1)
+
+    def test_eviction_keeps_cache_within_budget(self):
+        """Least recently used variants are evicted once over budget"""
+        first = self.get(150)
+        os.utime(first, (time.time() - 7200, time.time() - 7200))
+        self.cache.max_bytes = os.path.getsize(first) + 1
+
+        second = self.get(600)
+        self.assertFalse(os.path.exists(first))
+        self.assertTrue(os.path.exists(second))
+
+        self.cache.discard(1, 'job1-250314120000.jpg')
+        self.assertEqual(self.cache.stats()['files'], 0)
+
+    def test_failed_render_leaves_no_partial_file(self):
+        """A save that fails removes its temporary file"""
+        def failing_save(img, path, *args, **kwargs):
+            with open(path, 'wb') as f:
+                f.write(b'partial')
+            raise OSError('disk full')
+
+        with patch.object(Image.Image, 'save', autospec=True, side_effect=failing_save):
+            with self.assertRaises(OSError):
+                self.get(150)
+        self.assertEqual(os.listdir(os.path.join(self.cache.cache_dir, 'job_1', 'job1-250314120000.jpg')), [])
+        self.assertTrue(os.path.exists(self.get(150)))
+
+    def test_eviction_leaves_renders_in_progress(self):
+        """Temporary files of unfinished renders are neither counted nor evicted"""
+        first = self.get(150)
+        partial = f'{first}.1234.5678.tmp'
+        with open(partial, 'wb') as f:
+            f.write(b'x' * 100000)
+        stats = self.cache.stats()
+        self.assertEqual((stats['files'], stats['bytes']), (1, os.path.getsize(first)))
+
+        self.cache.max_bytes = 1
+        self.cache.evict()
+        self.assertFalse(os.path.exists(first))
+        self.assertTrue(os.path.exists(partial))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+# tests/test_time_epochs.py
+import unittest
+import sys
+import os
+import shutil
+import sqlite3
+import tempfile
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.db import migrate_db, SCHEMA_PATH, SCHEMA_VERSION, ENTRY_HOURS
+
+class TestTimeEntryEpochs(unittest.TestCase):
+    """Tests for the integer epoch columns on time_entry"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def connect(self):
+        db = sqlite3.connect(self.db_path)
+        db.row_factory = sqlite3.Row
+        return db
+
+    def test_triggers_fill_epochs(self):
+        """Inserts and updates keep the epoch columns in step for every stored format"""
+        db = self.connect()
+        with open(SCHEMA_PATH) as f:
+            db.executescript(f.read())
+
+        # All three formats describe 2025-03-14 12:00 UTC
+        formats = ['2025-03-14T12:00:00Z', '2025-03-14T13:00:00+01:00', '2025-03-14T12:00:00']
+        for start_time in formats:
+            db.execute(
+                'INSERT INTO time_entry (job_id, start_time, entry_type) VALUES (1, ?, "auto")',
+                (start_time,)
+            )
+        db.commit()
+
+        rows = db.execute('SELECT start_epoch, end_epoch FROM time_entry').fetchall()
+        self.assertEqual([row['start_epoch'] for row in rows], [1741953600] * 3)
+        self.assertTrue(all(row['end_epoch'] is None for row in rows))
+
+        # Stopping a timer sets end_epoch
+        db.execute('UPDATE time_entry SET end_time = ? WHERE id = 1', ('2025-03-14T13:30:00+00:00',))
+        db.commit()
+        row = db.execute(f'SELECT end_epoch, {ENTRY_HOURS} AS hours FROM time_entry WHERE id = 1').fetchone()
+        self.assertEqual(row['end_epoch'], 1741953600 + 5400)
+        self.assertEqual(row['hours'], 1.5)
+        db.close()
+
+    def test_triggers_fill_iso_week(self):
+        """iso_week follows Python's ISO calendar, including year boundaries"""
+        db = self.connect()
+        with open(SCHEMA_PATH) as f:
+            db.executescript(f.read())
+
+        cases = {
+            '2024-12-30T08:00:00Z': '2025-W01',        # Monday of week 1, 2025
+            '2021-01-03T23:00:00+00:00': '2020-W53',   # Sunday still in 2020
+            '2025-03-10T01:00:00+02:00': '2025-W10',   # Sunday evening in UTC
+            '2025-03-14T12:00:00': '2025-W11',
+        }
+        for start_time in cases:
+            db.execute(
+                'INSERT INTO time_entry (job_id, start_time, entry_type) VALUES (1, ?, "auto")',
+                (start_time,)
+            )
+        rows = db.execute('SELECT start_time, iso_week FROM time_entry').fetchall()
+        self.assertEqual({row['start_time']: row['iso_week'] for row in rows}, cases)
+
+        # Moving the start time moves the entry to another week
+        db.execute('UPDATE time_entry SET start_time = ? WHERE id = 4', ('2025-03-17T09:00:00Z',))
+        row = db.execute('SELECT iso_week FROM time_entry WHERE id = 4').fetchone()
+        self.assertEqual(row['iso_week'], '2025-W12')
+        db.close()
+
+    def test_migrate_backfills_existing_rows(self):
+        """Databases created before the epoch columns are upgraded in place"""
+        db = self.connect()
+        db.executescript('''
+            CREATE TABLE time_entry (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id INTEGER NOT NULL,
+                start_time TEXT NOT NULL,
+                end_time TEXT,
+                entry_type TEXT NOT NULL
+            );
+            INSERT INTO time_entry (job_id, start_time, end_time, entry_type)
+            VALUES (1, '2025-03-14T12:00:00.123456+00:00', '2025-03-14T14:00:00Z', 'auto');
+        ''')
+        db.commit()
+        db.close()
+
+        self.assertTrue(migrate_db(self.db_path))
+        # A second run is a no-op
+        self.assertFalse(migrate_db(self.db_path))
+
+        db = self.connect()
+        row = db.execute('SELECT start_epoch, end_epoch FROM time_entry').fetchone()
+        self.assertEqual(row['start_epoch'], 1741953600)
+        self.assertEqual(row['end_epoch'], 1741953600 + 7200)
+        self.assertEqual(db.execute('SELECT iso_week FROM time_entry').fetchone()[0], '2025-W11')
+        self.assertEqual(db.execute('PRAGMA user_version').fetchone()[0], SCHEMA_VERSION)
+        db.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -20,7 +20,9 @@ from app.utils.time_utils import (
     format_time, 
     format_duration, 
     parse_time, 
-    get_time_difference_seconds
+    get_time_difference_seconds,
+    parse_timestamp,
+    format_timestamp
 )
 
 class TestTimeUtils(unittest.TestCase):
@@ -102,6 +104,34 @@ class TestTimeUtils(unittest.TestCase):
         future = "2025-03-14T13:00:00+00:00"
         self.assertGreater(get_time_difference_seconds(past, future), 0)
         self.assertLess(get_time_difference_seconds(future, past), 0)
+    
+    def test_parse_timestamp(self):
+        """Test parse_timestamp reads every stored shape as an aware datetime"""
+        expected = datetime(2025, 3, 14, 12, 30, 45, tzinfo=timezone.utc)
+        self.assertEqual(parse_timestamp("2025-03-14T12:30:45Z"), expected)
+        self.assertEqual(parse_timestamp("2025-03-14T12:30:45+00:00"), expected)
+        self.assertEqual(parse_timestamp("2025-03-14T12:30:45"), expected)
+        self.assertEqual(parse_timestamp("2025-03-14T14:30:45+02:00"), expected)
+        self.assertEqual(parse_timestamp("2025-03-14T07:30:45-05:00"), expected)
+        self.assertEqual(parse_timestamp("2025-03-14 12:30:45"), expected)
+        self.assertEqual(parse_timestamp("2025-03-14T12:30:45.123456").microsecond, 123456)
+        self.assertEqual(parse_timestamp("2025-03-14"), datetime(2025, 3, 14, tzinfo=timezone.utc))
+        self.assertIsNotNone(parse_timestamp("2025-03-14T12:30:45").tzinfo)
+        
+        # Invalid strings
+        self.assertIsNone(parse_timestamp("invalid"))
+        self.assertIsNone(parse_timestamp(""))
+        self.assertIsNone(parse_timestamp("12:30Z"))
+    
+    def test_format_timestamp(self):
+        """Test format_timestamp applies the offset to strings, datetimes and Unix times"""
+        self.assertEqual(format_timestamp("2025-03-14T23:30:00Z", "%Y-%m-%d %H:%M", 60), "2025-03-15 00:30")
+        self.assertEqual(
+            format_timestamp(datetime(2025, 3, 14, 23, 30), "%H:%M", -30),
+            "23:00"
+        )
+        self.assertEqual(format_timestamp(0, "%Y-%m-%d"), "1970-01-01")
+        self.assertIsNone(format_timestamp("invalid", "%H:%M"))
 
 # Create a local helper function for the tests
 def format_duration(seconds):
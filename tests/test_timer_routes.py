@@ -0,0 +1,65 @@
+# tests/test_timer_routes.py
+import unittest
+import sys
+import os
+import shutil
+import sqlite3
+import tempfile
+from flask import Flask
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.routes import timer_routes
+from app.db import migrate_db, close_db
+
+class TestTimerState(unittest.TestCase):
+    """Tests for the JSON timer state endpoint"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        db_path = os.path.join(self.temp_dir, 'test.db')
+        migrate_db(db_path)
+        db = sqlite3.connect(db_path)
+        db.execute("INSERT INTO customer (id, name) VALUES (1, 'Acme')")
+        db.execute("INSERT INTO job (id, customer_id, description, status, creation_date) "
+                   "VALUES (1, 1, 'Roof', 'Pending', '2025-03-14T12:00:00Z')")
+        db.execute("INSERT INTO time_entry (job_id, start_time, end_time, entry_type) "
+                   "VALUES (1, '2025-03-14T09:00:00Z', '2025-03-14T10:30:00Z', 'manual')")
+        db.commit()
+        db.close()
+
+        app = Flask(__name__, instance_path=self.temp_dir)
+        app.config['DATABASE'] = db_path
+        app.teardown_appcontext(close_db)
+        app.register_blueprint(timer_routes.bp, url_prefix='/timer')
+        self.client = app.test_client()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_state_revalidates_until_timer_changes(self):
+        """The ETag holds while nothing changes and moves when a timer starts"""
+        response = self.client.get('/timer/state')
+        self.assertEqual(response.json, {'active': None})
+        self.assertTrue(response.cache_control.no_cache)
+        idle_etag = response.get_etag()[0]
+
+        response = self.client.get('/timer/state', headers={'If-None-Match': f'"{idle_etag}"'})
+        self.assertEqual(response.status_code, 304)
+
+        self.client.post('/timer/job/1/start_timer')
+        response = self.client.get('/timer/state', headers={'If-None-Match': f'"{idle_etag}"'})
+        self.assertEqual(response.status_code, 200)
+        active = response.json['active']
+        self.assertEqual(active['job_id'], 1)
+        self.assertEqual(active['status'], 'Active')
+        self.assertEqual(active['closed_seconds'], 5400)
+        self.assertIsInstance(active['start_epoch'], int)
+
+        running_etag = response.get_etag()[0]
+        response = self.client.get('/timer/state', headers={'If-None-Match': f'"{running_etag}"'})
+        self.assertEqual(response.status_code, 304)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+# tests/test_upload_utils.py
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+from flask import Flask
+from PIL import Image
+from werkzeug.datastructures import FileStorage
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.utils.upload_utils import UploadProcessor
+
+class TestUploadProcessor(unittest.TestCase):
+    """Tests for staged background image processing"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.source = os.path.join(self.temp_dir, 'photo.jpg')
+        Image.new('RGB', (2048, 1536), (200, 100, 50)).save(self.source, 'JPEG')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def make_processor(self, workers):
+        app = Flask(__name__, instance_path=os.path.join(self.temp_dir, 'instance'))
+        app.config['IMAGE_WORKERS'] = workers
+        return UploadProcessor(app)
+
+    def stage(self, processor, filename='job1-250314120000.jpg'):
+        with open(self.source, 'rb') as f:
+            processor.stage(1, FileStorage(f, filename='photo.jpg'), filename)
+        return filename
+
+    def test_pool_processes_staged_upload(self):
+        """A staged upload is processing until the pool writes the resized image"""
+        processor = self.make_processor(2)
+        filename = self.stage(processor)
+        self.assertEqual(processor.status(1, filename), 'processing')
+        self.assertEqual(processor.pending(1), {filename})
+
+        processor.submit(1, filename)
+        # Never forked from a threaded worker
+        self.assertNotEqual(processor._executor._mp_context.get_start_method(), 'fork')
+        processor.shutdown()
+
+        self.assertEqual(processor.status(1, filename), 'ready')
+        self.assertEqual(processor.pending(1), set())
+        with Image.open(os.path.join(processor.images_root, 'job_1', filename)) as img:
+            self.assertEqual(img.size, (1024, 768))
+
+    def test_failed_upload_is_kept_aside(self):
+        """Unreadable uploads are marked failed and not resumed"""
+        processor = self.make_processor(0)
+        path = processor.staged_path(1, 'broken.jpg')
+        os.makedirs(os.path.dirname(path))
+        with open(path, 'wb') as f:
+            f.write(b'not an image')
+
+        processor.submit(1, 'broken.jpg')
+        self.assertEqual(processor.status(1, 'broken.jpg'), 'failed')
+        self.assertEqual(processor.pending(1), set())
+
+        processor.discard(1, 'broken.jpg')
+        self.assertEqual(processor.status(1, 'broken.jpg'), 'missing')
+
+    def test_resume_picks_up_staged_uploads(self):
+        """Uploads staged before a restart are processed on init"""
+        filename = self.stage(self.make_processor(0))
+        processor = self.make_processor(0)
+        self.assertEqual(processor.status(1, filename), 'ready')
+
+    def test_resume_deferred_for_preloaded_workers(self):
+        """Without START_BACKGROUND staged uploads wait for an explicit resume()"""
+        filename = self.stage(self.make_processor(0))
+        app = Flask(__name__, instance_path=os.path.join(self.temp_dir, 'instance'))
+        app.config.update(IMAGE_WORKERS=0, START_BACKGROUND=False)
+        processor = UploadProcessor(app)
+        self.assertEqual(processor.status(1, filename), 'processing')
+        processor.resume()
+        self.assertEqual(processor.status(1, filename), 'ready')
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,7 @@
+# wsgi.py
+# Production entry point, served by gunicorn with the settings in gunicorn.conf.py:
+#
+#   gunicorn -c gunicorn.conf.py
+from app import create_app
+
+app = create_app()